@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import numbers
 import warnings
 from enum import Enum
-from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from typing_extensions import TypeAlias
 
 from .errors import FormulaInvalidError
 from .model_matrix import ModelMatrix
 from .parser import DefaultFormulaParser
-from .parser.types import FormulaParser, OrderedSet, Structured, Term
+from .parser.algos import cross_terms, interact_terms, nest_terms, power_terms
+from .parser.types import Factor, FormulaParser, OrderedSet, Structured, Term
 from .utils.calculus import differentiate_term
 
 
@@ -23,6 +36,14 @@ FormulaSpec: TypeAlias = Union[
     Tuple["FormulaSpec", ...],  # Structured formulae
 ]
 
+TermsSpec: TypeAlias = Union[
+    str,  # The name of a factor to be looked up in the data (not parsed)
+    numbers.Number,  # A literal factor (e.g. 1 for the intercept)
+    Factor,
+    Term,
+    Iterable["TermsSpec"],  # The union of the nominated terms
+]
+
 
 class OrderingMethod(Enum):
     NONE = "none"
@@ -38,7 +59,8 @@ class Formula(Structured[List[Term]]):
     This is a thin wrapper around `Strucuted[List[Term]]` that adds convenience
     methods for building model matrices from the formula (among other common
     tasks). You can build a `Formula` instance by passing in a string for
-    parsing, or by manually assembling the terms yourself.
+    parsing, or by manually assembling the terms yourself (for which
+    `Formula.from_terms()` and its helpers are provided).
 
     Examples:
     ```
@@ -119,6 +141,140 @@ class Formula(Structured[List[Term]]):
             spec, _parser=parser, _nested_parser=nested_parser, _ordering=ordering
         )
 
+    @classmethod
+    def from_terms(
+        cls,
+        rhs: Union[TermsSpec, Tuple[TermsSpec, ...]],
+        lhs: Optional[TermsSpec] = None,
+        *,
+        include_intercept: bool = True,
+        ordering: Union[OrderingMethod, str] = OrderingMethod.DEGREE,
+    ) -> Formula:
+        """
+        Construct a `Formula` instance directly from factors and terms, without
+        generating (and then parsing) a formula string. The resulting formula
+        is the same as would be generated by parsing the equivalent formula
+        string using the default parser. For example:
+        ```
+        >>> Formula.from_terms(Formula.cross("a", "b") | ["c"], lhs="y")
+        .lhs:
+            y
+        .rhs:
+            1 + a + b + c + a:b
+        ```
+        is equivalent to `Formula("y ~ a*b + c")`.
+
+        Terms can be specified as: strings (which are treated as the names of
+        factors to be looked up in the data, and are *not* parsed); numbers
+        (which are treated as literal factors, except for `0` and `-1`, which
+        are rejected in favour of `include_intercept=False`); `Factor` or
+        `Term` instances;
+        or (possibly nested) iterables of these, such as the sets of terms
+        returned by the `.interact()`, `.cross()`, `.nest()` and `.power()`
+        helpers. Sets of terms can be combined or removed using `|` and `-`.
+
+        Args:
+            rhs: The terms of the right-hand side of the formula, or a tuple of
+                these for multi-part formulae (e.g. `a | b`).
+            lhs: The terms of the left-hand side of the formula (if any).
+            include_intercept: Whether to include an intercept in (each part
+                of) the right-hand side of the formula.
+            ordering: The ordering method to apply to the terms. Can be:
+                "none", "degree" (default), or "sort".
+        """
+
+        def get_rhs_terms(rhs):
+            terms = cls.__get_terms(rhs)
+            if include_intercept:
+                terms = (
+                    OrderedSet((Term([Factor("1", eval_method="literal")]),)) | terms
+                )
+            return list(terms)
+
+        if isinstance(rhs, tuple):
+            rhs = tuple(get_rhs_terms(part) for part in rhs)
+        else:
+            rhs = get_rhs_terms(rhs)
+        if lhs is None:
+            return Formula(rhs, _ordering=ordering)
+        return Formula(lhs=list(cls.__get_terms(lhs)), rhs=rhs, _ordering=ordering)
+
+    @classmethod
+    def interact(cls, *terms: TermsSpec) -> OrderedSet[Term]:
+        """
+        The interactions of the nominated terms, equivalent to the `:` operator
+        (e.g. `Formula.interact(["a", "b"], "c")` is equivalent to
+        `(a + b):c`). See `.from_terms()` for how terms can be specified.
+        """
+        return interact_terms(*(cls.__get_terms(spec) for spec in terms))
+
+    @classmethod
+    def cross(cls, *terms: TermsSpec) -> OrderedSet[Term]:
+        """
+        The nominated terms and all of their interactions, equivalent to the
+        `*` operator (e.g. `Formula.cross("a", "b")` is equivalent to `a*b`).
+        See `.from_terms()` for how terms can be specified.
+        """
+        return cross_terms(*(cls.__get_terms(spec) for spec in terms))
+
+    @classmethod
+    def nest(cls, parents: TermsSpec, nested: TermsSpec) -> OrderedSet[Term]:
+        """
+        The `parents` terms along with the `nested` terms nested within them,
+        equivalent to the `/` operator (e.g. `Formula.nest("a", ["b", "c"])`
+        is equivalent to `a/(b + c)`). See `.from_terms()` for how terms can be
+        specified.
+        """
+        return nest_terms(cls.__get_terms(parents), cls.__get_terms(nested))
+
+    @classmethod
+    def power(cls, terms: TermsSpec, power: int) -> OrderedSet[Term]:
+        """
+        All interactions of up to `power` of the nominated terms, equivalent to
+        the `**` operator (e.g. `Formula.power(["a", "b", "c"], 2)` is
+        equivalent to `(a + b + c)**2`). See `.from_terms()` for how terms can
+        be specified.
+        """
+        if isinstance(power, bool) or not isinstance(power, int) or power < 1:
+            raise FormulaInvalidError(
+                f"The power of a set of terms must be a positive integer; got {repr(power)}."
+            )
+        return power_terms(cls.__get_terms(terms), power)
+
+    @classmethod
+    def __get_terms(cls, spec: TermsSpec) -> OrderedSet[Term]:
+        """
+        Convert a terms specification (as described in `.from_terms()`) into
+        an ordered set of `Term` instances.
+        """
+        if isinstance(spec, OrderedSet):
+            return spec
+        return OrderedSet(cls.__iter_terms(spec))
+
+    @classmethod
+    def __iter_terms(cls, spec: TermsSpec) -> Iterator[Term]:
+        if isinstance(spec, str):
+            yield Term([Factor(spec, eval_method="lookup")])
+        elif isinstance(spec, Term):
+            yield spec
+        elif isinstance(spec, Factor):
+            yield Term([spec])
+        elif isinstance(spec, numbers.Number) and not isinstance(spec, bool):
+            # When parsed, `0` and `-1` remove the intercept rather than being
+            # literal factors, and so (to avoid any ambiguity) we reject them.
+            if spec == 0 or spec == -1:
+                raise FormulaInvalidError(
+                    f"Numeric terms cannot be used to remove the intercept (got {repr(spec)}); use `include_intercept=False` instead."
+                )
+            yield Term([Factor(str(spec), eval_method="literal")])
+        elif isinstance(spec, Iterable) and not isinstance(spec, (Structured, dict)):
+            for item in spec:
+                yield from cls.__iter_terms(item)
+        else:
+            raise FormulaInvalidError(
+                f"Unrecognized terms specification: {repr(spec)}."
+            )
+
     def __init__(
         self,
         *args,
@@ -211,7 +367,12 @@ class Formula(Structured[List[Term]]):
                 )
 
     def get_model_matrix(
-        self, data: Any, context: Optional[Mapping[str, Any]] = None, **spec_overrides
+        self,
+        data: Any,
+        context: Optional[Mapping[str, Any]] = None,
+        *,
+        out: Any = None,
+        **spec_overrides,
     ) -> Union[ModelMatrix, Structured[ModelMatrix]]:
         """
         Build the model matrix (or matrices) realisation of this formula for the
@@ -221,13 +382,17 @@ class Formula(Structured[List[Term]]):
             data: The data for which to build the model matrices.
             context: An additional mapping object of names to make available in
                 when evaluating formula term factors.
+            out: If specified, the model matrix is written into this array (or
+                into a new `.npy` file at this path) as it is generated. This
+                is only supported when generating a single "numpy" model
+                matrix. See `ModelSpec.get_model_matrix` for more details.
             spec_overrides: Any `ModelSpec` attributes to set/override. See
                 `ModelSpec` for more details.
         """
         from .model_spec import ModelSpec
 
         return ModelSpec.from_spec(self, **spec_overrides).get_model_matrix(
-            data, context=context
+            data, context=context, out=out
         )
 
     def differentiate(  # pylint: disable=redefined-builtin
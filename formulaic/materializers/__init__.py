@@ -1,12 +1,16 @@
 from .arrow import ArrowMaterializer
 from .base import FormulaMaterializer
+from .numpy import NumpyMaterializer
 from .pandas import PandasMaterializer
+from .sparse import SparseMaterializer
 from .types import ClusterBy, FactorValues, NAAction
 
 __all__ = [
     "ArrowMaterializer",
     "FormulaMaterializer",
+    "NumpyMaterializer",
     "PandasMaterializer",
+    "SparseMaterializer",
     # Useful types
     "ClusterBy",
     "FactorValues",
@@ -12,6 +12,7 @@ class ArrowMaterializer(PandasMaterializer):
 
     @override
     def _init(self):
+        super()._init()
         self.__data_context = LazyArrowTableProxy(self.data)
 
     @override
@@ -6,12 +6,15 @@ import itertools
 import operator
 from abc import abstractmethod
 from collections import defaultdict, OrderedDict, namedtuple
+from collections.abc import Mapping
 from typing import (
     Any,
     Dict,
     Generator,
     List,
     Iterable,
+    Optional,
+    Set,
     Tuple,
     Union,
     TYPE_CHECKING,
@@ -36,7 +39,15 @@ from formulaic.utils.cast import as_columns
 from formulaic.utils.layered_mapping import LayeredMapping
 from formulaic.utils.stateful_transforms import stateful_eval
 
-from .types import EvaluatedFactor, FactorValues, ScopedFactor, ScopedTerm
+from .types import (
+    ColumnBlock,
+    EvaluatedFactor,
+    FactorValues,
+    LazyModelMatrix,
+    ModelMatrixOperator,
+    ScopedFactor,
+    ScopedTerm,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from formulaic import FormulaSpec, ModelSpec, ModelSpecs
@@ -115,6 +126,11 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
     REGISTER_OUTPUTS = set()
     REGISTER_PRECEDENCE = 100
 
+    # Output types which are encoded exactly as for another output type, and
+    # which differ only in how the encoded columns are combined into the final
+    # model matrix (see `._combine_columns()`).
+    ENCODING_OUTPUTS = {}
+
     # Public API
 
     @inherit_docs(method="_init")
@@ -147,6 +163,7 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
     def get_model_matrix(
         self,
         spec: Union[FormulaSpec, ModelMatrix, ModelMatrices, ModelSpec, ModelSpecs],
+        out: Any = None,
         **spec_overrides,
     ):
         from formulaic import ModelSpec
@@ -154,6 +171,30 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         # Prepare ModelSpec(s)
         spec: Union[ModelSpec, ModelSpecs] = ModelSpec.from_spec(spec, **spec_overrides)
         should_simplify = isinstance(spec, ModelSpec)
+        if out is not None and not should_simplify:
+            raise FormulaMaterializationError(
+                "Model matrices can only be written into existing arrays (via `out`) when generating a single model matrix."
+            )
+        if out is not None and spec.output is None:
+            spec = spec.update(output="numpy")
+
+        model_matrices, _ = self._get_model_matrices(spec, out=out)
+        if should_simplify:
+            return model_matrices._simplify()
+        return model_matrices
+
+    def _get_model_matrices(
+        self, spec: Union[ModelSpec, ModelSpecs], out: Any = None
+    ) -> Tuple[ModelMatrices, List[int]]:
+        """
+        Build the (unsimplified) structured model matrices for an already
+        prepared `ModelSpec` or `ModelSpecs` instance.
+
+        Returns:
+            A tuple of form `(model_matrices, drop_rows)`, where `drop_rows` is
+            the sorted list of the indices of rows in the data that were
+            dropped from all of the model matrices.
+        """
         model_specs: ModelSpecs = self._prepare_model_specs(spec)
 
         # Step 0: Pool all factors and transform state, ensuring consistency
@@ -189,40 +230,141 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         # by recursing over the structured model matrices.
         model_matrices = model_specs._map(
             lambda model_spec: self._build_model_matrix(
-                model_spec, drop_rows=drop_rows
+                model_spec, drop_rows=drop_rows, out=out
             ),
             as_type=ModelMatrices,
         )
 
-        if should_simplify:
-            return model_matrices._simplify()
-        return model_matrices
+        return model_matrices, drop_rows
 
-    def _build_model_matrix(self, spec: ModelSpec, drop_rows):
+    def _build_model_matrix(self, spec: ModelSpec, drop_rows, out=None):
 
-        # Step 0: Apply any requested column/term clustering
-        # This must happen before Step 1 otherwise the greedy rank reduction
-        # below would result in a different outcome than if the columns had
-        # always been in the generated order.
-        terms = self._cluster_terms(spec.formula, cluster_by=spec.cluster_by)
+        # Step 0/1: Determine the structure of the output matrix (i.e. the
+        # scoped terms and columns associated with each term). If this model
+        # spec has already been materialized, this is known ahead of time, and
+        # so we skip clustering and rank reduction entirely.
+        reuse_structure = self._can_reuse_structure(spec)
+        if out is not None and spec.output != "numpy":
+            raise FormulaMaterializationError(
+                f"Model matrices can only be written into existing arrays (via `out`) for the 'numpy' output type, not {repr(spec.output)}."
+            )
+        if spec.output in ("lazy", "linear_operator"):
+            # These outputs generate columns (or products) on demand from the
+            # structure of the model matrix, and so we only need to determine
+            # the structure here.
+            if spec.structure and not reuse_structure:
+                raise FormulaMaterializationError(
+                    f"Model matrices with output {repr(spec.output)} can only be generated for model specs whose structure (if present) is consistent with their formula."
+                )
+            if not reuse_structure:
+                spec = spec.update(
+                    structure=self._get_model_matrix_structure(
+                        spec.update(output="numpy"), drop_rows
+                    )
+                )
+            matrix_type = (
+                LazyModelMatrix if spec.output == "lazy" else ModelMatrixOperator
+            )
+            return ModelMatrix(
+                matrix_type(self, spec=spec, drop_rows=drop_rows), spec=spec
+            )
+        # Factors are encoded (and the structure determined) as for the output
+        # type used to encode the nominated output type; `spec` itself is
+        # only used when the columns are combined.
+        encoding_spec = spec.update(output=self._get_encoding_output(spec.output))
+        structure = (
+            spec.structure
+            if reuse_structure
+            else self._get_model_matrix_structure(encoding_spec, drop_rows)
+        )
 
-        # Step 1: Determine strategy to maintain structural full-rankness of output matrix
-        scoped_terms_for_terms = self._get_scoped_terms(
-            terms,
-            ensure_full_rank=spec.ensure_full_rank,
+        # Step 2: Generate the columns which will be collated into the full
+        # matrix (lazily, one term at a time). If an output array has been
+        # provided, columns are computed directly into it where possible.
+        buffers = None
+        if out is not None:
+            out, buffers = self._prepare_output_buffers(
+                out,
+                column_names=[name for _, _, columns in structure for name in columns],
+                drop_rows=drop_rows,
+            )
+        cols = self._get_columns_from_structure(
+            structure, encoding_spec, drop_rows, buffers=buffers
+        )
+
+        # Step 3: Populate remaining model spec fields
+        if spec.structure:
+            cols = self._enforce_structure(cols, encoding_spec, drop_rows)
+        else:
+            spec = spec.update(structure=structure)
+        cols = (
+            (name, values)
+            for term, scoped_terms, scoped_cols in cols
+            for name, values in scoped_cols.items()
         )
 
-        # Step 2: Generate the columns which will be collated into the full matrix
-        cols = []
-        for term, scoped_terms in scoped_terms_for_terms:
+        # Step 4: Collate factors into one ModelMatrix (or write them into
+        # `out` as they are generated)
+        if out is not None:
+            return ModelMatrix(
+                self._write_columns(
+                    cols, spec=spec, drop_rows=drop_rows, out=out, buffers=buffers
+                ),
+                spec=spec,
+            )
+        return ModelMatrix(
+            self._combine_columns(list(cols), spec=spec, drop_rows=drop_rows),
+            spec=spec,
+        )
+
+    def _get_columns_from_structure(
+        self,
+        structure: List[EncodedTermStructure],
+        spec: ModelSpec,
+        drop_rows,
+        buffers: Optional[Dict[str, Any]] = None,
+    ) -> Generator[Tuple[Term, List[ScopedTerm], Dict[str, Any]]]:
+        """
+        Generate the columns of the model matrix term by term, as described by
+        `structure`. Since this is a generator, the columns of each term are
+        only computed when they are consumed.
+
+        Args:
+            structure: The structure of the model matrix (see
+                `._get_model_matrix_structure()`).
+            spec: The `ModelSpec` instance for which columns are being
+                generated.
+            drop_rows: The rows to be dropped from the data.
+            buffers: An optional mapping from column names to (writable)
+                arrays into which the values of those columns should be
+                written (see `._prepare_output_buffers()`).
+
+        Yields:
+            Tuples of form `(term, scoped_terms, columns)`, where `columns` is
+            an ordered mapping from column names to values.
+        """
+        for term, scoped_terms, target_columns in self._get_scoped_terms_from_structure(
+            structure
+        ):
+            # Only skip the generation of columns not present in the structure
+            # if it describes a subset of the columns; otherwise all columns
+            # are generated so that any inconsistencies with the structure are
+            # reported by `._enforce_structure()`.
+            columns = target_columns if spec.structure_subset else None
             scoped_cols = OrderedDict()
             for scoped_term in scoped_terms:
                 if not scoped_term.factors:
-                    scoped_cols[
-                        "Intercept"
-                    ] = scoped_term.scale * self._encode_constant(
-                        1, None, {}, spec, drop_rows
-                    )
+                    if "Intercept" not in target_columns:
+                        continue
+                    if buffers is not None and "Intercept" in buffers:
+                        buffers["Intercept"][...] = scoped_term.scale
+                        scoped_cols["Intercept"] = buffers["Intercept"]
+                    else:
+                        scoped_cols[
+                            "Intercept"
+                        ] = scoped_term.scale * self._encode_constant(
+                            1, None, {}, spec, drop_rows
+                        )
                 else:
                     scoped_cols.update(
                         self._get_columns_for_term(
@@ -237,38 +379,68 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
                             ],
                             spec=spec,
                             scale=scoped_term.scale,
+                            columns=columns,
+                            out=buffers,
                         )
                     )
-            cols.append((term, scoped_terms, scoped_cols))
+            yield term, scoped_terms, scoped_cols
 
-        # Step 3: Populate remaining model spec fields
-        if spec.structure:
-            cols = self._enforce_structure(cols, spec, drop_rows)
-        else:
-            spec = spec.update(
-                structure=[
-                    EncodedTermStructure(
-                        term,
-                        list(st.copy(without_values=True) for st in scoped_terms),
-                        list(scoped_cols),
+    def _get_model_matrix_structure(
+        self, spec: ModelSpec, drop_rows
+    ) -> List[EncodedTermStructure]:
+        """
+        Determine the structure of the model matrix described by `spec` (i.e.
+        the scoped terms and the names of the columns generated for each term)
+        without generating any columns. Factors are still evaluated and encoded
+        (since the names of the columns depend on the encoding), but no
+        interactions between factors are computed.
+
+        Args:
+            spec: The `ModelSpec` instance for which to determine the
+                structure.
+            drop_rows: The rows to be dropped from the data.
+
+        Returns:
+            A list of `EncodedTermStructure` instances, one for each term.
+        """
+        # Step 0: Apply any requested column/term clustering
+        # This must happen before Step 1 otherwise the greedy rank reduction
+        # below would result in a different outcome than if the columns had
+        # always been in the generated order.
+        terms = self._cluster_terms(spec.formula, cluster_by=spec.cluster_by)
+
+        # Step 1: Determine strategy to maintain structural full-rankness of output matrix
+        structure = []
+        for term, scoped_terms in self._get_scoped_terms(
+            terms,
+            ensure_full_rank=spec.ensure_full_rank,
+        ):
+            columns = []
+            for scoped_term in scoped_terms:
+                if not scoped_term.factors:
+                    columns.append("Intercept")
+                else:
+                    columns.extend(
+                        self._get_column_names_for_term(
+                            [
+                                self._encode_evaled_factor(
+                                    scoped_factor.factor,
+                                    spec,
+                                    drop_rows,
+                                    reduced_rank=scoped_factor.reduced,
+                                )
+                                for scoped_factor in scoped_term.factors
+                            ]
+                        )
                     )
-                    for term, scoped_terms, scoped_cols in cols
-                ],
+            structure.append(
+                EncodedTermStructure(
+                    term,
+                    list(st.copy(without_values=True) for st in scoped_terms),
+                    columns,
+                )
             )
-
-        # Step 4: Collate factors into one ModelMatrix
-        return ModelMatrix(
-            self._combine_columns(
-                [
-                    (name, values)
-                    for term, scoped_terms, scoped_cols in cols
-                    for name, values in scoped_cols.items()
-                ],
-                spec=spec,
-                drop_rows=drop_rows,
-            ),
-            spec=spec,
-        )
+        return structure
 
     # Methods related to input preparation
 
@@ -326,10 +498,17 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
             formula=[],
             ensure_full_rank=next(iter(ensure_full_rank)),
             na_action=next(iter(na_action)),
-            output=next(iter(output)),
+            output=self._get_encoding_output(next(iter(output))),
             transform_state=transform_state,
         )
 
+    def _get_encoding_output(self, output: Optional[str]) -> Optional[str]:
+        """
+        The output type for which factors should be encoded when generating
+        model matrices of output type `output` (see `ENCODING_OUTPUTS`).
+        """
+        return self.ENCODING_OUTPUTS.get(output, output)
+
     def _cluster_terms(self, terms, cluster_by: ClusterBy = ClusterBy.NONE):
         if cluster_by is not ClusterBy.NUMERICAL_FACTORS:
             return terms
@@ -349,6 +528,53 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
 
     # Methods related to ensuring out matrices are structurally full-rank
 
+    def _can_reuse_structure(self, spec: ModelSpec) -> bool:
+        """
+        Check whether the structure attached to `spec` (if any) can be used to
+        drive the generation of columns directly. This is the case whenever the
+        terms of the structure are exactly those of the formula (this may not
+        be true if, for example, the formula has been differentiated after
+        the structure was generated).
+        """
+        if not spec.structure:
+            return False
+        structure_terms = [term for term, _, _ in spec.structure]
+        return len(structure_terms) == len(spec.formula) and set(
+            structure_terms
+        ) == set(spec.formula)
+
+    def _get_scoped_terms_from_structure(
+        self, structure: List[EncodedTermStructure]
+    ) -> Generator[Tuple[Term, List[ScopedTerm], Set[str]]]:
+        """
+        Reconstitute the scoped terms stored in the structure of a `ModelSpec`
+        instance, binding them to the factors evaluated in the current data
+        context.
+
+        Args:
+            structure: The structure of a `ModelSpec` instance (as generated by
+                `._get_model_matrix_structure()`).
+
+        Returns:
+            A generator of tuples of form `(term, scoped_terms, columns)`, where
+            `columns` is the set of names of the columns expected for each
+            term.
+        """
+        for term, scoped_terms, columns in structure:
+            yield term, [
+                ScopedTerm(
+                    factors=(
+                        ScopedFactor(
+                            self.factor_cache[scoped_factor.factor.expr],
+                            reduced=scoped_factor.reduced,
+                        )
+                        for scoped_factor in scoped_term.factors
+                    ),
+                    scale=scoped_term.scale,
+                )
+                for scoped_term in scoped_terms
+            ], set(columns)
+
     def _get_scoped_terms(self, terms, ensure_full_rank=True):
         """
         Generate the terms to be used in the model matrix.
@@ -368,18 +594,47 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         Returns:
             list<ScopedTerm>: A list of appropriately scoped terms.
         """
+        # Scoped terms are planned using bitmask representations (see
+        # `._simplify_scoped_term_masks()`). Terms already spanned by earlier
+        # terms are identified by the masks of the (global) ids of their
+        # factors, which are assigned in the order factors are first seen.
         spanned = set()
+        factor_ids = {}
 
         for term in terms:
             evaled_factors = [self.factor_cache[factor.expr] for factor in term.factors]
 
             if ensure_full_rank:
-                term_span = (
-                    self._get_scoped_terms_spanned_by_evaled_factors(evaled_factors)
-                    - spanned
+                (
+                    factors,
+                    span,
+                    scale,
+                ) = self._get_scoped_term_masks_spanned_by_evaled_factors(
+                    evaled_factors
+                )
+                # The span in terms of global ids is enumerated in the same
+                # order as the (local) span, since the first and last scoped
+                # terms have all and none of the spanning factors present.
+                global_bits = [
+                    1 << factor_ids.setdefault(factor.expr, len(factor_ids))
+                    for factor in factors
+                ]
+                global_full = sum(
+                    bit for i, bit in enumerate(global_bits) if span[-1][0] >> i & 1
+                )
+                global_span = self._get_subset_masks(
+                    [bit for i, bit in enumerate(global_bits) if span[0][1] >> i & 1]
                 )
-                scoped_terms = self._simplify_scoped_terms(term_span)
-                spanned.update(term_span)
+                term_span = []
+                for (present, reduced), global_reduced in zip(span, global_span):
+                    key = (global_full | global_reduced, global_reduced)
+                    if key not in spanned:
+                        spanned.add(key)
+                        term_span.append((present, reduced, scale, None))
+                scoped_terms = [
+                    self._get_scoped_term_from_mask(factors, *item)
+                    for item in self._simplify_scoped_term_masks(term_span)
+                ]
             else:
                 scoped_terms = [
                     ScopedTerm(
@@ -417,20 +672,73 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         Returns:
             The scoped terms for the nominated `evaled_factors`.
         """
+        factors, span, scale = cls._get_scoped_term_masks_spanned_by_evaled_factors(
+            evaled_factors
+        )
+        return OrderedSet(
+            cls._get_scoped_term_from_mask(factors, present, reduced, scale)
+            for present, reduced in span
+        )
+
+    @classmethod
+    def _get_scoped_term_masks_spanned_by_evaled_factors(
+        cls, evaled_factors: Iterable[EvaluatedFactor]
+    ) -> Tuple[List[EvaluatedFactor], List[Tuple[int, int]], Any]:
+        """
+        Return the scoped terms which span the set of evaluated factors in
+        bitmask form.
+
+        Each scoped term is represented by a tuple of form `(present, reduced)`,
+        where bit `i` of `present` is set if the `i`th (non-constant) factor
+        is present in the scoped term, and the same bit of `reduced` is set if
+        that factor is present with reduced rank. Factors which span the
+        intercept are either present with reduced rank or absent, and all other
+        factors are always present with full rank. Scoped terms are generated
+        in the same order as `itertools.product` would generate them (with the
+        first factor varying slowest, and reduced factors before absent ones).
+
+        Args:
+            evaled_factors: The evaluated factors for which to generated scoped
+                terms.
+
+        Returns:
+            A tuple of form `(factors, span, scale)`, where `factors` is the
+            list of non-constant factors (indexed by the bitmasks), `span` is
+            the list of bitmasks of the spanning scoped terms, and `scale` is
+            the product of the constant factors.
+        """
         scale = 1
         factors = []
+        full = 0
+        spanning = []
         for factor in evaled_factors:
             if factor.metadata.kind is Factor.Kind.CONSTANT:
                 scale *= factor.values
-            elif factor.metadata.spans_intercept:
-                factors.append((ScopedFactor(factor, reduced=True), 1))
+                continue
+            if factor.metadata.spans_intercept:
+                spanning.append(1 << len(factors))
             else:
-                factors.append((ScopedFactor(factor),))
-        return OrderedSet(
-            ScopedTerm(factors=(p for p in prod if p != 1), scale=scale)
-            for prod in itertools.product(*factors)
+                full |= 1 << len(factors)
+            factors.append(factor)
+
+        return (
+            factors,
+            [(full | mask, mask) for mask in cls._get_subset_masks(spanning)],
+            scale,
         )
 
+    @staticmethod
+    def _get_subset_masks(bits: List[int]) -> List[int]:
+        """
+        Return the bitmasks of all subsets of `bits`, in the order that
+        `itertools.product` would generate them were each bit to be chosen to
+        be present or absent (in that order).
+        """
+        masks = [0]
+        for bit in reversed(bits):
+            masks = [bit | mask for mask in masks] + masks
+        return masks
+
     @classmethod
     def _simplify_scoped_terms(
         cls, scoped_terms: Iterable[ScopedTerm]
@@ -438,49 +746,108 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         """
         Return the minimal set of ScopedTerm instances that spans the same
         vectorspace, matching as closely as possible the intended order of the
-        terms.
+        terms. See `._simplify_scoped_term_masks()` for more details.
+        """
+        factors = []
+        items = []
+        for scoped_term in scoped_terms:
+            present = reduced = 0
+            order = []
+            for scoped_factor in scoped_term.factors:
+                if scoped_factor.factor in factors:
+                    index = factors.index(scoped_factor.factor)
+                else:
+                    index = len(factors)
+                    factors.append(scoped_factor.factor)
+                present |= 1 << index
+                if scoped_factor.reduced:
+                    reduced |= 1 << index
+                order.append(index)
+            items.append((present, reduced, scoped_term.scale, tuple(order)))
+        return OrderedSet(
+            cls._get_scoped_term_from_mask(factors, *item)
+            for item in cls._simplify_scoped_term_masks(items)
+        )
+
+    @staticmethod
+    def _simplify_scoped_term_masks(
+        items: Iterable[Tuple[int, int, Any, Optional[Tuple[int, ...]]]]
+    ) -> List[Tuple[int, int, Any, Optional[Tuple[int, ...]]]]:
+        """
+        Return the minimal set of scoped terms that spans the same vectorspace
+        as the nominated scoped terms, matching as closely as possible the
+        intended order of the terms.
 
         This is an iterative algorithm that applies the rule:
             (anything):(reduced rank) + (anything) |-> (anything):(full rank)
-        To be safe, we recurse whenever we apply the rule to make sure that
-        we have fully simplified the set of terms before adding new ones.
-
-        This is guaranteed to minimially span the vector space, keeping
-        everything full-rank by avoiding overlaps.
-        """
-        terms = OrderedSet()
-        for scoped_term in sorted(scoped_terms, key=lambda x: len(x.factors)):
-            factors = set(scoped_term.factors)
-            combined = False
-            for existing_term in terms:
-                # Check whether existing term only differs by one factor
-                cofactors = set(existing_term.factors)
-                factors_diff = factors - cofactors
-                if len(factors) - 1 != len(cofactors) or len(factors_diff) != 1:
-                    continue
-                # If the different factor is a reduced factor, we can apply the
-                # rule and recurse to see if there is anything else to pick up.
-                factor_new = next(iter(factors_diff))
-                if factor_new.reduced:
-                    terms = cls._simplify_scoped_terms(
-                        terms - (existing_term,)
-                        | (
-                            ScopedTerm(
-                                (
-                                    ScopedFactor(factor_new.factor, reduced=False)
-                                    if factor == factor_new
-                                    else factor
-                                    for factor in scoped_term.factors
-                                ),
-                                scale=existing_term.scale * scoped_term.scale,
-                            ),
-                        )
-                    )
-                    combined = True
+        Scoped terms are considered in order of increasing number of factors,
+        and each is combined with the first existing term that differs from it
+        only by the absence of one of its reduced factors (if any); and the
+        combined term is then itself a candidate for further combination. This
+        is guaranteed to minimially span the vector space, keeping everything
+        full-rank by avoiding overlaps.
+
+        Scoped terms are represented as tuples of form `(present, reduced,
+        scale, order)`, where `present` and `reduced` are bitmasks as
+        described in `._get_scoped_term_masks_spanned_by_evaled_factors()`,
+        and `order` is the order of the factors (by index) in the scoped term
+        (or `None` if they are in order of their indices). Since candidates for
+        combination can be looked up directly by their bitmasks, this scales
+        linearly in the number of scoped terms.
+        """
+        terms = {}  # (present, reduced) -> (position, scale, order)
+        positions = itertools.count()
+        for present, reduced, scale, order in sorted(
+            items, key=lambda item: bin(item[0]).count("1")
+        ):
+            while True:
+                # Find the first existing term (if any) that differs only by
+                # the absence of one of the reduced factors.
+                existing = None
+                bits = reduced
+                while bits:
+                    bit = bits & -bits
+                    bits ^= bit
+                    candidate = terms.get((present ^ bit, reduced ^ bit))
+                    if candidate is not None and (
+                        existing is None or candidate[0] < existing[1][0]
+                    ):
+                        existing = (bit, candidate)
+                if existing is None:
+                    if (present, reduced) not in terms:
+                        terms[(present, reduced)] = (next(positions), scale, order)
                     break
-            if not combined:
-                terms = terms | (scoped_term,)
-        return terms
+                bit, (_, existing_scale, _) = existing
+                del terms[(present ^ bit, reduced ^ bit)]
+                reduced ^= bit
+                scale = existing_scale * scale
+                if (present, reduced) in terms:
+                    break
+        return [
+            (present, reduced, scale, order)
+            for (present, reduced), (_, scale, order) in terms.items()
+        ]
+
+    @staticmethod
+    def _get_scoped_term_from_mask(
+        factors: List[EvaluatedFactor],
+        present: int,
+        reduced: int,
+        scale: Any = 1,
+        order: Optional[Tuple[int, ...]] = None,
+    ) -> ScopedTerm:
+        """
+        Construct a `ScopedTerm` instance from its bitmask representation (see
+        `._simplify_scoped_term_masks()`).
+        """
+        if order is None:
+            order = (i for i in range(present.bit_length()) if present >> i & 1)
+        return ScopedTerm(
+            factors=(
+                ScopedFactor(factors[i], reduced=bool(reduced >> i & 1)) for i in order
+            ),
+            scale=scale,
+        )
 
     # Methods related to looking-up, evaluating and encoding terms and factors
 
@@ -582,14 +949,15 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
                 def map_dict(f):
                     """
                     This decorator allows an encoding function to operator on
-                    dictionaries (which should be mapped over). This allows
-                    transforms to output multiple non-encoded columns and still
-                    have everything work as expected.
+                    dictionaries (and other mappings of columns, which should
+                    be mapped over). This allows transforms to output multiple
+                    non-encoded columns and still have everything work as
+                    expected.
                     """
 
                     @functools.wraps(f)
                     def wrapped(values, metadata, state, *args, **kwargs):
-                        if isinstance(values, dict):
+                        if isinstance(values, Mapping):
                             encoded = {}
                             for k, v in values.items():
                                 if isinstance(k, str) and k.startswith("__"):
@@ -640,13 +1008,25 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
                             reduced_rank=reduced_rank,
                         )
                     elif factor.metadata.kind is Factor.Kind.NUMERICAL:
-                        encoded = map_dict(self._encode_numerical)(
-                            factor_values,
-                            factor.metadata,
-                            encoder_state,
-                            spec,
-                            drop_rows,
-                        )
+                        if isinstance(factor_values, ColumnBlock):
+                            encoded = FactorValues(
+                                self._encode_numerical_block(
+                                    factor_values,
+                                    factor.metadata,
+                                    encoder_state,
+                                    spec,
+                                    drop_rows,
+                                ),
+                                metadata=factor_values.__formulaic_metadata__,
+                            )
+                        else:
+                            encoded = map_dict(self._encode_numerical)(
+                                factor_values,
+                                factor.metadata,
+                                encoder_state,
+                                spec,
+                                drop_rows,
+                            )
                     elif factor.metadata.kind is Factor.Kind.CONSTANT:
                         encoded = map_dict(self._encode_constant)(
                             factor_values,
@@ -663,7 +1043,7 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
 
                 # Only encode once for encodings where we can just drop a field
                 # later on below.
-                if isinstance(encoded, dict) and factor.metadata.drop_field:
+                if isinstance(encoded, Mapping) and factor.metadata.drop_field:
                     cache_key = factor.expr
                 else:
                     cache_key = (factor.expr, reduced_rank)
@@ -680,16 +1060,23 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
             encoded=True,
         )
 
-        # Encoded factors will now all be dicts
+        # Encoded factors will now all be mappings of columns (dicts or
+        # `ColumnBlock` instances)
         if (
-            isinstance(encoded, dict)
+            isinstance(encoded, Mapping)
             and encoded.__formulaic_metadata__.spans_intercept
             and reduced_rank
         ):
-            encoded = FactorValues(
-                encoded.copy(), metadata=encoded.__formulaic_metadata__
-            )
-            del encoded[encoded.__formulaic_metadata__.drop_field]
+            drop_field = encoded.__formulaic_metadata__.drop_field
+            if isinstance(encoded, ColumnBlock):
+                encoded = FactorValues(
+                    encoded.drop(drop_field), metadata=encoded.__formulaic_metadata__
+                )
+            else:
+                encoded = FactorValues(
+                    encoded.copy(), metadata=encoded.__formulaic_metadata__
+                )
+                del encoded[drop_field]
 
         return self._flatten_encoded_evaled_factor(factor.expr, encoded)
 
@@ -706,7 +1093,7 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
     def _flatten_encoded_evaled_factor(
         self, name: str, values: FactorValues[dict]
     ) -> Dict[str, Any]:
-        if not isinstance(values, dict):
+        if not isinstance(values, Mapping):
             return {name: values}
 
         # Some nested dictionaries may not be a `FactorValues[dict]` instance,
@@ -716,12 +1103,18 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         else:
             name_format = FactorValuesMetadata.format
 
+        # Blocks of columns are kept intact, and only their columns renamed.
+        if isinstance(values, ColumnBlock):
+            return values.rename(
+                name_format.format(name=name, field=field) for field in values.names
+            )
+
         flattened = {}
         for subfield, value in values.items():
             if isinstance(subfield, str) and subfield.startswith("__"):
                 continue
             subname = name_format.format(name=name, field=subfield)
-            if isinstance(value, dict):
+            if isinstance(value, Mapping):
                 flattened.update(self._flatten_encoded_evaled_factor(subname, value))
             else:
                 flattened[subname] = value
@@ -742,6 +1135,20 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
     def _encode_numerical(self, values, metadata, encoder_state, spec, drop_rows):
         pass  # pragma: no cover
 
+    def _encode_numerical_block(
+        self, values: ColumnBlock, metadata, encoder_state, spec, drop_rows
+    ) -> Mapping:
+        """
+        Encode a block of numerical columns (e.g. the output of a transform
+        that generates a two-dimensional array). Materializers able to encode
+        the block as a whole should override this method; by default, each
+        column is encoded separately using `._encode_numerical()`.
+        """
+        return {
+            name: self._encode_numerical(column, metadata, {}, spec, drop_rows)
+            for name, column in values.items()
+        }
+
     # Methods related to ModelMatrix output
 
     def _enforce_structure(
@@ -751,8 +1158,12 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         drop_rows: set,
     ) -> Generator[Tuple[Term, List[ScopedTerm], Dict[str, Any]]]:
         # TODO: Verify that imputation strategies are intuitive and make sense.
-        assert len(cols) == len(spec.structure)
+        # Note: `cols` may be a generator, and so we check that the number of
+        # terms is consistent as we go.
+        n_terms = 0
         for i, col_spec in enumerate(cols):
+            assert i < len(spec.structure)
+            n_terms += 1
             scoped_cols = col_spec[2]
             target_cols = spec.structure[i][2]
             if len(scoped_cols) > len(target_cols):
@@ -777,8 +1188,27 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
             yield col_spec[0], col_spec[1], {
                 col: scoped_cols[col] for col in target_cols
             }
+        assert n_terms == len(spec.structure)
 
-    def _get_columns_for_term(self, factors, spec, scale=1):
+    def _get_column_names_for_term(self, factors):
+        """
+        Generate the names of the columns that would be generated by
+        `._get_columns_for_term()` for the nominated factors (in the same
+        order), without computing any of the columns.
+
+        Args:
+            factors: The encoded factors (mappings from column name to values,
+                such as dictionaries or `ColumnBlock` instances).
+
+        Returns:
+            list
+        """
+        return [
+            ":".join(reversed(product))
+            for product in itertools.product(*reversed(factors))
+        ]
+
+    def _get_columns_for_term(self, factors, spec, scale=1, columns=None, out=None):
         """
         Assemble the columns for a model matrix given factors and a scale.
 
@@ -789,6 +1219,11 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
         Args:
             factors
             scale
+            columns: If specified, only columns with names in this collection
+                are generated (all others are skipped).
+            out: An optional mapping from column names to arrays into which
+                the columns may be written (implementations may ignore this,
+                in which case the columns are copied into place later).
 
         Returns:
             dict
@@ -798,11 +1233,57 @@ class FormulaMaterializer(metaclass=FormulaMaterializerMeta):
             *(factor.items() for factor in reversed(factors))
         ):
             product = reverse_product[::-1]
-            out[":".join(p[0] for p in product)] = scale * functools.reduce(
-                operator.mul, (p[1] for p in product)
-            )
+            name = ":".join(p[0] for p in product)
+            if columns is not None and name not in columns:
+                continue
+            out[name] = scale * functools.reduce(operator.mul, (p[1] for p in product))
         return out
 
     @abstractmethod
     def _combine_columns(self, cols, spec, drop_rows):
         pass  # pragma: no cover
+
+    def _prepare_output_buffers(
+        self, out, column_names: List[str], drop_rows
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Prepare and validate an output array (or file) into which a model
+        matrix should be written.
+
+        Args:
+            out: The destination of the model matrix (as passed by the user).
+            column_names: The names of the columns of the model matrix.
+            drop_rows: The rows to be dropped from the data.
+
+        Returns:
+            A tuple of form `(out, buffers)`, where `out` is the (validated)
+            output array, and `buffers` is a mapping from column names to
+            writable views onto the corresponding columns of `out`.
+        """
+        raise FormulaMaterializationError(
+            f"`{self.__class__.__name__}` does not support writing model matrices into existing arrays."
+        )
+
+    def _write_columns(self, cols, spec, drop_rows, out, buffers):
+        """
+        Write the columns of a model matrix into an existing array (or file)
+        as they are generated, rather than collating them in memory.
+
+        Args:
+            cols: An iterable of `(name, values)` tuples for each column of the
+                model matrix (in order).
+            spec: The `ModelSpec` instance for which the model matrix is being
+                generated.
+            drop_rows: The rows dropped from the data.
+            out: The destination of the model matrix (as returned by
+                `._prepare_output_buffers()`).
+            buffers: The mapping from column names to views onto `out`.
+                Columns whose values are these views have already been
+                written, and are not copied.
+
+        Returns:
+            The array into which the model matrix was written.
+        """
+        raise FormulaMaterializationError(
+            f"`{self.__class__.__name__}` does not support writing model matrices into existing arrays."
+        )  # pragma: no cover
@@ -0,0 +1,231 @@
+import numpy
+import pandas
+import scipy.sparse as spsparse
+from interface_meta import override
+
+from formulaic.transforms.contrasts import _warn_extra_categories
+from formulaic.utils.cast import as_columns
+
+from .pandas import SPARSE_FORMATS, PandasMaterializer
+from .types import ConstantColumn, FactorValues, NAAction
+
+
+class NumpyMaterializer(PandasMaterializer):
+    """
+    A lightweight materializer for dictionaries of one-dimensional numpy arrays
+    (and numpy structured arrays). Null handling, categorical encoding and the
+    assembly of the model matrix are all performed directly on numpy arrays,
+    avoiding the overhead of constructing pandas objects for every factor.
+
+    Categorical factors are encoded using the default (treatment) contrasts
+    and the same encoder state as `encode_contrasts`, and so model specs can
+    be shared with the other materializers. Explicit `C(...)` transforms
+    continue to use `encode_contrasts`.
+    """
+
+    REGISTER_NAME = "numpy"
+    REGISTER_INPUTS = ("builtins.dict", "numpy.ndarray")
+    REGISTER_OUTPUTS = ("numpy", "sparse", "sparse_csr", "sparse_coo", "pandas")
+
+    @override
+    def _init(self):
+        super()._init()
+        if isinstance(self.data, numpy.ndarray):
+            if self.data.dtype.names is None:
+                raise ValueError(
+                    "Only structured numpy arrays (with named fields) can be used as input data; please pass a dictionary of columns instead."
+                )
+            columns = {name: self.data[name] for name in self.data.dtype.names}
+        else:
+            columns = {
+                name: numpy.asarray(values) for name, values in self.data.items()
+            }
+        nrows = {values.shape[0] for values in columns.values()}
+        if len(nrows) > 1 or any(values.ndim != 1 for values in columns.values()):
+            raise ValueError(
+                "All columns must be one-dimensional arrays with the same number of rows."
+            )
+        self.__data_context = columns
+        self.__nrows = nrows.pop() if nrows else 0
+
+    @override
+    @property
+    def data_context(self):
+        return self.__data_context
+
+    @override
+    @property
+    def nrows(self):
+        return self.__nrows
+
+    @override
+    def _is_categorical(self, values):
+        if isinstance(values, numpy.ndarray):
+            return values.dtype.kind in "OSU"
+        return super()._is_categorical(values)
+
+    @override
+    def _check_for_nulls(self, name, values, na_action, drop_rows):
+        if not isinstance(values, numpy.ndarray):
+            return super()._check_for_nulls(name, values, na_action, drop_rows)
+
+        if na_action is NAAction.IGNORE:
+            return
+
+        nulls = _get_null_mask(_as_array(values))
+        if nulls is None:
+            return
+        if na_action is NAAction.RAISE:
+            if nulls.any():
+                raise ValueError(f"`{name}` contains null values after evaluation.")
+        elif na_action is NAAction.DROP:
+            drop_rows.update(numpy.flatnonzero(nulls))
+        else:
+            raise ValueError(
+                f"Do not know how to interpret `na_action` = {repr(na_action)}."
+            )  # pragma: no cover; this is currently impossible to reach
+
+    @override
+    def _encode_numerical(self, values, metadata, encoder_state, spec, drop_rows):
+        if not isinstance(values, numpy.ndarray):
+            return super()._encode_numerical(
+                values, metadata, encoder_state, spec, drop_rows
+            )
+        values = _as_array(values)
+        if drop_rows:
+            values = numpy.delete(values, drop_rows)
+        if spec.output == "sparse":
+            return spsparse.csc_matrix(values.reshape((-1, 1)))
+        return values
+
+    @override
+    def _encode_categorical(
+        self, values, metadata, encoder_state, spec, drop_rows, reduced_rank=False
+    ):
+        # As for `PandasMaterializer`, we do not reduce the rank here so that
+        # the same encoding can be used for both reduced and unreduced rank.
+        from formulaic.transforms.contrasts import TreatmentContrasts
+
+        if not isinstance(values, numpy.ndarray):
+            return super()._encode_categorical(
+                values,
+                metadata,
+                encoder_state,
+                spec,
+                drop_rows,
+                reduced_rank=reduced_rank,
+            )
+
+        values = _as_array(values)
+        if drop_rows:
+            values = numpy.delete(values, drop_rows)
+        nulls = _get_null_mask(values)
+        non_null = values if nulls is None else values[~nulls]
+
+        levels = encoder_state.get("categories")
+        if levels is None:
+            levels = numpy.unique(non_null).tolist()
+        codes = _get_level_codes(values, nulls, levels)
+        encoder_state["categories"] = levels
+
+        rows = numpy.flatnonzero(codes >= 0)
+        shape = (values.shape[0], len(levels))
+        if spec.output == "sparse":
+            dummies = spsparse.csc_matrix(
+                (numpy.ones(rows.shape[0]), (rows, codes[rows])), shape=shape
+            )
+        else:
+            dummies = numpy.zeros(shape, dtype=numpy.uint8, order="F")
+            dummies[rows, codes[rows]] = 1
+
+        return as_columns(
+            TreatmentContrasts().apply(
+                dummies,
+                levels=levels,
+                reduced_rank=False,
+                output="sparse" if spec.output == "sparse" else "numpy",
+            )
+        )
+
+    @override
+    def _combine_columns(self, cols, spec, drop_rows):
+        if spec.output in SPARSE_FORMATS:
+            return super()._combine_columns(cols, spec, drop_rows)
+
+        nrows = self.nrows - len(drop_rows)
+        values = numpy.empty(
+            (nrows, len(cols)),
+            dtype=numpy.result_type(*{col[1].dtype for col in cols}) if cols else float,
+            order="F",
+        )
+        for i, (_, column) in enumerate(cols):
+            values[:, i] = (
+                column.value if isinstance(column, ConstantColumn) else column
+            )
+        if spec.output == "pandas":
+            return pandas.DataFrame(
+                values,
+                columns=[col[0] for col in cols],
+                index=numpy.delete(numpy.arange(self.nrows), drop_rows),
+            )
+        return values
+
+
+def _as_array(values) -> numpy.ndarray:
+    """
+    Unwrap `FactorValues` instances wrapping numpy arrays. Note that
+    `numpy.asarray` cannot be used directly on the proxy objects, since this
+    goes through the buffer protocol which mangles string arrays.
+    """
+    if isinstance(values, FactorValues):
+        values = values.__wrapped__
+    return numpy.asarray(values)
+
+
+def _get_null_mask(values: numpy.ndarray):
+    """
+    Return a boolean mask indicating which values of `values` are null, or
+    `None` if the dtype of `values` cannot represent nulls.
+    """
+    if values.dtype.kind in "fc":
+        return numpy.isnan(values)
+    if values.dtype.kind in "mM":
+        return numpy.isnat(values)
+    if values.dtype.kind == "O":
+        return pandas.isnull(values)
+    return None
+
+
+def _get_level_codes(values: numpy.ndarray, nulls, levels) -> numpy.ndarray:
+    """
+    Look up the index of each value of `values` in `levels` by binary search
+    over the sorted levels, returning `-1` for null values and values not
+    present in `levels` (with a `DataMismatchWarning` emitted for the latter).
+    """
+    codes = numpy.full(values.shape[0], -1, dtype=numpy.intp)
+    rows = numpy.arange(values.shape[0]) if nulls is None else numpy.flatnonzero(~nulls)
+    values = values[rows]
+
+    if levels:
+        # String levels are compared using a dtype wide enough for both the
+        # levels and the values, so that neither is truncated.
+        sorted_levels = numpy.asarray(levels)
+        if values.dtype.kind in "SU" and sorted_levels.dtype.kind == values.dtype.kind:
+            sorted_levels = sorted_levels.astype(
+                numpy.result_type(sorted_levels.dtype, values.dtype)
+            )
+        else:
+            sorted_levels = numpy.array(levels, dtype=object)
+        order = numpy.argsort(sorted_levels, kind="stable")
+        sorted_levels = sorted_levels[order]
+
+        positions = numpy.searchsorted(sorted_levels, values)
+        positions[positions == len(levels)] = 0
+        found = sorted_levels[positions] == values
+        codes[rows[found]] = order[positions[found]]
+        unknown = values[~found]
+    else:
+        unknown = values
+
+    _warn_extra_categories(set(unknown.tolist()))
+    return codes
@@ -1,5 +1,6 @@
 import functools
 import itertools
+import os
 from collections import OrderedDict
 
 import numpy
@@ -7,16 +8,38 @@ import pandas
 import scipy.sparse as spsparse
 from interface_meta import override
 from formulaic.utils.cast import as_columns
+from formulaic.utils.sparse import (
+    hstack_csc_columns,
+    sparse_rowwise_kronecker,
+    split_csc_columns,
+)
 
 from .base import FormulaMaterializer
-from .types import NAAction
+from .types import ColumnBlock, ConstantColumn, NAAction
+
+
+# The `scipy.sparse` formats of each of the sparse output types.
+SPARSE_FORMATS = {"sparse": "csc", "sparse_csr": "csr", "sparse_coo": "coo"}
 
 
 class PandasMaterializer(FormulaMaterializer):
 
     REGISTER_NAME = "pandas"
     REGISTER_INPUTS = ("pandas.core.frame.DataFrame",)
-    REGISTER_OUTPUTS = ("pandas", "numpy", "sparse")
+    REGISTER_OUTPUTS = (
+        "pandas",
+        "numpy",
+        "sparse",
+        "sparse_csr",
+        "sparse_coo",
+        "lazy",
+        "linear_operator",
+    )
+    ENCODING_OUTPUTS = {"sparse_csr": "sparse", "sparse_coo": "sparse"}
+
+    @override
+    def _init(self):
+        self._indicator_codes_cache = {}
 
     @override
     def _is_categorical(self, values):
@@ -53,22 +76,36 @@ class PandasMaterializer(FormulaMaterializer):
 
     @override
     def _encode_constant(self, value, metadata, encoder_state, spec, drop_rows):
+        # Constants are only expanded (if at all) when the model matrix is
+        # assembled; see `._combine_columns()`.
+        return ConstantColumn(value, self.nrows - len(drop_rows))
+
+    @override
+    def _encode_numerical(self, values, metadata, encoder_state, spec, drop_rows):
+        if drop_rows:
+            if isinstance(values, pandas.Series):
+                values = values.drop(index=values.index[drop_rows])
+            else:
+                values = numpy.delete(values, drop_rows)
         if spec.output == "sparse":
             return spsparse.csc_matrix(
-                numpy.array([value] * self.nrows).reshape(
-                    (self.nrows - len(drop_rows), 1)
-                )
+                numpy.array(values).reshape((self.nrows - len(drop_rows), 1))
             )
-        series = value * numpy.ones(self.nrows - len(drop_rows))
-        return series
+        return values
 
     @override
-    def _encode_numerical(self, values, metadata, encoder_state, spec, drop_rows):
+    def _encode_numerical_block(self, values, metadata, encoder_state, spec, drop_rows):
+        block = values.matrix
         if drop_rows:
-            values = values.drop(index=values.index[drop_rows])
+            if spsparse.issparse(block):
+                block = block[numpy.delete(numpy.arange(block.shape[0]), drop_rows)]
+            else:
+                block = numpy.delete(numpy.asarray(block), drop_rows, axis=0)
         if spec.output == "sparse":
-            return spsparse.csc_matrix(numpy.array(values).reshape((self.nrows, 1)))
-        return values
+            block = spsparse.csc_matrix(block)
+        elif spsparse.issparse(block):
+            block = block.toarray()
+        return ColumnBlock(block, names=values.names)
 
     @override
     def _encode_categorical(
@@ -92,57 +129,266 @@ class PandasMaterializer(FormulaMaterializer):
         )
 
     @override
-    def _get_columns_for_term(self, factors, spec, scale=1):
+    def _get_columns_for_term(self, factors, spec, scale=1, columns=None, out=None):
+        buffers = out or {}
         out = OrderedDict()
 
-        names = [
-            ":".join(reversed(product))
-            for product in itertools.product(*reversed(factors))
-        ]
+        names = self._get_column_names_for_term(factors)
+        if not names or (
+            columns is not None and not any(name in columns for name in names)
+        ):
+            return out
+
+        if spec.output == "sparse":
+            return self._get_sparse_columns_for_term(
+                factors, names, scale=scale, columns=columns
+            )
+
+        # If all factors are indicator encoded (e.g. dummy encoded categorical
+        # factors), generate the columns from the combined level codes.
+        if len(factors) > 1:
+            indicator_codes = []
+            for factor in factors:
+                codes = self._get_indicator_codes(factor)
+                if codes is None:
+                    break
+                indicator_codes.append(codes)
+            else:
+                return self._get_indicator_columns_for_term(
+                    indicator_codes, names, scale=scale, columns=columns, out=buffers
+                )
 
-        # Pre-multiply factors with only one set of values (improves performance)
+        # If all columns are required (and are not being written into existing
+        # buffers), compute the row-wise Kronecker product of the factors as a
+        # single block.
+        if not buffers and (columns is None or all(name in columns for name in names)):
+            blocks = [self._get_dense_block_for_factor(factor) for factor in factors]
+            if all(block is not None for block in blocks):
+                return self._get_dense_block_for_term(blocks, names, scale=scale)
+
+        # Pre-multiply factors with only one set of values (improves performance
+        # when not writing into existing buffers, since it allocates)
         solo_factors = {}
         indices = []
         for i, factor in enumerate(factors):
             if len(factor) == 1:
                 solo_factors.update(factor)
                 indices.append(i)
-        if solo_factors:
+        if solo_factors and not buffers:
             for index in reversed(indices):
                 factors.pop(index)
-            if spec.output == "sparse":
-                factors.append(
-                    {
-                        ":".join(solo_factors): functools.reduce(
-                            spsparse.csc_matrix.multiply, solo_factors.values()
-                        )
-                    }
-                )
-            else:
-                factors.append(
-                    {
-                        ":".join(solo_factors): functools.reduce(
-                            numpy.multiply,
-                            (numpy.asanyarray(p) for p in solo_factors.values()),
-                        )
-                    }
-                )
+            factors.append(
+                {
+                    ":".join(solo_factors): functools.reduce(
+                        numpy.multiply,
+                        (numpy.asanyarray(p) for p in solo_factors.values()),
+                    )
+                }
+            )
 
         for i, reversed_product in enumerate(
             itertools.product(*(factor.items() for factor in reversed(factors)))
         ):
-            if spec.output == "sparse":
-                out[names[i]] = scale * functools.reduce(
-                    spsparse.csc_matrix.multiply,
-                    (p[1] for p in reversed(reversed_product)),
-                )
-            else:
-                out[names[i]] = scale * functools.reduce(
-                    numpy.multiply,
-                    (numpy.array(p[1]) for p in reversed(reversed_product)),
+            if columns is not None and names[i] not in columns:
+                continue
+            if names[i] in buffers:
+                out[names[i]] = self._multiply_into(
+                    buffers[names[i]],
+                    (numpy.asarray(p[1]) for p in reversed(reversed_product)),
+                    scale=scale,
                 )
+                continue
+            out[names[i]] = scale * functools.reduce(
+                numpy.multiply,
+                (numpy.array(p[1]) for p in reversed(reversed_product)),
+            )
         return out
 
+    @staticmethod
+    def _get_dense_block_for_factor(factor):
+        """
+        Return the transpose of the dense two-dimensional block of the columns
+        of an encoded factor (as a C-contiguous array where possible), or
+        `None` if the factor is not a numerical dense factor.
+        """
+        if isinstance(factor, ColumnBlock):
+            if factor.is_sparse:
+                return None
+            block = numpy.ascontiguousarray(numpy.asarray(factor.matrix).T)
+        else:
+            columns = [numpy.asarray(values) for values in factor.values()]
+            if any(column.ndim != 1 for column in columns):
+                return None
+            block = (
+                columns[0].reshape((1, -1))
+                if len(columns) == 1
+                else numpy.stack(columns)
+            )
+        if block.dtype.kind not in "biufc":
+            return None
+        return block
+
+    @staticmethod
+    def _get_dense_block_for_term(blocks, names, scale=1):
+        """
+        Compute the row-wise Kronecker product of the (transposed) blocks of
+        each factor of a term, with the columns of the first factor varying
+        fastest. The product is computed in transposed form so that the
+        resulting block is column-major, and each column is contiguous.
+        """
+        nrows = blocks[0].shape[1]
+
+        def kronecker(left, right):
+            product = numpy.empty(
+                (right.shape[0], left.shape[0], nrows),
+                dtype=numpy.result_type(left, right),
+            )
+            numpy.multiply(right[:, None, :], left[None, :, :], out=product)
+            return product.reshape((-1, nrows))
+
+        block = functools.reduce(kronecker, blocks)
+        if scale != 1:
+            block = scale * block
+        elif len(blocks) == 1 or block.dtype.kind == "b":
+            # Copy the block, promoting boolean values to integers (as would
+            # scaling them).
+            block = block.astype(numpy.result_type(block.dtype, scale))
+        return ColumnBlock(block.T, names=names)
+
+    @staticmethod
+    def _multiply_into(buffer, factors, scale=1):
+        """
+        Compute the element-wise product of `factors` (and `scale`) in place
+        in `buffer`, without allocating any intermediate arrays.
+        """
+        factors = iter(factors)
+        numpy.copyto(buffer, next(factors), casting="same_kind")
+        for values in factors:
+            numpy.multiply(buffer, values, out=buffer)
+        if scale != 1:
+            numpy.multiply(buffer, scale, out=buffer)
+        return buffer
+
+    def _get_indicator_codes(self, factor):
+        """
+        Determine whether the columns of an encoded factor are indicators of
+        mutually exclusive levels (as is the case for dummy encoded categorical
+        factors, with or without reduced rank), and if so, return a tuple of
+        form `(codes, width, dtype)`, where `codes` is the index of the active
+        column in each row (or -1 if no column is active). Otherwise, return
+        `None`. Results are cached by column names, since encoded factors are
+        reused across the many scoped terms in which they appear.
+        """
+        key = tuple(factor)
+        if key not in self._indicator_codes_cache:
+            self._indicator_codes_cache[key] = None
+
+            if isinstance(factor, ColumnBlock):
+                if factor.is_sparse:
+                    return None
+                block = numpy.asarray(factor.matrix)
+                if block.dtype.kind not in "biuf":
+                    return None
+                active = block != 0
+                if numpy.any(block[active] != 1) or numpy.any(active.sum(axis=1) > 1):
+                    return None
+                self._indicator_codes_cache[key] = (
+                    numpy.where(active.any(axis=1), active.argmax(axis=1), -1),
+                    block.shape[1],
+                    block.dtype,
+                )
+                return self._indicator_codes_cache[key]
+
+            codes = None
+            dtypes = []
+            for i, values in enumerate(factor.values()):
+                values = numpy.asarray(values)
+                if values.ndim != 1 or values.dtype.kind not in "biuf":
+                    return None
+                if codes is None:
+                    codes = numpy.full(values.shape[0], -1, dtype=numpy.intp)
+                active = numpy.flatnonzero(values)
+                if numpy.any(values[active] != 1) or numpy.any(codes[active] != -1):
+                    return None
+                codes[active] = i
+                dtypes.append(values.dtype)
+
+            if codes is not None:
+                self._indicator_codes_cache[key] = (
+                    codes,
+                    len(dtypes),
+                    numpy.result_type(*dtypes),
+                )
+        return self._indicator_codes_cache[key]
+
+    def _get_indicator_columns_for_term(
+        self, indicator_codes, names, scale=1, columns=None, out=None
+    ):
+        """
+        Assemble the columns for a term all of whose factors are indicator
+        encoded by combining the codes of each factor into a single code (with
+        the first factor varying fastest), and then emitting the indicators of
+        the combined codes. Rows for which any factor has no active column
+        (e.g. the dropped level of a reduced rank factor) have no active
+        column in the output. If buffers are provided (via `out`) for all of
+        the requested columns, the indicators are scattered directly into them.
+        """
+        codes, widths, dtypes = zip(*indicator_codes)
+        nrows = len(codes[0])
+        valid = numpy.flatnonzero(numpy.all([c >= 0 for c in codes], axis=0))
+        combined = numpy.ravel_multi_index(
+            [c[valid] for c in reversed(codes)], widths[::-1]
+        )
+
+        requested = [name for name in names if columns is None or name in columns]
+        if out and all(name in out for name in requested):
+            # Group the active rows by column, so that each buffer need only be
+            # zeroed and then have its active rows set.
+            order = numpy.argsort(combined, kind="stable")
+            bounds = numpy.cumsum(numpy.bincount(combined, minlength=len(names)))
+            rows = numpy.split(valid[order], bounds[:-1])
+            cols = OrderedDict()
+            for i, name in enumerate(names):
+                if name in requested:
+                    out[name][...] = 0
+                    out[name][rows[i]] = scale
+                    cols[name] = out[name]
+            return cols
+
+        block = numpy.zeros(
+            (nrows, len(names)), dtype=numpy.result_type(*dtypes, scale), order="F"
+        )
+        block[valid, combined] = scale
+        return OrderedDict(
+            (name, block[:, i])
+            for i, name in enumerate(names)
+            if columns is None or name in columns
+        )
+
+    def _get_sparse_columns_for_term(self, factors, names, scale=1, columns=None):
+        """
+        Assemble the sparse columns for a term by computing the row-wise
+        Kronecker product of the (sparse) blocks of each factor in one step,
+        rather than multiplying each combination of columns separately.
+        """
+        block = functools.reduce(
+            sparse_rowwise_kronecker,
+            (
+                spsparse.csc_matrix(factor.matrix)
+                if isinstance(factor, ColumnBlock)
+                else hstack_csc_columns(factor.values())
+                for factor in factors
+            ),
+        )
+        if scale != 1 or block.dtype.kind == "b":
+            block = scale * block
+        block.eliminate_zeros()
+        return OrderedDict(
+            (name, column)
+            for name, column in zip(names, split_csc_columns(block))
+            if columns is None or name in columns
+        )
+
     @override
     def _combine_columns(self, cols, spec, drop_rows):
         # If we are outputing a pandas DataFrame, explicitly override index
@@ -152,22 +398,88 @@ class PandasMaterializer(FormulaMaterializer):
             if drop_rows:
                 pandas_index = pandas_index.drop(self.data_context.index[drop_rows])
 
-        # Special case no columns to empty csc_matrix, array, or DataFrame
+        # Special case no columns to empty sparse matrix, array, or DataFrame
         if not cols:
-            values = numpy.empty((self.data.shape[0], 0))
-            if spec.output == "sparse":
-                return spsparse.csc_matrix(values)
+            values = numpy.empty((self.nrows, 0))
+            if spec.output in SPARSE_FORMATS:
+                return spsparse.csc_matrix(values).asformat(SPARSE_FORMATS[spec.output])
             if spec.output == "numpy":
                 return values
             return pandas.DataFrame(index=pandas_index)
 
-        # Otherwise, concatenate columns into model matrix
-        if spec.output == "sparse":
-            return spsparse.hstack([col[1] for col in cols])
+        # Otherwise, concatenate columns into model matrix. Sparse columns are
+        # always encoded in column-major form, but row-major and coordinate
+        # outputs are assembled directly from the buffers of these columns.
+        if spec.output in SPARSE_FORMATS:
+            return hstack_csc_columns(
+                (
+                    col[1].tocsc() if isinstance(col[1], ConstantColumn) else col[1]
+                    for col in cols
+                ),
+                format=SPARSE_FORMATS[spec.output],
+            )
         if spec.output == "numpy":
-            return numpy.stack([col[1] for col in cols], axis=1)
+            # Columns are written into a column-major array, so that each
+            # column (which is typically a view onto a column-major block of
+            # columns) is copied into a contiguous region of memory.
+            values = numpy.empty(
+                (self.nrows - len(drop_rows), len(cols)),
+                dtype=numpy.result_type(
+                    *{
+                        col[1].dtype
+                        if isinstance(col[1], ConstantColumn)
+                        else numpy.asarray(col[1]).dtype
+                        for col in cols
+                    }
+                ),
+                order="F",
+            )
+            for i, (_, column) in enumerate(cols):
+                values[:, i] = (
+                    column.value if isinstance(column, ConstantColumn) else column
+                )
+            return values
         return pandas.DataFrame(
-            {col[0]: col[1] for col in cols},
+            {
+                col[0]: col[1].value if isinstance(col[1], ConstantColumn) else col[1]
+                for col in cols
+            },
             index=pandas_index,
             copy=False,
         )
+
+    @override
+    def _prepare_output_buffers(self, out, column_names, drop_rows):
+        shape = (self.nrows - len(drop_rows), len(column_names))
+        if isinstance(out, (str, os.PathLike)):
+            # Column-major order ensures that each column is written to a
+            # contiguous region of the file.
+            out = numpy.lib.format.open_memmap(
+                out, mode="w+", dtype=float, shape=shape, fortran_order=True
+            )
+        elif not isinstance(out, numpy.ndarray):
+            raise TypeError(
+                f"`out` must be a `numpy.ndarray` (or `numpy.memmap`) instance or a path to an `.npy` file, not `{type(out).__name__}`."
+            )
+        if out.shape != shape:
+            raise ValueError(
+                f"`out` has shape {out.shape}, but the model matrix has shape {shape}."
+            )
+        if out.dtype.kind not in "fc":
+            raise TypeError(
+                f"`out` must have a floating point (or complex) dtype, not `{out.dtype}`."
+            )
+        if not out.flags.writeable:
+            raise ValueError("`out` must be writeable.")
+        return out, {name: out[:, i] for i, name in enumerate(column_names)}
+
+    @override
+    def _write_columns(self, cols, spec, drop_rows, out, buffers):
+        for i, (name, values) in enumerate(cols):
+            if isinstance(values, ConstantColumn):
+                out[:, i] = values.value
+            elif values is not buffers.get(name):
+                out[:, i] = values
+        if isinstance(out, numpy.memmap):
+            out.flush()
+        return out
@@ -0,0 +1,231 @@
+import functools
+from collections.abc import Mapping
+
+import numpy
+import pandas
+import scipy.sparse as spsparse
+from interface_meta import override
+
+from formulaic.utils.sparse import split_csc_columns
+from formulaic.utils.stateful_transforms import stateful_eval
+
+from .pandas import PandasMaterializer
+from .types import NAAction
+
+
+class SparseMaterializer(PandasMaterializer):
+    """
+    A materializer for `scipy.sparse` matrices (and dictionaries of named
+    columns, some or all of which are sparse), which keeps sparse numerical
+    columns sparse during encoding and the computation of interactions.
+
+    Since sparse matrices do not have column names, these can be passed via
+    the `column_names` materializer parameter (e.g.
+    `model_matrix(..., materializer_params={"column_names": [...]})`), and
+    otherwise default to `x0`, `x1`, etc. Dictionaries of columns are not
+    automatically dispatched to this materializer, and so must be passed
+    along with `materializer="sparse"`. Dictionary values can be sparse column
+    vectors, or any one-dimensional values supported by `pandas.Series`.
+    """
+
+    REGISTER_NAME = "sparse"
+    REGISTER_INPUTS = tuple(
+        f"scipy.sparse.{module}{fmt}.{fmt}_{kind}"
+        for fmt in ("csc", "csr", "coo")
+        for kind in ("matrix", "array")
+        for module in ("_", "")
+    )
+    REGISTER_OUTPUTS = ("pandas", "numpy", "sparse", "sparse_csr", "sparse_coo")
+
+    @override
+    def _init(self):
+        super()._init()
+        self.__data_context = LazySparseColumnProxy(
+            self.data, column_names=self.params.get("column_names")
+        )
+
+    @override
+    @property
+    def data_context(self):
+        return self.__data_context
+
+    @override
+    @property
+    def nrows(self):
+        return self.__data_context.nrows
+
+    @override
+    def _evaluate(self, expr, metadata, spec):
+        # Stateful transforms (such as `poly` and `bs`) generally only support
+        # dense inputs, and so sparse columns are densified before being passed
+        # to them. Other python expressions see the sparse columns as is.
+        return stateful_eval(
+            expr,
+            DenseStatefulTransformsProxy(self.layered_context),
+            {expr: metadata},
+            spec.transform_state,
+            spec,
+        )
+
+    @override
+    def _extract_columns_for_encoding(self, factor):
+        if spsparse.issparse(factor.values):
+            if factor.values.shape[1] == 1:
+                return spsparse.csc_matrix(factor.values)
+            return dict(enumerate(split_csc_columns(factor.values)))
+        return super()._extract_columns_for_encoding(factor)
+
+    @override
+    def _check_for_nulls(self, name, values, na_action, drop_rows):
+        if not spsparse.issparse(values):
+            return super()._check_for_nulls(name, values, na_action, drop_rows)
+
+        if na_action is NAAction.IGNORE:
+            return
+
+        values = spsparse.coo_matrix(values)
+        null_rows = values.row[pandas.isnull(values.data)]
+        if na_action is NAAction.RAISE:
+            if len(null_rows):
+                raise ValueError(f"`{name}` contains null values after evaluation.")
+        elif na_action is NAAction.DROP:
+            drop_rows.update(null_rows)
+        else:
+            raise ValueError(
+                f"Do not know how to interpret `na_action` = {repr(na_action)}."
+            )  # pragma: no cover; this is currently impossible to reach
+
+    @override
+    def _encode_numerical(self, values, metadata, encoder_state, spec, drop_rows):
+        if not spsparse.issparse(values):
+            return super()._encode_numerical(
+                values, metadata, encoder_state, spec, drop_rows
+            )
+        values = spsparse.csc_matrix(values)
+        if drop_rows:
+            values = values[numpy.setdiff1d(numpy.arange(self.nrows), drop_rows)]
+        if spec.output == "sparse":
+            return values
+        return values.toarray().ravel()
+
+    @override
+    def _encode_categorical(
+        self, values, metadata, encoder_state, spec, drop_rows, reduced_rank=False
+    ):
+        if spsparse.issparse(values):
+            values = pandas.Series(values.toarray().ravel())
+        return super()._encode_categorical(
+            values, metadata, encoder_state, spec, drop_rows, reduced_rank=reduced_rank
+        )
+
+
+class LazySparseColumnProxy(Mapping):
+    """
+    A mapping from column names to the columns of a sparse matrix (or a
+    dictionary of columns). Columns of sparse matrices are extracted lazily as
+    single-column `csc_matrix` instances sharing the buffers of the original
+    matrix, and one-dimensional dense columns are exposed as `pandas.Series`
+    instances.
+    """
+
+    def __init__(self, data, column_names=None):
+        if isinstance(data, dict):
+            self.matrix = None
+            self.column_names = list(data)
+            self._cache = {
+                name: self.__prepare_column(name, values)
+                for name, values in data.items()
+            }
+            nrows = {column.shape[0] for column in self._cache.values()}
+            if len(nrows) > 1:
+                raise ValueError(
+                    f"All columns must have the same number of rows; got {nrows}."
+                )
+            self.nrows = nrows.pop() if nrows else 0
+        else:
+            self.matrix = spsparse.csc_matrix(data)
+            self.nrows = self.matrix.shape[0]
+            self.column_names = (
+                list(column_names)
+                if column_names is not None
+                else [f"x{i}" for i in range(self.matrix.shape[1])]
+            )
+            if len(self.column_names) != self.matrix.shape[1]:
+                raise ValueError(
+                    f"The number of column names ({len(self.column_names)}) does not match the number of columns in the data ({self.matrix.shape[1]})."
+                )
+            self._cache = {}
+        self._indices = {name: i for i, name in enumerate(self.column_names)}
+        self.index = pandas.RangeIndex(self.nrows)
+
+    @staticmethod
+    def __prepare_column(name, values):
+        if spsparse.issparse(values):
+            if values.shape[0] == 1 and values.shape[1] != 1:
+                values = values.T
+            if values.shape[1] != 1:
+                raise ValueError(
+                    f"Sparse column `{name}` must be a column (or row) vector; got shape {values.shape}."
+                )
+            return spsparse.csc_matrix(values)
+        return pandas.Series(values)
+
+    def __contains__(self, value):
+        return value in self._indices
+
+    def __getitem__(self, key):
+        if key not in self._indices:
+            raise KeyError(key)
+        if key not in self._cache:
+            self._cache[key] = split_csc_columns(self.matrix, [self._indices[key]])[0]
+        return self._cache[key]
+
+    def __iter__(self):
+        return iter(self.column_names)
+
+    def __len__(self):
+        return len(self.column_names)
+
+
+class DenseStatefulTransformsProxy(Mapping):
+    """
+    A proxy for a mapping of names to values (such as the layered context used
+    to evaluate factors) which wraps any stateful transforms such that sparse
+    column vectors passed to them are first converted to dense one-dimensional
+    arrays. All other values are passed through unchanged.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    @staticmethod
+    def __densify(value):
+        if spsparse.issparse(value) and value.shape[1] == 1:
+            return value.toarray().ravel()
+        return value
+
+    @classmethod
+    def __wrap_transform(cls, transform):
+        @functools.wraps(transform)
+        def wrapper(*args, **kwargs):
+            return transform(
+                *(cls.__densify(arg) for arg in args),
+                **{key: cls.__densify(value) for key, value in kwargs.items()},
+            )
+
+        return wrapper
+
+    def __getitem__(self, key):
+        value = self.mapping[key]
+        if getattr(value, "__is_stateful_transform__", False):
+            return self.__wrap_transform(value)
+        return value
+
+    def __contains__(self, key):
+        return key in self.mapping
+
+    def __iter__(self):
+        return iter(self.mapping)
+
+    def __len__(self):
+        return len(self.mapping)
@@ -1,14 +1,22 @@
+from .column_block import ColumnBlock
+from .constant_column import ConstantColumn
 from .enums import ClusterBy, NAAction
 from .evaluated_factor import EvaluatedFactor
 from .factor_values import FactorValues
+from .lazy_model_matrix import LazyModelMatrix
+from .model_matrix_operator import ModelMatrixOperator
 from .scoped_factor import ScopedFactor
 from .scoped_term import ScopedTerm
 
 __all__ = [
+    "ColumnBlock",
+    "ConstantColumn",
     "EvaluatedFactor",
     "FactorValues",
     "ClusterBy",
     "NAAction",
+    "LazyModelMatrix",
+    "ModelMatrixOperator",
     "ScopedFactor",
     "ScopedTerm",
 ]
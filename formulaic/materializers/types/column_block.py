@@ -0,0 +1,132 @@
+from collections.abc import Mapping
+from typing import Any, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import scipy.sparse as spsparse
+
+from formulaic.utils.sparse import split_csc_columns
+
+
+class ColumnBlock(Mapping):
+    """
+    A two-dimensional block of named columns, backed by a single dense
+    `numpy.ndarray` or sparse (column-major) matrix.
+
+    Encoded factors with many columns (e.g. dummy encoded categories, or
+    polynomial and spline bases) are represented using this class rather than
+    a dictionary of separate column arrays, so that they can be encoded and
+    multiplied as a whole. Since instances are also mappings from column names
+    to column values, they can be used anywhere a dictionary of columns is
+    expected; individual columns are only extracted (as views onto the block)
+    when they are accessed.
+
+    Attributes:
+        block: The underlying two-dimensional matrix.
+        names: The names of the columns of this block.
+        indices: The indices of the named columns in `block` (or `None` if
+            the columns of `block` are used as is). This allows columns to be
+            dropped or reordered without copying `block`.
+    """
+
+    def __init__(
+        self,
+        block: Any,
+        names: Iterable[Hashable],
+        indices: Optional[Sequence[int]] = None,
+    ):
+        if spsparse.issparse(block) and block.format != "csc":
+            block = spsparse.csc_matrix(block)
+        if block.ndim != 2:
+            raise ValueError(
+                f"Column blocks must be two-dimensional; got {block.ndim} dimensions."
+            )
+        self.block = block
+        self.names = tuple(names)
+        self.indices = tuple(indices) if indices is not None else None
+        if len(self.names) != (
+            block.shape[1] if self.indices is None else len(self.indices)
+        ):
+            raise ValueError(
+                f"The number of column names ({len(self.names)}) does not match the number of columns in the block."
+            )
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    @property
+    def is_sparse(self) -> bool:
+        return spsparse.issparse(self.block)
+
+    @property
+    def shape(self):
+        return (self.block.shape[0], len(self.names))
+
+    @property
+    def matrix(self) -> Any:
+        """
+        The matrix of the named columns (in order). This is `block` itself
+        unless columns have been dropped or reordered.
+        """
+        if self.indices is None:
+            return self.block
+        return self.block[:, list(self.indices)]
+
+    def select(self, names: Iterable[Hashable]) -> "ColumnBlock":
+        """
+        Return a new `ColumnBlock` instance with only the nominated columns
+        (in the nominated order), sharing the same underlying block.
+        """
+        names = list(names)
+        if names == list(self.names):
+            return self
+        return ColumnBlock(
+            self.block,
+            names=names,
+            indices=[self._get_index(name) for name in names],
+        )
+
+    def drop(self, name: Hashable) -> "ColumnBlock":
+        """
+        Return a new `ColumnBlock` instance without the nominated column,
+        sharing the same underlying block.
+        """
+        if name not in self._positions:
+            raise KeyError(name)
+        return self.select(n for n in self.names if n != name)
+
+    def rename(self, names: Iterable[Hashable]) -> "ColumnBlock":
+        """
+        Return a new `ColumnBlock` instance with the columns renamed to
+        `names`, sharing the same underlying block.
+        """
+        return ColumnBlock(self.block, names=names, indices=self.indices)
+
+    def _get_index(self, name: Hashable) -> int:
+        position = self._positions[name]
+        return position if self.indices is None else self.indices[position]
+
+    # Mapping interface
+
+    def __getitem__(self, name: Hashable) -> Any:
+        index = self._get_index(name)
+        if self.is_sparse:
+            return split_csc_columns(self.block, [index])[0]
+        return self.block[:, index]
+
+    def values(self) -> List[Any]:
+        if self.is_sparse:
+            # Split all of the columns at once (sharing the buffers of `block`)
+            return split_csc_columns(self.block, self.indices)
+        return [self[name] for name in self.names]
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        return list(zip(self.names, self.values()))
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._positions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self):
+        return f"<ColumnBlock of shape {self.shape} with columns {list(self.names)}>"
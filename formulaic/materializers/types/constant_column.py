@@ -0,0 +1,87 @@
+import itertools
+import numbers
+from typing import Any, Iterator, Optional
+
+import numpy
+import scipy.sparse as spsparse
+
+
+class ConstantColumn:
+    """
+    A column all of whose values are the same scalar, represented by that
+    scalar and the number of rows of the column.
+
+    Constant columns (such as the intercept, or columns imputed when a
+    structure is enforced) are represented using this class rather than a
+    dense array of repeated values, so that they are only expanded (if at
+    all) when they are written into the final model matrix. Instances can be
+    passed to `numpy.asarray` (and hence used in arithmetic with arrays),
+    in which case they are expanded into a dense array; and scaling by a
+    scalar returns another `ConstantColumn` instance.
+
+    Attributes:
+        value: The (numpy scalar) value of every row of the column.
+        nrows: The number of rows in the column.
+    """
+
+    def __init__(self, value: Any, nrows: int):
+        value = getattr(value, "__wrapped__", value)
+        dtype = numpy.result_type(value, numpy.float64)
+        self.value = dtype.type(value)
+        self.nrows = nrows
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        return self.value.dtype
+
+    @property
+    def shape(self):
+        return (self.nrows,)
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def __iter__(self) -> Iterator[Any]:
+        return itertools.repeat(self.value, self.nrows)
+
+    def __array__(
+        self, dtype: Optional[numpy.dtype] = None, copy: Optional[bool] = None
+    ) -> numpy.ndarray:
+        # A new array is always constructed, and so (as of NumPy 2) we must
+        # raise if we are asked not to copy.
+        if copy is False:
+            raise ValueError(
+                "A `ConstantColumn` instance cannot be converted to an array without copying."
+            )
+        return numpy.full(self.nrows, self.value, dtype=dtype or self.dtype)
+
+    def tocsc(self) -> spsparse.csc_matrix:
+        """
+        The column as a single column `scipy.sparse.csc_matrix` instance, with
+        no entries stored if `value` is zero.
+        """
+        nnz = self.nrows if self.value != 0 else 0
+        index_dtype = numpy.int32 if nnz < 2**31 else numpy.int64
+        return spsparse.csc_matrix(
+            (
+                numpy.full(nnz, self.value),
+                numpy.arange(nnz, dtype=index_dtype),
+                numpy.array([0, nnz], dtype=index_dtype),
+            ),
+            shape=(self.nrows, 1),
+        )
+
+    def __mul__(self, other: Any) -> Any:
+        other = getattr(other, "__wrapped__", other)
+        if isinstance(other, numbers.Number):
+            return ConstantColumn(self.value * other, self.nrows)
+        return numpy.multiply(numpy.asarray(self), other)
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f"<ConstantColumn of {self.nrows} rows with value {self.value}>"
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, TYPE_CHECKING
+
+import numpy
+
+if TYPE_CHECKING:  # pragma: no cover
+    from formulaic.materializers.base import FormulaMaterializer
+    from formulaic.model_spec import ModelSpec
+
+
+class LazyModelMatrix:
+    """
+    A model matrix whose columns are only generated on demand.
+
+    Columns are generated one term at a time (as a dense `numpy` block) the
+    first time any column associated with that term is accessed. Since the
+    structure of the model matrix is determined up front, the shape and column
+    names are available without generating any columns. The most recently
+    accessed blocks are cached (up to `max_cached_blocks` blocks), and evicted
+    in least-recently-used order thereafter.
+
+    Instances of this class are typically generated by materializing a
+    formula with `output="lazy"`, in which case they are wrapped in a
+    `ModelMatrix` instance carrying the `ModelSpec` used to generate them.
+
+    Attributes:
+        materializer: The materializer instance (bound to the data) used to
+            generate the columns.
+        model_spec: The `ModelSpec` instance describing the model matrix (with
+            its structure populated).
+        drop_rows: The rows of the data to be dropped.
+        max_cached_blocks: The maximum number of term blocks to keep in memory.
+    """
+
+    def __init__(
+        self,
+        materializer: FormulaMaterializer,
+        spec: ModelSpec,
+        drop_rows: Any,
+        max_cached_blocks: int = 32,
+    ):
+        self.materializer = materializer
+        self.model_spec = spec
+        self.drop_rows = drop_rows
+        self.max_cached_blocks = max_cached_blocks
+
+        self._blocks = OrderedDict()
+        self._block_offsets = numpy.cumsum(
+            [0, *(len(columns) for _, _, columns in spec.structure)]
+        )
+        self._column_blocks = numpy.repeat(
+            numpy.arange(len(spec.structure)), numpy.diff(self._block_offsets)
+        )
+
+    @property
+    def shape(self):
+        return (
+            self.materializer.nrows - len(self.drop_rows),
+            len(self.model_spec.column_names),
+        )
+
+    @property
+    def ndim(self):
+        return 2
+
+    @property
+    def dtype(self):
+        return numpy.dtype(float)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"<LazyModelMatrix of shape {self.shape}; {len(self._blocks)}/{len(self.model_spec.structure)} term blocks computed>"
+
+    # Block generation
+
+    def get_block(self, index: int) -> numpy.ndarray:
+        """
+        Retrieve the dense block of columns generated for the term at position
+        `index` in the structure of `model_spec`, computing it if necessary.
+
+        Args:
+            index: The index of the term in `model_spec.structure`.
+        """
+        if index in self._blocks:
+            self._blocks.move_to_end(index)
+            return self._blocks[index]
+
+        from formulaic.formula import Formula
+
+        row = self.model_spec.structure[index]
+        formula = self.model_spec.formula
+        block = self.materializer._build_model_matrix(
+            self.model_spec.update(
+                formula=Formula(
+                    [row.term],
+                    _parser=formula._parser,
+                    _nested_parser=formula._nested_parser,
+                    _ordering=formula._ordering,
+                ),
+                structure=[row],
+                output="numpy",
+            ),
+            drop_rows=self.drop_rows,
+        ).__wrapped__
+        block = numpy.asarray(block, dtype=float).reshape(
+            (self.shape[0], len(row.columns))
+        )
+
+        self._blocks[index] = block
+        while len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    def get_columns(self, columns: Any = slice(None)) -> numpy.ndarray:
+        """
+        Generate a dense array of the nominated columns, computing only the
+        term blocks needed to do so.
+
+        Args:
+            columns: Any identifier understood by `ModelSpec.get_slice()`, or
+                any object that can be used to index a one-dimensional `numpy`
+                array (e.g. a list of column indices or a boolean mask).
+        """
+        if isinstance(columns, (str, slice)) or not numpy.ndim(columns):
+            columns = self.model_spec.get_slice(columns)
+        indices = numpy.arange(self.shape[1])[columns]
+
+        out = numpy.empty((self.shape[0], len(indices)), dtype=float)
+        blocks = self._column_blocks[indices]
+        for index in numpy.unique(blocks):
+            mask = blocks == index
+            out[:, mask] = self.get_block(index)[
+                :, indices[mask] - self._block_offsets[index]
+            ]
+        return out
+
+    # Array-like interface
+
+    # Prevent `numpy` from densifying this matrix (via `__array__`) when it is
+    # an operand of a ufunc, so that (e.g.) `ndarray @ lazy` is handled by
+    # `__rmatmul__`. Dense arrays can still be requested explicitly using
+    # `numpy.asarray()`.
+    __array_ufunc__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        out = self.get_columns()
+        if dtype is not None:
+            out = out.astype(dtype, copy=False)
+        return out
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            if len(key) != 2:
+                raise IndexError(
+                    f"Too many indices for `LazyModelMatrix`; expected at most 2, got {len(key)}."
+                )
+            rows, columns = key
+        else:
+            rows, columns = slice(None), key
+        out = self.get_columns(columns)
+        if isinstance(columns, (int, numpy.integer)):
+            out = out[:, 0]
+        return out[rows]
+
+    def __matmul__(self, other):
+        other = numpy.asarray(other)
+        if other.shape[0] != self.shape[1]:
+            raise ValueError(
+                f"Shape mismatch: cannot multiply `LazyModelMatrix` of shape {self.shape} with array of shape {other.shape}."
+            )
+        out = numpy.zeros((self.shape[0], *other.shape[1:]))
+        for index, (start, stop) in enumerate(
+            zip(self._block_offsets[:-1], self._block_offsets[1:])
+        ):
+            if start != stop:
+                out += self.get_block(index) @ other[start:stop]
+        return out
+
+    def __rmatmul__(self, other):
+        return self.rdot(other)
+
+    def dot(self, other):
+        """
+        Compute `self @ other` one term block at a time.
+        """
+        return self @ other
+
+    def rdot(self, other):
+        """
+        Compute `other @ self` one term block at a time.
+        """
+        other = numpy.asarray(other)
+        if other.shape[-1] != self.shape[0]:
+            raise ValueError(
+                f"Shape mismatch: cannot multiply array of shape {other.shape} with `LazyModelMatrix` of shape {self.shape}."
+            )
+        return numpy.concatenate(
+            [
+                other @ self.get_block(index)
+                for index in range(len(self.model_spec.structure))
+            ],
+            axis=-1,
+        )
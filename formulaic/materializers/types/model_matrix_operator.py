@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import functools
+from collections.abc import Mapping
+from typing import Any, List, Optional, TYPE_CHECKING
+
+import numpy
+import pandas
+import scipy.sparse as spsparse
+from scipy.sparse.linalg import LinearOperator
+
+from formulaic.parser.types import Factor
+
+from .evaluated_factor import EvaluatedFactor
+from .factor_values import FactorValues
+
+if TYPE_CHECKING:  # pragma: no cover
+    from formulaic.materializers.base import FormulaMaterializer
+    from formulaic.model_spec import ModelSpec
+
+
+class ModelMatrixOperator(LinearOperator):
+    """
+    A model matrix represented implicitly as a `scipy` `LinearOperator`.
+
+    Rather than generating the columns of the model matrix (i.e. the row-wise
+    Kronecker products of the encoded factors of each term), this operator
+    computes matrix-vector products (`X @ beta` and `X.T @ r`) directly from
+    the encoded factors. Categorical factors are represented by their integer
+    codes and the (small) matrix mapping each level to its encoded columns,
+    and all other factors by their dense encoded columns. The memory required
+    is therefore proportional to the number of rows times the number of
+    factors, rather than times the number of columns.
+
+    Instances of this class are typically generated by materializing a
+    formula with `output="linear_operator"`, in which case they are wrapped in
+    a `ModelMatrix` instance carrying the `ModelSpec` used to generate them.
+
+    Attributes:
+        model_spec: The `ModelSpec` instance describing the model matrix (with
+            its structure populated).
+    """
+
+    def __init__(
+        self,
+        materializer: FormulaMaterializer,
+        spec: ModelSpec,
+        drop_rows: Any,
+    ):
+        self.model_spec = spec
+        nrows = materializer.nrows - len(drop_rows)
+        super().__init__(
+            dtype=numpy.dtype(float), shape=(nrows, len(spec.column_names))
+        )
+
+        encoding_spec = spec.update(output="numpy")
+        column_indices = spec.column_indices
+        self._scoped_terms = []
+        for _, scoped_terms, _ in materializer._get_scoped_terms_from_structure(
+            spec.structure
+        ):
+            for scoped_term in scoped_terms:
+                factors = [
+                    _get_encoded_factor_operands(
+                        materializer,
+                        scoped_factor.factor,
+                        encoding_spec,
+                        drop_rows,
+                        reduced_rank=scoped_factor.reduced,
+                    )
+                    for scoped_factor in scoped_term.factors
+                ]
+                names = (
+                    materializer._get_column_names_for_term(
+                        [columns for columns, _, _ in factors]
+                    )
+                    if factors
+                    else ["Intercept"]
+                )
+                self._scoped_terms.append(
+                    _ScopedTermOperator(
+                        nrows=nrows,
+                        factors=[(codes, block) for _, codes, block in factors],
+                        scale=scoped_term.scale,
+                        positions=numpy.array(
+                            [column_indices.get(name, -1) for name in names],
+                            dtype=int,
+                        ),
+                    )
+                )
+
+    def _matvec(self, x):
+        x = numpy.asarray(x, dtype=float).ravel()
+        out = numpy.zeros(self.shape[0])
+        for scoped_term in self._scoped_terms:
+            out += scoped_term.matvec(x)
+        return out
+
+    def _rmatvec(self, x):
+        x = numpy.asarray(x, dtype=float).ravel()
+        out = numpy.zeros(self.shape[1])
+        for scoped_term in self._scoped_terms:
+            scoped_term.rmatvec(x, out)
+        return out
+
+    def __repr__(self):
+        return f"<ModelMatrixOperator of shape {self.shape}>"
+
+
+class _ScopedTermOperator:
+    """
+    The implicit representation of the columns generated by a single scoped
+    term.
+
+    The columns of a scoped term are indexed by the tuple of the columns
+    `(j_1, ..., j_k)` of its encoded factors (with the first factor varying
+    fastest). Categorical factors are contracted against their level encoding
+    matrices, and then indexed by the combined codes of all categorical
+    factors; while non-categorical factors are combined into a (row-wise)
+    Kronecker product.
+
+    Attributes:
+        nrows: The number of rows in the model matrix.
+        factors: A list of `(codes, block)` tuples, one for each factor. For
+            categorical factors, `codes` is an array of level indices (with -1
+            indicating null values) and `block` is the matrix mapping levels to
+            encoded columns; for all other factors `codes` is `None` and `block`
+            is the dense encoded columns.
+        scale: The scale of the scoped term.
+        positions: The indices in the model matrix of each of the columns
+            generated by this scoped term (or -1 if the column is not present).
+    """
+
+    def __init__(self, nrows, factors, scale, positions):
+        self.scale = scale
+        self.positions = positions
+        self.mask = positions >= 0
+        self.widths = [block.shape[1] for _, block in factors]
+
+        # Categorical factors
+        self.categorical = [
+            i for i, (codes, _) in enumerate(factors) if codes is not None
+        ]
+        self.level_matrices = {}
+        level_codes = []
+        for i in self.categorical:
+            codes, levels = factors[i]
+            # Null values map onto an additional row of zeros
+            self.level_matrices[i] = numpy.vstack(
+                [levels, numpy.zeros((1, levels.shape[1]))]
+            )
+            level_codes.append(numpy.where(codes < 0, levels.shape[0], codes))
+        self.level_dims = [self.level_matrices[i].shape[0] for i in self.categorical]
+        self.codes = (
+            numpy.ravel_multi_index(level_codes, self.level_dims)
+            if level_codes
+            else numpy.zeros(nrows, dtype=int)
+        )
+        self.ncodes = int(numpy.prod(self.level_dims, dtype=int))
+        self.indicators = spsparse.csr_matrix(
+            (numpy.ones(nrows), (self.codes, numpy.arange(nrows))),
+            shape=(self.ncodes, nrows),
+        )
+
+        # Other factors
+        self.numerical = [i for i, (codes, _) in enumerate(factors) if codes is None]
+        self.numerical_product = functools.reduce(
+            lambda a, b: (a[:, :, None] * b[:, None, :]).reshape((nrows, -1)),
+            (factors[i][1] for i in self.numerical),
+            numpy.ones((nrows, 1)),
+        )
+
+        self.permutation = self.categorical + self.numerical
+
+    def matvec(self, x):
+        beta = numpy.where(self.mask, x[self.positions], 0)
+        # Reshape into a tensor with one axis per factor (in factor order)
+        beta = beta.reshape(self.widths[::-1]).transpose()
+        for i in self.categorical:
+            beta = numpy.moveaxis(
+                numpy.tensordot(self.level_matrices[i], beta, axes=([1], [i])), 0, i
+            )
+        beta = beta.transpose(self.permutation).reshape((self.ncodes, -1))
+        return self.scale * numpy.einsum(
+            "ij,ij->i", beta[self.codes], self.numerical_product
+        )
+
+    def rmatvec(self, x, out):
+        grad = self.indicators @ (x[:, None] * self.numerical_product)
+        grad = grad.reshape(
+            self.level_dims + [self.widths[i] for i in self.numerical]
+        ).transpose(numpy.argsort(self.permutation))
+        for i in self.categorical:
+            grad = numpy.moveaxis(
+                numpy.tensordot(self.level_matrices[i], grad, axes=([0], [i])), 0, i
+            )
+        grad = self.scale * grad.transpose().ravel()
+        out[self.positions[self.mask]] += grad[self.mask]
+
+
+def _get_encoded_factor_operands(
+    materializer: FormulaMaterializer,
+    factor: EvaluatedFactor,
+    spec: ModelSpec,
+    drop_rows: Any,
+    reduced_rank: bool,
+):
+    """
+    Encode a factor into the operands used by `_ScopedTermOperator`.
+
+    Returns:
+        A tuple of `(columns, codes, block)`, where `columns` is the list of
+        encoded column names, and `codes` and `block` are as described in
+        `_ScopedTermOperator`.
+    """
+    encoded = materializer._encode_evaled_factor(
+        factor, spec, drop_rows, reduced_rank=reduced_rank
+    )
+    columns = list(encoded)
+
+    operands = _get_categorical_operands(
+        materializer, factor, spec, drop_rows, reduced_rank, columns
+    )
+    if operands is not None:
+        return (columns, *operands)
+
+    nrows = materializer.nrows - len(drop_rows)
+    return (
+        columns,
+        None,
+        numpy.column_stack(
+            [
+                numpy.broadcast_to(numpy.asarray(values, dtype=float), (nrows,))
+                for values in encoded.values()
+            ]
+        )
+        if columns
+        else numpy.zeros((nrows, 0)),
+    )
+
+
+def _get_categorical_operands(
+    materializer: FormulaMaterializer,
+    factor: EvaluatedFactor,
+    spec: ModelSpec,
+    drop_rows: Any,
+    reduced_rank: bool,
+    columns: List[str],
+) -> Optional[tuple]:
+    """
+    Represent a categorical factor by the codes of its values and the
+    encoding of each of its levels. The encoding of the levels is computed by
+    encoding the levels themselves using the same encoder (and encoder state)
+    as the factor values, so that all contrasts are honoured. If the factor
+    is not amenable to this representation, `None` is returned.
+    """
+    if factor.metadata.kind is not Factor.Kind.CATEGORICAL or factor.metadata.encoded:
+        return None
+    encoder_state = spec.encoder_state.get(factor.expr, (None, {}))[1]
+    categories = encoder_state.get("categories")
+    values = materializer._extract_columns_for_encoding(factor)
+    if categories is None or isinstance(values, Mapping):
+        return None
+
+    values = getattr(values, "__wrapped__", values)
+    if "other_level" in encoder_state:
+        from formulaic.transforms.contrasts import _collapse_other_levels
+
+        values = _collapse_other_levels(
+            values, categories, encoder_state["other_level"]
+        )
+    codes = numpy.delete(
+        pandas.Categorical(values, categories=categories).codes,
+        list(drop_rows),
+    ).astype(int)
+
+    # Encode the levels themselves, bypassing the cache of encoded factors.
+    encoded_cache = materializer.encoded_cache
+    materializer.encoded_cache = {}
+    try:
+        levels = materializer._encode_evaled_factor(
+            EvaluatedFactor(
+                factor=factor.factor,
+                values=FactorValues(
+                    pandas.Series(categories),
+                    metadata=factor.metadata,
+                ),
+            ),
+            spec,
+            [],
+            reduced_rank=reduced_rank,
+        )
+    finally:
+        materializer.encoded_cache = encoded_cache
+
+    if list(levels) != columns:
+        return None  # pragma: no cover; this would indicate a non-standard encoder
+    return codes, numpy.column_stack(
+        [numpy.asarray(levels[column], dtype=float) for column in columns]
+    ).reshape((len(categories), len(columns)))
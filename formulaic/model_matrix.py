@@ -24,6 +24,18 @@ class ModelMatrix(Generic[MatrixType], wrapt.ObjectProxy):
     the wrapped object are directly accessible as if the object were unwrapped.
     """
 
+    def __new__(cls, matrix: Any, spec: Optional[ModelSpec] = None):
+        # `numpy` looks up `__array_ufunc__` on the type of operands (and so it
+        # is not proxied). If the wrapped matrix opts out of `numpy` ufuncs
+        # (e.g. to avoid being densified by `ndarray @ matrix`), so must this
+        # wrapper.
+        if (
+            cls is ModelMatrix
+            and getattr(type(matrix), "__array_ufunc__", NotImplemented) is None
+        ):
+            cls = _UfuncOptOutModelMatrix
+        return super().__new__(cls)
+
     def __init__(self, matrix: Any, spec: Optional[ModelSpec] = None):
         wrapt.ObjectProxy.__init__(self, matrix)
         self._self_model_spec = spec
@@ -44,6 +56,14 @@ class ModelMatrix(Generic[MatrixType], wrapt.ObjectProxy):
     def __repr__(self):
         return self.__wrapped__.__repr__()  # pragma: no cover
 
+    # Forward matrix multiplication (not proxied by `wrapt.ObjectProxy`)
+
+    def __matmul__(self, other):
+        return self.__wrapped__ @ other
+
+    def __rmatmul__(self, other):
+        return other @ self.__wrapped__
+
     # Handle copying behaviour
 
     def __copy__(self):
@@ -56,6 +76,15 @@ class ModelMatrix(Generic[MatrixType], wrapt.ObjectProxy):
         )
 
 
+class _UfuncOptOutModelMatrix(ModelMatrix):
+    """
+    A `ModelMatrix` wrapper for matrices that opt out of `numpy` ufuncs (see
+    `ModelMatrix.__new__`).
+    """
+
+    __array_ufunc__ = None
+
+
 class ModelMatrices(Structured[ModelMatrix]):
     """
     A `Structured[ModelMatrix]` subclass that adds a `.model_spec` attribute
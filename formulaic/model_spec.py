@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import warnings
 from collections import OrderedDict
 from dataclasses import dataclass, field, replace
@@ -19,12 +20,17 @@ from formulaic.materializers.base import EncodedTermStructure
 from formulaic.parser.types import Structured, Term
 from formulaic.utils.constraints import LinearConstraintSpec, LinearConstraints
 
+from .errors import FormulaMaterializationError
 from .formula import Formula, FormulaSpec
 from .materializers import FormulaMaterializer, NAAction, ClusterBy
 
 if TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
     from .model_matrix import ModelMatrices, ModelMatrix
 
+ColumnsIdentifier = Union[int, str, Term, slice]
+
 # Cached property was introduced in Python 3.8 (we currently support 3.7)
 try:
     from functools import cached_property
@@ -53,7 +59,8 @@ class ModelSpec:
             na_action: The action to be taken if NA values are found in the
                 data. Can be one of: "drop" (the default), "raise" or "ignore".
             output: The desired output type (as interpreted by the materializer;
-                e.g. "pandas", "sparse", etc).
+                e.g. "pandas", "numpy", "sparse" (column-major), "sparse_csr",
+                "sparse_coo", etc).
             cluster_by: How to cluster terms/columns during materialization. Can
                 be one of: "none" (the default) or "numerical_factors" (in which
                 case terms are clustered based on their sharing of the same
@@ -61,6 +68,11 @@ class ModelSpec:
 
         State (these attributes are only populated during materialization):
             structure: The model matrix structure resulting from materialization.
+            structure_subset: Whether `structure` only describes a subset of
+                the columns generated by its terms (see `ModelSpec.subset`), in
+                which case the other columns generated by these terms are
+                skipped (rather than treated as inconsistent with the
+                structure) during materialization.
             transform_state: The state of any stateful transformations that took
                 place during factor evaluation.
             encoder_state: The state of any stateful transformations that took
@@ -111,6 +123,7 @@ class ModelSpec:
 
     # State attributes
     structure: Optional[List[EncodedTermStructure]] = None
+    structure_subset: bool = False
     transform_state: Dict = field(default_factory=dict)
     encoder_state: Dict = field(default_factory=dict)
 
@@ -243,10 +256,82 @@ class ModelSpec:
             formula=self.formula.differentiate(*vars, use_sympy=use_sympy),
         )
 
+    def subset(
+        self,
+        *,
+        terms: Optional[Union[ColumnsIdentifier, Sequence[ColumnsIdentifier]]] = None,
+        columns: Optional[Union[ColumnsIdentifier, Sequence[ColumnsIdentifier]]] = None,
+    ) -> ModelSpec:
+        """
+        Create a copy of this `ModelSpec` instance that only generates a subset
+        of the columns of the model matrices associated with this instance.
+        Since the structure of the model matrix is already known, only the
+        factors involved in the nominated terms are evaluated, and only the
+        nominated columns are generated during materialization.
+
+        Note: Since only the factors associated with the selected columns are
+        evaluated, rows are only dropped due to missing values in those factors
+        (if `na_action` is "drop").
+
+        Args:
+            terms: The term(s) for which to generate columns. Terms can be
+                specified using any identifier understood by
+                `ModelSpec.get_slice`.
+            columns: The column(s) to be generated. Columns can be specified
+                using any identifier understood by `ModelSpec.get_slice`.
+        """
+        if not self.structure:
+            raise ValueError(
+                "`ModelSpec` instances can only be subset once their structure is known (i.e. after they have been used to materialize a model matrix)."
+            )
+
+        column_indices = set()
+        for identifiers in (terms, columns):
+            if identifiers is None:
+                continue
+            if isinstance(identifiers, (int, str, Term, slice)):
+                identifiers = [identifiers]
+            for identifier in identifiers:
+                column_indices.update(
+                    range(*self.get_slice(identifier).indices(len(self.column_names)))
+                )
+
+        structure = []
+        for (term, scoped_terms, term_columns), term_indices in zip(
+            self.structure, self.term_indices.values()
+        ):
+            selected_columns = [
+                column
+                for column, index in zip(term_columns, term_indices)
+                if index in column_indices
+            ]
+            if selected_columns:
+                structure.append(
+                    EncodedTermStructure(term, scoped_terms, selected_columns)
+                )
+
+        return self.update(
+            formula=Formula(
+                [term for term, _, _ in structure],
+                _parser=self.formula._parser,
+                _nested_parser=self.formula._nested_parser,
+                _ordering=self.formula._ordering,
+            ),
+            structure=structure,
+            structure_subset=True,
+        )
+
     # Utility methods
 
     def get_model_matrix(
-        self, data: Any, context: Optional[Mapping[str, Any]] = None, **attr_overrides
+        self,
+        data: Any,
+        context: Optional[Mapping[str, Any]] = None,
+        *,
+        terms: Optional[Union[ColumnsIdentifier, Sequence[ColumnsIdentifier]]] = None,
+        columns: Optional[Union[ColumnsIdentifier, Sequence[ColumnsIdentifier]]] = None,
+        out: Optional[Union[numpy.ndarray, str, os.PathLike]] = None,
+        **attr_overrides,
     ) -> ModelMatrix:
         """
         Build the model matrix (or matrices) realisation of this model spec for
@@ -256,19 +341,108 @@ class ModelSpec:
             data: The data for which to build the model matrices.
             context: An additional mapping object of names to make available in
                 when evaluating formula term factors.
+            terms: If specified, only the columns associated with these terms
+                are generated. See `ModelSpec.subset` for more details.
+            columns: If specified, only these columns are generated. See
+                `ModelSpec.subset` for more details.
+            out: If specified, the model matrix is written into this array
+                (e.g. a `numpy.memmap` instance) column by column as it is
+                generated, rather than being collated in memory. If a path is
+                provided, the model matrix is written into a new `.npy` file
+                at that path (as float64 values), which is returned as a
+                `numpy.memmap`. This is only supported for the "numpy" output
+                type, and requires `out` to have the shape of the model matrix
+                (after any rows with null values are dropped).
             attr_overrides: Any `ModelSpec` attributes to override before
                 constructing model matrices. This is shorthand for first
                 running `ModelSpec.update(**attr_overrides)`.
         """
+        if terms is not None or columns is not None:
+            return self.subset(terms=terms, columns=columns).get_model_matrix(
+                data, context=context, out=out, **attr_overrides
+            )
         if attr_overrides:
-            return self.update(**attr_overrides).get_model_matrix(data, context=context)
+            return self.update(**attr_overrides).get_model_matrix(
+                data, context=context, out=out
+            )
         if self.materializer is None:
             materializer = FormulaMaterializer.for_data(data)
         else:
             materializer = FormulaMaterializer.for_materializer(self.materializer)
         return materializer(
             data, context=context, **(self.materializer_params or {})
-        ).get_model_matrix(self)
+        ).get_model_matrix(self, out=out)
+
+    def get_model_matrices_batch(
+        self,
+        datas: Sequence[Any],
+        context: Optional[Mapping[str, Any]] = None,
+        **attr_overrides,
+    ) -> List[ModelMatrix]:
+        """
+        Build the model matrices realisation of this (already fitted) model
+        spec for each of several (typically small) datasets in one pass. The
+        datasets are concatenated, materialized together (so that the fixed
+        overhead of preparing the materializer and model spec is paid only
+        once), and the resulting model matrix is then split back into one model
+        matrix per dataset. Since the state of stateful transforms and the
+        encoding of categorical factors are taken from this model spec, this is
+        equivalent to (but much faster than) calling `.get_model_matrix()` on
+        each dataset in turn.
+
+        Model specs that have not yet been fitted (i.e. which have no
+        `.structure`) are rejected, since fitting them against the pooled
+        datasets would not be equivalent to processing each dataset
+        separately. Fit the model spec on representative data first (e.g. using
+        `.get_model_matrix()`).
+
+        Args:
+            datas: The datasets for which to build model matrices. These must
+                all be of the same type, and be one of: `pandas.DataFrame`
+                instances, dictionaries of one-dimensional arrays, numpy
+                structured arrays or `scipy.sparse` matrices.
+            context: An additional mapping object of names to make available in
+                when evaluating formula term factors.
+            attr_overrides: Any `ModelSpec` attributes to override before
+                constructing model matrices. This is shorthand for first
+                running `ModelSpec.update(**attr_overrides)`.
+
+        Returns:
+            A list of model matrices, one for each dataset in `datas`. Dense
+            model matrices are views onto a single array, and the index of
+            pandas model matrices is taken from the corresponding dataset.
+        """
+        from .model_matrix import ModelMatrix
+        from .utils.batch import concat_rows, split_rows
+
+        if attr_overrides:
+            return self.update(**attr_overrides).get_model_matrices_batch(
+                datas, context=context
+            )
+        if self.output in ("lazy", "linear_operator"):
+            raise ValueError(
+                f"Model matrices with output {repr(self.output)} cannot be generated in batches."
+            )
+        if self.structure is None:
+            raise ValueError(
+                "Model matrices can only be generated in batches for model specs that have already been fitted (e.g. using `.get_model_matrix()`)."
+            )
+
+        data, nrows = concat_rows(datas)
+        if self.materializer is None:
+            materializer = FormulaMaterializer.for_data(data)
+        else:
+            materializer = FormulaMaterializer.for_materializer(self.materializer)
+        model_matrices, drop_rows = materializer(
+            data, context=context, **(self.materializer_params or {})
+        )._get_model_matrices(self)
+        model_matrix = model_matrices._simplify()
+
+        blocks = split_rows(model_matrix.__wrapped__, nrows, drop_rows)
+        for data, block in zip(datas, blocks):
+            if hasattr(block, "index") and hasattr(data, "index"):
+                block.index = data.index[block.index]
+        return [ModelMatrix(block, spec=model_matrix.model_spec) for block in blocks]
 
     def get_linear_constraints(self, spec: LinearConstraintSpec) -> LinearConstraints:
         """
@@ -281,7 +455,7 @@ class ModelSpec:
         """
         return LinearConstraints.from_spec(spec, variable_names=self.column_names)
 
-    def get_slice(self, columns_identifier: Union[int, str, Term, slice]) -> slice:
+    def get_slice(self, columns_identifier: ColumnsIdentifier) -> slice:
         """
         Generate a `slice` instance corresponding to the columns associated with
         the nominated `columns_identifier`.
@@ -342,7 +516,12 @@ class ModelSpecs(Structured[ModelSpec]):
         return item
 
     def get_model_matrix(
-        self, data: Any, context: Optional[Mapping[str, Any]] = None, **attr_overrides
+        self,
+        data: Any,
+        context: Optional[Mapping[str, Any]] = None,
+        *,
+        out: Any = None,
+        **attr_overrides,
     ) -> ModelMatrices:
         """
         This method proxies the `ModelSpec.get_model_matrix(...)` API and allows
@@ -355,12 +534,20 @@ class ModelSpecs(Structured[ModelSpec]):
             data: The data for which to build the model matrices.
             context: An additional mapping object of names to make available in
                 when evaluating formula term factors.
+            out: Not supported for multiple model matrices, and present only
+                for compatibility with `ModelSpec.get_model_matrix`. A
+                `FormulaMaterializationError` is raised if this is specified.
             attr_overrides: Any `ModelSpec` attributes to override before
                 constructing model matrices. This is shorthand for first
                 running `ModelSpec.from_spec(model_specs, **attr_overrides)`.
         """
         from formulaic import ModelMatrices
 
+        if out is not None:
+            raise FormulaMaterializationError(
+                "Model matrices can only be written into existing arrays (via `out`) when generating a single model matrix."
+            )
+
         if attr_overrides:
             return ModelSpec.from_spec(self, **attr_overrides).get_model_matrix(
                 data, context=context
@@ -1,7 +1,12 @@
+from .expand_terms import cross_terms, interact_terms, nest_terms, power_terms
 from .tokenize import tokenize
 from .tokens_to_ast import tokens_to_ast
 
 __all__ = [
+    "cross_terms",
+    "interact_terms",
+    "nest_terms",
+    "power_terms",
     "tokenize",
     "tokens_to_ast",
 ]
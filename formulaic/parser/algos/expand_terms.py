@@ -0,0 +1,86 @@
+import functools
+import itertools
+from typing import Iterable
+
+from ..types import OrderedSet, Term
+
+
+def interact_terms(*term_sets: Iterable[Term]) -> OrderedSet[Term]:
+    """
+    Generate the interactions of the nominated sets of terms (i.e. the
+    products of every combination of one term from each set). This
+    corresponds to the `:` operator, e.g. `(a+b):(c+d)` is equivalent to
+    `a:c + a:d + b:c + b:d`.
+
+    Args:
+        term_sets: The sets of terms to interact.
+    """
+    return OrderedSet(
+        functools.reduce(lambda x, y: x * y, terms)
+        for terms in itertools.product(*term_sets)
+    )
+
+
+def cross_terms(*term_sets: Iterable[Term]) -> OrderedSet[Term]:
+    """
+    Generate the terms of the nominated sets of terms along with all of their
+    interactions. This corresponds to the `*` operator, e.g. `a*b` is
+    equivalent to `a + b + a:b`, and `a*b*c` (i.e. `(a*b)*c`) is equivalent to
+    `a + b + c + a:b + a:c + b:c + a:b:c`.
+
+    Args:
+        term_sets: The sets of terms to cross.
+    """
+    crossed = OrderedSet()
+    for i, terms in enumerate(term_sets):
+        terms = OrderedSet(terms)
+        crossed = crossed | terms | interact_terms(crossed, terms) if i else terms
+    return crossed
+
+
+def nest_terms(parents: Iterable[Term], nested: Iterable[Term]) -> OrderedSet[Term]:
+    """
+    Generate the terms of `parents` along with the interaction of all of them
+    with each of the `nested` terms. This corresponds to the `/` operator, e.g.
+    `(a+b)/c` is equivalent to `a + b + a:b:c`.
+
+    Args:
+        parents: The terms within which `nested` is nested.
+        nested: The terms nested within `parents`.
+    """
+    parents = OrderedSet(parents)
+    common = functools.reduce(lambda x, y: x * y, parents)
+    return parents | OrderedSet(common * term for term in nested)
+
+
+def power_terms(terms: Iterable[Term], power: int) -> OrderedSet[Term]:
+    """
+    Generate all interactions of up to `power` of the nominated terms. This
+    corresponds to the `**` operator, e.g. `(a+b+c)**2` is equivalent to
+    `a + b + c + a:b + a:c + b:c`.
+
+    Args:
+        terms: The terms to interact.
+        power: The (positive integral) maximum order of the interactions.
+    """
+    # The expansion consists of the products of all combinations of up to
+    # `power` distinct terms. Rather than generating (and then deduplicating)
+    # the full Cartesian product of `power` copies of `terms`, we enumerate
+    # these combinations directly, ordered by the index tuple at which each
+    # first appears in that product (its first index repeated as often as
+    # possible, followed by the rest). This results in the same terms (and
+    # factor ordering) as the Cartesian product, at a cost proportional to the
+    # number of combinations.
+    terms = list(terms)
+    combinations = sorted(
+        (
+            combination[:1] * (power - len(combination) + 1) + combination[1:],
+            combination,
+        )
+        for size in range(1, min(power, len(terms)) + 1)
+        for combination in itertools.combinations(range(len(terms)), size)
+    )
+    return OrderedSet(
+        functools.reduce(lambda x, y: x * y, (terms[i] for i in combination))
+        for _, combination in combinations
+    )
@@ -1,15 +1,20 @@
 import re
-from typing import Iterable, Pattern
+from typing import Generator, Iterable, Optional, Pattern
 
 from ..types import Token
 from ..utils import exc_for_token
 
 
+WORD_CHARS = re.compile(r"[\.\_\w]")
+NUMERIC_CHARS = re.compile(r"[0-9\.]")
+WHITESPACE_CHARS = re.compile(r"\s")
+
+
 def tokenize(
     formula: str,
-    word_chars: Pattern = re.compile(r"[\.\_\w]"),
-    numeric_chars: Pattern = re.compile(r"[0-9\.]"),
-    whitespace_chars: Pattern = re.compile(r"\s"),
+    word_chars: Pattern = WORD_CHARS,
+    numeric_chars: Pattern = NUMERIC_CHARS,
+    whitespace_chars: Pattern = WHITESPACE_CHARS,
 ) -> Iterable[Token]:
     """
     Convert a formula string into a generator of tokens.
@@ -41,6 +46,12 @@ def tokenize(
         the same token type as a token. (e.g. sequential operators like '+-'
         will be output as a single operator token).
 
+    Since looping over long formulas one character at a time is slow, when the
+    default character patterns are used the unquoted portions of the formula
+    are instead scanned a token at a time using a compiled regex (see
+    `_tokenize_regex`), and only the quoted portions are processed character by
+    character. The resulting tokens are identical.
+
     Args:
         formula: The formula string to tokenize.
         word_chars: The regex pattern used to recognize "word" characters
@@ -53,12 +64,58 @@ def tokenize(
         A generator over the tokens found in the formula string.
 
     """
+    if (word_chars, numeric_chars, whitespace_chars) == (
+        WORD_CHARS,
+        NUMERIC_CHARS,
+        WHITESPACE_CHARS,
+    ):
+        return _tokenize_regex(formula)
+    return _tokenize_chars(formula, word_chars, numeric_chars, whitespace_chars)
+
+
+def _tokenize_chars(
+    formula: str,
+    word_chars: Pattern,
+    numeric_chars: Pattern,
+    whitespace_chars: Pattern,
+    start: int = 0,
+    token: Optional[Token] = None,
+    until_unquoted: bool = False,
+) -> Generator[Token, None, int]:
+    """
+    Tokenize `formula` one character at a time, as described in `tokenize()`.
+
+    Args:
+        formula, word_chars, numeric_chars, whitespace_chars: As for
+            `tokenize()`.
+        start: The index of the character in `formula` from which to start
+            tokenizing.
+        token: The (incomplete) token to which subsequent characters should be
+            added (if any).
+        until_unquoted: Whether to stop tokenizing once no quote context is
+            open and the current token has been completed (allowing the
+            caller to resume tokenizing from that point).
+
+    Returns:
+        A generator over the tokens found in the formula string, which returns
+        the index at which tokenization stopped.
+    """
     quote_context = []
     take = 0
 
-    token = Token(source=formula)
+    if token is None:
+        token = Token(source=formula)
 
-    for i, char in enumerate(formula):
+    for i in range(start, len(formula)):
+        char = formula[i]
+        if (
+            until_unquoted
+            and not quote_context
+            and not token
+            and token.kind is None
+            and i > start
+        ):
+            return i
         if take > 0:
             token.update(char, i)
             take -= 1
@@ -176,3 +233,127 @@ def tokenize(
         )
     if token:
         yield token
+    return len(formula)
+
+
+# Patterns used to construct `_TOKEN_RUNS` (below), which match quoted
+# portions of formulas in the common cases where backslash-escapes and
+# backticks (and up to one level of parentheses) are the only nested quoting
+# constructs. Parentheses within Python code may not be further nested.
+_ESCAPED = r"\\[\s\S]"
+_BACKTICKED = r"`(?:[^`\\]|" + _ESCAPED + r")*`"
+_PARENTHESIZED = r"\((?:[^()`\\]|" + _ESCAPED + r"|" + _BACKTICKED + r")*\)"
+
+# The kinds of runs of characters recognised by `_tokenize_regex` (each
+# optionally preceded by ignored whitespace). Unquoted operators may be
+# separated by whitespace (e.g. "+ -" is tokenized as the operator "+-").
+# Quoted portions of the formula not matched by the "call", "backticked",
+# "python" or "custom_operator" patterns are matched by "quote" (and then
+# tokenized character by character).
+_TOKEN_RUNS = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<word>[\.\_\w]+)
+        (?P<call>\((?:[^()`\\]|{escaped}|{backticked}|{parenthesized})*\))?
+        |(?P<context>[\(\)\[\]])
+        |`(?P<backticked>(?:[^`\\]|{escaped})+)`
+        |\{{(?P<python>(?:[^}}(`\\]|{escaped}|{backticked}|{parenthesized})+)\}}
+        |%(?P<custom_operator>(?:[^%\\]|{escaped})+)%
+        |(?P<quote>[%{{`'"])
+        |(?P<operator>[^\s\.\_\w\(\)\[\]%{{`'"]+(?:\s+[^\s\.\_\w\(\)\[\]%{{`'"]+)*)
+    )
+    """.format(
+        escaped=_ESCAPED, backticked=_BACKTICKED, parenthesized=_PARENTHESIZED
+    ),
+    re.VERBOSE,
+)
+_NUMERIC_WORD = re.compile(r"[0-9\.]+")
+_QUOTED_KINDS = {
+    "backticked": Token.Kind.NAME,
+    "python": Token.Kind.PYTHON,
+    "custom_operator": Token.Kind.OPERATOR,
+}
+
+
+def _tokenize_regex(formula: str) -> Generator[Token, None, None]:
+    """
+    Tokenize `formula` as `tokenize()` does with the default character
+    patterns, but matching entire runs of (unquoted) word, operator and
+    whitespace characters (and simple quoted portions of the formula) at a
+    time using `_TOKEN_RUNS`. Other quoted portions of the formula are handed
+    off to `_tokenize_chars` until the quote context is closed, after which
+    scanning resumes.
+    """
+    pos = 0
+    while pos < len(formula):
+        for match in _TOKEN_RUNS.finditer(formula, pos):
+            kind = match.lastgroup
+            start, end = match.span(kind)
+
+            if kind in ("word", "call"):
+                start, end = match.start("word"), match.end()
+                word = match.group("word")
+                token = Token(
+                    formula[start:end],
+                    kind=Token.Kind.VALUE
+                    if _NUMERIC_WORD.fullmatch(word)
+                    else Token.Kind.NAME,
+                    source=formula,
+                    source_start=start,
+                    source_end=end - 1,
+                )
+                if kind == "call" and token.kind is Token.Kind.NAME:
+                    token.kind = Token.Kind.PYTHON
+                elif kind == "call" or (end < len(formula) and formula[end] in "([\"'"):
+                    # Other words followed by brackets or string quotes are
+                    # tokenized character by character.
+                    token.token = word
+                    token.source_end = start + len(word) - 1
+                    pos = yield from _tokenize_chars(
+                        formula,
+                        WORD_CHARS,
+                        NUMERIC_CHARS,
+                        WHITESPACE_CHARS,
+                        start=start + len(word),
+                        token=token,
+                        until_unquoted=True,
+                    )
+                    break
+                yield token
+            elif kind == "context":
+                yield Token(
+                    match.group(kind),
+                    kind=Token.Kind.CONTEXT,
+                    source=formula,
+                    source_start=start,
+                )
+            elif kind in _QUOTED_KINDS:
+                yield Token(
+                    match.group(kind),
+                    kind=_QUOTED_KINDS[kind],
+                    source=formula,
+                    source_start=start - 1,
+                    source_end=end - 1,
+                )
+            elif kind == "quote":
+                pos = yield from _tokenize_chars(
+                    formula,
+                    WORD_CHARS,
+                    NUMERIC_CHARS,
+                    WHITESPACE_CHARS,
+                    start=start,
+                    until_unquoted=True,
+                )
+                break
+            else:
+                yield Token(
+                    WHITESPACE_CHARS.sub("", match.group(kind)),
+                    kind=Token.Kind.OPERATOR,
+                    source=formula,
+                    source_start=start,
+                    source_end=end - 1,
+                )
+        else:
+            # Only (ignored) whitespace remains
+            break
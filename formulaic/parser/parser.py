@@ -1,10 +1,9 @@
 import ast
-import itertools
-import functools
 import re
 from dataclasses import dataclass, field
 from typing import List, Iterable, Set, Tuple, Union
 
+from .algos.expand_terms import cross_terms, interact_terms, nest_terms, power_terms
 from .algos.tokenize import tokenize
 from .types import (
     FormulaParser,
@@ -141,12 +140,6 @@ class DefaultOperatorResolver(OperatorResolver):
                     out.append(termset)
             return tuple(out)
 
-        def nested_product_expansion(
-            parents: OrderedSet[Term], nested: OrderedSet[Term]
-        ) -> OrderedSet[Term]:
-            common = functools.reduce(lambda x, y: x * y, parents)
-            return parents | OrderedSet(common * term for term in nested)
-
         def power(arg: OrderedSet[Term], power: OrderedSet[Term]) -> OrderedSet[Term]:
             power_term = next(iter(power))
             if (
@@ -158,10 +151,7 @@ class DefaultOperatorResolver(OperatorResolver):
                     power_term.factors[0].token,
                     "The right-hand argument of `**` must be a positive integer.",
                 )
-            return OrderedSet(
-                functools.reduce(lambda x, y: x * y, term)
-                for term in itertools.product(*[arg] * int(power_term.factors[0].expr))
-            )
+            return power_terms(arg, int(power_term.factors[0].expr))
 
         return [
             Operator(
@@ -229,39 +219,28 @@ class DefaultOperatorResolver(OperatorResolver):
                 arity=2,
                 precedence=200,
                 associativity="left",
-                to_terms=lambda *term_sets: (
-                    OrderedSet(itertools.chain(*term_sets))
-                    | OrderedSet(
-                        functools.reduce(lambda x, y: x * y, term)
-                        for term in itertools.product(*term_sets)
-                    )
-                ),
+                to_terms=cross_terms,
             ),
             Operator(
                 "/",
                 arity=2,
                 precedence=200,
                 associativity="left",
-                to_terms=nested_product_expansion,
+                to_terms=nest_terms,
             ),
             Operator(
                 "in",
                 arity=2,
                 precedence=200,
                 associativity="left",
-                to_terms=lambda nested, parents: nested_product_expansion(
-                    parents, nested
-                ),
+                to_terms=lambda nested, parents: nest_terms(parents, nested),
             ),
             Operator(
                 ":",
                 arity=2,
                 precedence=300,
                 associativity="left",
-                to_terms=lambda *term_sets: OrderedSet(
-                    functools.reduce(lambda x, y: x * y, term)
-                    for term in itertools.product(*term_sets)
-                ),
+                to_terms=interact_terms,
             ),
             Operator(
                 "**", arity=2, precedence=500, associativity="right", to_terms=power
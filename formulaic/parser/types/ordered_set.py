@@ -1,13 +1,36 @@
-from collections.abc import Set
+from collections.abc import Iterable, Set
 
-from typing import Generic, Iterable, TypeVar
+from typing import Generic, TypeVar
 
 ItemType = TypeVar("ItemType")
 
 
 class OrderedSet(Set, Generic[ItemType]):
+    """
+    A set that retains the order in which items were first added.
+
+    Set algebra is implemented directly on the underlying dictionaries (rather
+    than by the `Set` mixins, which rebuild sets item by item), so that the
+    hashes of existing items are reused rather than recomputed. Unions and
+    differences are also evaluated lazily: the result only records the items
+    being added or removed until its values are first required, so that long
+    chains of these operations (such as are generated when parsing formulas
+    with many terms, e.g. `a + b + c + ... - x - y`) take linear rather than
+    quadratic time.
+    """
+
     def __init__(self, values: Iterable[ItemType] = ()):
-        self.values = dict.fromkeys(values)
+        self._pending = None
+        if isinstance(values, OrderedSet):
+            self._values = values.values.copy()
+        else:
+            self._values = dict.fromkeys(values)
+
+    @property
+    def values(self):
+        if self._values is None:
+            self.__evaluate_pending()
+        return self._values
 
     def __contains__(self, item):
         return item in self.values
@@ -20,3 +43,58 @@ class OrderedSet(Set, Generic[ItemType]):
 
     def __repr__(self):
         return f"{{{', '.join(repr(v) for v in self.values)}}}"
+
+    # Set algebra
+
+    def __or__(self, other):
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return self._from_pending(
+            self,
+            dict.update,
+            other.values if isinstance(other, OrderedSet) else dict.fromkeys(other),
+        )
+
+    def __and__(self, other):
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        if not isinstance(other, Set):
+            other = dict.fromkeys(other)
+        return self._from_dict({value: None for value in self.values if value in other})
+
+    def __sub__(self, other):
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return self._from_pending(self, _remove_items, list(other))
+
+    @classmethod
+    def _from_dict(cls, values):
+        ordered_set = cls.__new__(cls)
+        ordered_set._values = values
+        ordered_set._pending = None
+        return ordered_set
+
+    @classmethod
+    def _from_pending(cls, parent, operation, items):
+        ordered_set = cls._from_dict(None)
+        ordered_set._pending = (parent, operation, items)
+        return ordered_set
+
+    def __evaluate_pending(self):
+        # Walk back through the chain of pending operations to the nearest
+        # evaluated `OrderedSet`, and then apply the operations in order.
+        operations = []
+        ordered_set = self
+        while ordered_set._values is None:
+            ordered_set, operation, items = ordered_set._pending
+            operations.append((operation, items))
+        values = ordered_set._values.copy()
+        for operation, items in reversed(operations):
+            operation(values, items)
+        self._values = values
+        self._pending = None
+
+
+def _remove_items(values, items):
+    for item in items:
+        values.pop(item, None)
@@ -1,9 +1,32 @@
-from typing import Iterable, TYPE_CHECKING
+import itertools
+from typing import Dict, FrozenSet, Iterable, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .factor import Factor  # pragma: no cover
 
 
+# Factor expressions are interned as integer ids, so that terms can be
+# compared, combined and deduplicated using (small) sets of integers rather
+# than by repeatedly comparing and sorting factors. Since terms from different
+# formulas (e.g. those of a fitted model spec and of a newly parsed formula)
+# are compared by these ids, the table is shared by all terms and entries are
+# never removed. It therefore grows with the number of distinct factor
+# expressions seen by the process (which is typically small, and comparable to
+# the memory used by the expressions themselves).
+_FACTOR_IDS: Dict[str, int] = {}
+_FACTOR_ID_COUNTER = itertools.count()
+
+
+def _get_factor_id(expr: str) -> int:
+    factor_id = _FACTOR_IDS.get(expr)
+    if factor_id is None:
+        # `dict.setdefault` and `next` are each atomic, so concurrent calls
+        # for the same expression agree on its id (and distinct expressions
+        # never share an id), at the cost of possibly skipping some ids.
+        factor_id = _FACTOR_IDS.setdefault(expr, next(_FACTOR_ID_COUNTER))
+    return factor_id
+
+
 class Term:
     """
     Represents a "term" of a formula.
@@ -15,24 +38,61 @@ class Term:
         factors: The set of factors to be multipled to form the term.
     """
 
+    __slots__ = ("factors", "_ids", "_factor_key_cache", "_hash")
+
     def __init__(self, factors: Iterable["Factor"]):
-        self.factors = tuple(dict.fromkeys(factors))
-        self._factor_key = tuple(factor.expr for factor in sorted(self.factors))
-        self._hash = hash(":".join(self._factor_key))
+        unique_factors = {}
+        for factor in factors:
+            unique_factors.setdefault(_get_factor_id(factor.expr), factor)
+        self.__init_from_ids(tuple(unique_factors.values()), frozenset(unique_factors))
+
+    def __init_from_ids(self, factors: Tuple["Factor", ...], ids: FrozenSet[int]):
+        self.factors = factors
+        self._ids = ids
+        self._factor_key_cache = None
+        self._hash = None
+
+    @property
+    def _factor_key(self) -> Tuple[str, ...]:
+        """
+        The sorted expressions of the factors of this term, which determine
+        its hash (consistent with the hash of the equivalent string) and
+        ordering. This is only computed when it is first needed.
+        """
+        if self._factor_key_cache is None:
+            self._factor_key_cache = tuple(
+                sorted(factor.expr for factor in self.factors)
+            )
+        return self._factor_key_cache
 
     # Transforms and comparisons
 
     def __mul__(self, other):
         if isinstance(other, Term):
-            return Term([*self.factors, *other.factors])
+            if other._ids <= self._ids:
+                factors = self.factors
+            else:
+                factors = (
+                    *self.factors,
+                    *(
+                        factor
+                        for factor in other.factors
+                        if _FACTOR_IDS[factor.expr] not in self._ids
+                    ),
+                )
+            term = Term.__new__(Term)
+            term.__init_from_ids(factors, self._ids | other._ids)
+            return term
         return NotImplemented
 
     def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(":".join(self._factor_key))
         return self._hash
 
     def __eq__(self, other):
         if isinstance(other, Term):
-            return self._factor_key == other._factor_key
+            return self._ids == other._ids
         if isinstance(other, str):
             return self._factor_key == tuple(sorted(other.split(":")))
         return NotImplemented
@@ -40,7 +100,7 @@ class Term:
     def __lt__(self, other):
         if isinstance(other, Term):
             if len(self.factors) == len(other.factors):
-                return sorted(self.factors) < sorted(other.factors)
+                return self._factor_key < other._factor_key
             if len(self.factors) < len(other.factors):
                 return True
             return False
@@ -48,3 +108,8 @@ class Term:
 
     def __repr__(self):
         return ":".join(factor.expr for factor in self.factors)
+
+    def __reduce__(self):
+        # Factor ids are specific to the current process, and so are not
+        # pickled.
+        return Term, (self.factors,)
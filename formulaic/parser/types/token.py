@@ -70,7 +70,9 @@ class Token:
 
     @kind.setter
     def kind(self, kind: Optional[Union[str, Kind]]):
-        self._kind = self.Kind(kind) if kind else kind
+        self._kind = (
+            kind if isinstance(kind, self.Kind) or not kind else self.Kind(kind)
+        )
 
     def update(
         self, char: str, source_index: int, kind: Optional[Kind] = None
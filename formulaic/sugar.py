@@ -11,6 +11,7 @@ def model_matrix(
     data: Any,
     *,
     context: Union[int, Mapping[str, Any]] = 0,
+    out: Any = None,
     **spec_overrides,
 ) -> Union[ModelMatrix, ModelMatrices]:
     """
@@ -40,6 +41,10 @@ def model_matrix(
             means that all variables in the caller's scope should be made
             accessible when interpreting and evaluating formulae). Otherwise, a
             mapping from variable name to value is expected.
+        out: If specified, the model matrix is written into this array (or
+            into a new `.npy` file at this path) as it is generated. This is
+            only supported when generating a single "numpy" model matrix. See
+            `ModelSpec.get_model_matrix` for more details.
         spec_overrides: Any `ModelSpec` attributes to set/override. See
             `ModelSpec` for more details.
 
@@ -50,5 +55,5 @@ def model_matrix(
     if isinstance(context, int):
         context = capture_context(context + 1)
     return ModelSpec.from_spec(spec, **spec_overrides).get_model_matrix(
-        data, context=context
+        data, context=context, out=out
     )
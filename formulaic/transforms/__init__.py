@@ -5,6 +5,7 @@ from formulaic.utils.stateful_transforms import stateful_transform
 from .basis_spline import basis_spline
 from .identity import identity
 from .contrasts import C, encode_contrasts, ContrastsRegistry
+from .hashed import hashed
 from .patsy_compat import PATSY_COMPAT_TRANSFORMS
 from .poly import poly
 from .scale import center, scale
@@ -15,6 +16,7 @@ __all__ = [
     "C",
     "encode_contrasts",
     "ContrastsRegistry",
+    "hashed",
     "poly",
     "center",
     "scale",
@@ -38,6 +40,7 @@ TRANSFORMS = {
     "scale": scale,
     "C": C,
     "contr": ContrastsRegistry,
+    "hashed": hashed,
     "I": identity,
     # Patsy compatibility shims
     **PATSY_COMPAT_TRANSFORMS,
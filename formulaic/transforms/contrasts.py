@@ -2,9 +2,21 @@ from __future__ import annotations
 from abc import abstractmethod
 
 import inspect
+import threading
 import warnings
+from collections import OrderedDict
 from numbers import Number
-from typing import Any, Union, Dict, Iterable, List, Optional, TYPE_CHECKING
+from typing import (
+    Any,
+    Union,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 import numpy
 import pandas
@@ -31,6 +43,9 @@ def C(
     *,
     levels: Optional[Iterable[str]] = None,
     spans_intercept: bool = True,
+    max_levels: Optional[int] = None,
+    min_count: Optional[int] = None,
+    other_level: str = "other",
 ):
     """
     Mark data as being categorical, and optionally specify the contrasts to be
@@ -51,6 +66,14 @@ def C(
             treated as though it spans the intercept. This should nearly always
             true, except when you are building a model that explicitly handles
             this using regularization (or other modeling techniques).
+        max_levels: If specified, only the `max_levels` most frequent levels
+            observed during fitting are retained, and the remaining levels are
+            collapsed into `other_level` (see `encode_contrasts`).
+        min_count: If specified, only levels observed at least `min_count`
+            times during fitting are retained, and the remaining levels are
+            collapsed into `other_level` (see `encode_contrasts`).
+        other_level: The name of the level into which pruned levels are
+            collapsed.
     """
 
     def encoder(
@@ -60,6 +83,10 @@ def C(
         encoder_state: Dict[str, Any],
         model_spec: ModelSpec,
     ):
+        if isinstance(values, FactorValues):
+            values = values.__wrapped__
+        if spsparse.issparse(values):
+            values = values.toarray().ravel()
         values = pandas.Series(values)
         values = values.drop(index=values.index[drop_rows])
         return encode_contrasts(
@@ -67,6 +94,9 @@ def C(
             contrasts=contrasts,
             levels=levels,
             reduced_rank=reduced_rank,
+            max_levels=max_levels,
+            min_count=min_count,
+            other_level=other_level,
             _state=encoder_state,
             _spec=model_spec,
         )
@@ -89,6 +119,9 @@ def encode_contrasts(
     levels: Optional[Iterable[str]] = None,
     reduced_rank: bool = False,
     output: Optional[str] = None,
+    max_levels: Optional[int] = None,
+    min_count: Optional[int] = None,
+    other_level: str = "other",
     _state=None,
     _spec=None,
 ) -> FactorValues[Union[pandas.DataFrame, spsparse.spmatrix]]:
@@ -109,9 +142,32 @@ def encode_contrasts(
             order to avoid spanning the intercept.
         output: The type of data to output. Must be one of "pandas", "numpy", or
             "sparse".
+        max_levels: If specified (and `levels` is not), only the `max_levels`
+            most frequently observed levels are retained when learning the
+            levels from the data (ties are broken by level order), and all
+            other levels are collapsed into a single `other_level` level.
+        min_count: If specified (and `levels` is not), only levels observed at
+            least `min_count` times are retained when learning the levels from
+            the data, and all other levels are collapsed into a single
+            `other_level` level.
+        other_level: The name of the level into which pruned levels are
+            collapsed. This level is only added (as the last level) if any
+            levels were pruned, in which case any levels not seen during
+            fitting are also mapped to this level (rather than being treated as
+            null) when encoding new data.
     """
     # Prepare arguments
     output = output or _spec.output or "pandas"
+    if levels is None and "categories" not in _state:
+        if max_levels is not None or min_count is not None:
+            levels = _get_frequent_levels(
+                data,
+                max_levels=max_levels,
+                min_count=min_count,
+                other_level=other_level,
+            )
+            if levels is not None:
+                _state["other_level"] = other_level
     levels = levels or _state.get(
         "categories"
     )  # TODO: Is this too early to provide useful feedback to users?
@@ -123,15 +179,19 @@ def encode_contrasts(
     if not isinstance(contrasts, Contrasts):
         contrasts = CustomContrasts(contrasts)
 
-    if levels is not None:
+    if levels is not None and isinstance(
+        getattr(data, "dtype", None), pandas.CategoricalDtype
+    ):
+        # Data is already categorical (e.g. pandas categoricals or Arrow
+        # dictionary arrays), so we can remap the category codes directly.
+        data = _recode_categorical(data, levels, _state.get("other_level"))
+    elif levels is not None:
+        if "other_level" in _state:
+            data = _collapse_other_levels(data, levels, _state["other_level"])
         extra_categories = set(pandas.unique(data)).difference(levels)
-        if extra_categories:
-            warnings.warn(
-                "Data has categories outside of the nominated levels (or that were "
-                f"not seen in original dataset): {extra_categories}. They are being "
-                " cast to nan, which will likely skew the results of your analyses.",
-                DataMismatchWarning,
-            )
+        if "other_level" in _state:  # Null values are not collapsed
+            extra_categories = {c for c in extra_categories if not pandas.isnull(c)}
+        _warn_extra_categories(extra_categories)
         data = pandas.Series(pandas.Categorical(data, categories=levels))
     else:
         data = pandas.Series(data).astype("category")
@@ -156,6 +216,89 @@ def encode_contrasts(
     )
 
 
+def _get_frequent_levels(
+    data: Any,
+    max_levels: Optional[int] = None,
+    min_count: Optional[int] = None,
+    other_level: str = "other",
+) -> Optional[List]:
+    """
+    Determine the levels to retain when collapsing infrequent levels of `data`
+    into `other_level`. If no levels would be collapsed, `None` is returned.
+    """
+    data = pandas.Series(data).astype("category")
+    counts = data.value_counts(sort=False)  # Counts in order of categories
+    if min_count is not None:
+        counts = counts[counts >= min_count]
+    if max_levels is not None:
+        counts = counts.sort_values(ascending=False, kind="stable").iloc[:max_levels]
+    if len(counts) == len(data.cat.categories):
+        return None
+    if other_level in counts.index:
+        raise ValueError(
+            f"The level into which infrequent levels are collapsed (`{other_level}`) is also a retained level of the data. Please specify a different `other_level`."
+        )
+    return [level for level in data.cat.categories if level in counts.index] + [
+        other_level
+    ]
+
+
+def _collapse_other_levels(data: Any, levels: Iterable, other_level: str) -> Any:
+    """
+    Map all non-null values of `data` that are not in `levels` onto
+    `other_level`.
+    """
+    data = pandas.Series(data, dtype=object)
+    return data.where(data.isin(levels) | data.isnull(), other_level)
+
+
+def _recode_categorical(
+    data: Any, levels: Iterable, other_level: Optional[str] = None
+) -> pandas.Series:
+    """
+    Recode categorical `data` (a pandas `Categorical` or categorical `Series`)
+    such that its categories are `levels`, by remapping the category codes of
+    `data` using a lookup table. This avoids hashing every value of `data`.
+    Values not present in `levels` are treated as null (with a
+    `DataMismatchWarning` emitted), unless `other_level` is provided, in which
+    case they are mapped onto `other_level`.
+    """
+    if isinstance(data, pandas.Series):
+        data = data.array
+    categories = data.categories
+    codes = data.codes
+
+    # Map data category codes to level codes, with the final entry of the
+    # lookup table mapping null values (with code `-1`) to `-1`.
+    lookup = numpy.append(pandas.Index(levels).get_indexer(categories), -1)
+    unknown = numpy.flatnonzero(lookup[:-1] == -1)
+    if len(unknown):
+        if other_level is not None:
+            lookup[unknown] = list(levels).index(other_level)
+        else:
+            present = numpy.bincount(codes[codes >= 0], minlength=len(categories))
+            _warn_extra_categories(
+                {categories[i] for i in unknown if present[i]},
+            )
+    return pandas.Series(
+        pandas.Categorical.from_codes(lookup[codes], categories=levels)
+    )
+
+
+def _warn_extra_categories(extra_categories: set):
+    """
+    Warn that the data being encoded has categories outside of the expected
+    levels (if there are any).
+    """
+    if extra_categories:
+        warnings.warn(
+            "Data has categories outside of the nominated levels (or that were "
+            f"not seen in original dataset): {extra_categories}. They are being "
+            " cast to nan, which will likely skew the results of your analyses.",
+            DataMismatchWarning,
+        )
+
+
 class Contrasts(metaclass=InterfaceMeta):
     """
     The base class for all contrast implementations.
@@ -165,6 +308,14 @@ class Contrasts(metaclass=InterfaceMeta):
 
     FACTOR_FORMAT = "{name}[{field}]"
 
+    # The maximum number of coding matrices (and their column names) to retain
+    # across all contrast instances (see `._get_cached_coding`). The cache is
+    # shared between threads, and so is only accessed while holding
+    # `_CODING_CACHE_LOCK`.
+    CODING_CACHE_SIZE = 128
+    _CODING_CACHE = OrderedDict()
+    _CODING_CACHE_LOCK = threading.Lock()
+
     def apply(
         self,
         dummies,
@@ -207,9 +358,10 @@ class Contrasts(metaclass=InterfaceMeta):
         encoded = self._apply(
             dummies, levels=levels, reduced_rank=reduced_rank, sparse=sparse
         )
-        coding_column_names = self.get_coding_column_names(
-            levels, reduced_rank=reduced_rank
+        _, coding_column_names = self._get_cached_coding(
+            levels, reduced_rank=reduced_rank, sparse=sparse
         )
+        coding_column_names = list(coding_column_names)
 
         if output == "pandas":
             encoded = pandas.DataFrame(
@@ -230,8 +382,97 @@ class Contrasts(metaclass=InterfaceMeta):
         )
 
     def _apply(self, dummies, levels, reduced_rank=True, sparse=False):
-        coding_matrix = self.get_coding_matrix(levels, reduced_rank, sparse=sparse)
-        return (dummies if sparse else dummies.values) @ coding_matrix
+        if type(self).get_coding_matrix is Contrasts.get_coding_matrix:
+            coding_matrix, _ = self._get_cached_coding(
+                levels, reduced_rank, sparse=sparse
+            )
+        else:
+            # Respect subclasses that override the public coding matrix method
+            coding_matrix = self.get_coding_matrix(levels, reduced_rank, sparse=sparse)
+            if isinstance(coding_matrix, pandas.DataFrame):
+                coding_matrix = coding_matrix.values
+        return (dummies if sparse else numpy.asarray(dummies)) @ coding_matrix
+
+    def _get_cached_coding(
+        self, levels, reduced_rank=True, sparse=False
+    ) -> Tuple[Any, Tuple]:
+        """
+        Return the (raw) coding matrix and coding column names for the given
+        levels, reusing previously computed values for equivalent contrasts
+        (those of the same type with the same attributes) where possible. This
+        avoids recomputing coding matrices each time new data is encoded using
+        the same model spec.
+
+        Cached coding matrices are shared, and must not be mutated by callers;
+        coding column names are returned as a tuple for the same reason.
+
+        Args:
+            levels: The names of the levels/categories in the data.
+            reduced_rank: Whether to output a reduced rank matrix.
+            sparse: Whether to output sparse results.
+        """
+        key = self._get_cache_key()
+        if key is not None:
+            key = (
+                key,
+                tuple((type(level), level) for level in levels),
+                reduced_rank,
+                sparse,
+            )
+            with self._CODING_CACHE_LOCK:
+                try:
+                    cached = self._CODING_CACHE.get(key)
+                except TypeError:  # Unhashable levels
+                    key = cached = None
+                if cached is not None:
+                    self._CODING_CACHE.move_to_end(key)
+                    return cached
+
+        coding_matrix = self._get_coding_matrix(
+            levels, reduced_rank=reduced_rank, sparse=sparse
+        )
+        if isinstance(coding_matrix, numpy.ndarray):
+            coding_matrix = coding_matrix.view()
+            coding_matrix.flags.writeable = False
+        coding = (
+            coding_matrix,
+            tuple(self.get_coding_column_names(levels, reduced_rank=reduced_rank)),
+        )
+
+        if key is not None:
+            with self._CODING_CACHE_LOCK:
+                self._CODING_CACHE[key] = coding
+                while len(self._CODING_CACHE) > self.CODING_CACHE_SIZE:
+                    self._CODING_CACHE.popitem(last=False)
+        return coding
+
+    def _get_cache_key(self) -> Optional[Hashable]:
+        """
+        A hashable representation of the type and attributes of this instance,
+        used to identify equivalent contrasts when caching coding matrices. If
+        `None` is returned, coding matrices are not cached. Subclasses with
+        attributes that do not fully determine their coding matrices should
+        override this method to return `None`.
+        """
+
+        def freeze(value):
+            if isinstance(value, numpy.ndarray):
+                return (value.shape, value.dtype.str, value.tobytes())
+            if isinstance(value, (list, tuple)):
+                return tuple(freeze(v) for v in value)
+            if isinstance(value, dict):
+                return tuple((k, freeze(v)) for k, v in value.items())
+            return value
+
+        try:
+            key = (
+                type(self),
+                tuple(sorted((k, freeze(v)) for k, v in vars(self).items())),
+            )
+            hash(key)
+        except TypeError:
+            return None
+        return key
 
     # Coding matrix methods
 
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from typing import Any, List, TYPE_CHECKING
+
+import numpy
+import pandas
+import scipy.sparse as spsparse
+
+from formulaic.materializers.types import FactorValues
+
+if TYPE_CHECKING:
+    from formulaic.model_spec import ModelSpec  # pragma: no cover
+
+
+def hashed(
+    *data: Any,
+    n_features: int = 1024,
+    seed: int = 0,
+    alternate_sign: bool = True,
+):
+    """
+    Encode categorical data (or the interaction of several categorical
+    variables) into a fixed number of columns using the "hashing trick".
+
+    Each row is hashed (jointly across all of the nominated variables) into
+    one of `n_features` columns, and so the number of columns generated is
+    bounded regardless of the number of distinct levels present in the data.
+    Since the hash function is deterministic for a given `seed`, no state
+    needs to be retained in order to encode new data consistently, and new
+    levels are simply hashed into the existing columns.
+
+    Args:
+        data: The categorical data to be hashed. If more than one variable is
+            provided, the combination of their values in each row is hashed
+            (i.e. the interaction of the variables is encoded).
+        n_features: The number of columns into which levels should be hashed.
+        seed: The seed of the hash function. Different seeds result in
+            different (but equally deterministic) assignments of levels to
+            columns.
+        alternate_sign: Whether to also use the hash to assign a sign (+1 or
+            -1) to each level, which results in inner products between hashed
+            features being unbiased in expectation.
+
+    Notes:
+        - Rows with null values in any of the nominated variables are treated
+          as null (and are handled according to the `na_action` of the model
+          spec).
+        - When sparse output is requested, the encoded columns are sparse; and
+          otherwise dense.
+        - Hashed columns never span the intercept, and so no columns are
+          dropped when building structurally full-rank model matrices.
+    """
+    if not data:
+        raise ValueError("`hashed` requires at least one variable to hash.")
+    if n_features < 1:
+        raise ValueError(f"`n_features` must be positive, not {n_features}.")
+
+    frame = pandas.DataFrame(
+        {str(i): _get_hashable_values(values) for i, values in enumerate(data)}
+    )
+    hashes = pandas.util.hash_pandas_object(
+        frame, index=False, hash_key=format(seed % 10**16, "016d")
+    ).to_numpy()
+
+    # Store the hashed column index (offset by one) signed by the hashed sign
+    # so that null values can be represented (and dropped) in the usual way.
+    codes = (hashes % numpy.uint64(n_features)).astype(float) + 1
+    if alternate_sign:
+        codes[(hashes >> numpy.uint64(63)).astype(bool)] *= -1
+    codes[frame.isnull().any(axis=1).to_numpy()] = numpy.nan
+
+    def encoder(
+        values: Any,
+        reduced_rank: bool,
+        drop_rows: List[int],
+        encoder_state: dict,
+        model_spec: ModelSpec,
+    ):
+        values = pandas.Series(values)
+        values = values.drop(index=values.index[drop_rows])
+        return _encode_hashed(values.to_numpy(), n_features, model_spec.output)
+
+    return FactorValues(
+        pandas.Series(
+            codes, index=data[0].index if isinstance(data[0], pandas.Series) else None
+        ),
+        kind="categorical",
+        spans_intercept=False,
+        encoder=encoder,
+    )
+
+
+def _get_hashable_values(values: Any) -> numpy.ndarray:
+    """
+    Convert `values` into an object array in which integral floats are
+    represented by integers. The hashes of objects depend on their type, and
+    so this ensures that (for example) integer identifiers that are cast to
+    floats (e.g. due to the presence of null values) are hashed consistently.
+
+    Args:
+        values: The values to be hashed (which may be a sparse column vector).
+    """
+    if spsparse.issparse(values):
+        values = values.toarray().ravel()
+    array = numpy.asarray(values)
+    if array.dtype.kind == "f":
+        integral = numpy.isfinite(array) & (numpy.floor(array) == array)
+        integral &= numpy.abs(array) < 2**63
+        out = array.astype(object)
+        out[integral] = array[integral].astype(numpy.int64)
+        return out
+    return numpy.array(
+        [
+            int(value)
+            if isinstance(value, (float, numpy.floating)) and float(value).is_integer()
+            else value
+            for value in numpy.asarray(values, dtype=object)
+        ],
+        dtype=object,
+    )
+
+
+def _encode_hashed(codes: numpy.ndarray, n_features: int, output: str):
+    """
+    Generate the encoded columns for the signed hash codes generated by
+    `hashed`.
+
+    Args:
+        codes: The signed hash codes, with values `±(column + 1)` (or `nan`
+            for null values).
+        n_features: The total number of columns.
+        output: The output type of the model spec being materialized.
+    """
+    rows = numpy.flatnonzero(~numpy.isnan(codes))
+    columns = numpy.abs(codes[rows]).astype(int) - 1
+    signs = numpy.sign(codes[rows])
+
+    if output == "sparse":
+        encoded = spsparse.csc_matrix(
+            (signs, (rows, columns)), shape=(codes.shape[0], n_features)
+        )
+    else:
+        encoded = numpy.zeros((codes.shape[0], n_features), order="F")
+        encoded[rows, columns] = signs
+
+    return FactorValues(
+        encoded,
+        kind="categorical",
+        column_names=tuple(range(n_features)),
+        spans_intercept=False,
+    )
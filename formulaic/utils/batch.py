@@ -0,0 +1,117 @@
+from functools import singledispatch
+from typing import Any, List, Sequence, Tuple
+
+import numpy
+import pandas
+import scipy.sparse as spsparse
+
+
+def concat_rows(datas: Sequence[Any]) -> Tuple[Any, List[int]]:
+    """
+    Concatenate the rows of several datasets of the same type (and with the
+    same columns) into a single dataset, so that they can be materialized
+    together.
+
+    Args:
+        datas: The datasets to concatenate. Supported types are
+            `pandas.DataFrame` instances, dictionaries of one-dimensional
+            arrays, numpy structured arrays and `scipy.sparse` matrices.
+
+    Returns:
+        A tuple of form `(data, nrows)`, where `data` is the concatenated
+        dataset and `nrows` is the number of rows contributed by each of the
+        input datasets.
+    """
+    if not datas:
+        raise ValueError("At least one dataset must be provided.")
+    if any(type(data) is not type(datas[0]) for data in datas):
+        raise TypeError("All datasets must be of the same type.")
+    return _concat_rows(datas[0], datas)
+
+
+@singledispatch
+def _concat_rows(data: Any, datas: Sequence[Any]) -> Tuple[Any, List[int]]:
+    if spsparse.issparse(data):
+        return (
+            spsparse.vstack(datas, format="csc"),
+            [data.shape[0] for data in datas],
+        )
+    raise TypeError(
+        f"Formulaic does not know how to concatenate data of type `{type(data).__name__}`."
+    )
+
+
+@_concat_rows.register
+def _(data: pandas.DataFrame, datas: Sequence[pandas.DataFrame]):
+    return (
+        pandas.concat(datas, axis=0, ignore_index=True, copy=False),
+        [len(data) for data in datas],
+    )
+
+
+@_concat_rows.register
+def _(data: dict, datas: Sequence[dict]):
+    return (
+        {
+            name: numpy.concatenate([numpy.asarray(data[name]) for data in datas])
+            for name in datas[0]
+        },
+        [len(next(iter(data.values()))) if data else 0 for data in datas],
+    )
+
+
+@_concat_rows.register
+def _(data: numpy.ndarray, datas: Sequence[numpy.ndarray]):
+    return numpy.concatenate(datas), [data.shape[0] for data in datas]
+
+
+def split_rows(
+    matrix: Any, nrows: Sequence[int], drop_rows: Sequence[int] = ()
+) -> List[Any]:
+    """
+    Split a matrix generated from data concatenated by `concat_rows` back into
+    one matrix per input dataset. Dense blocks are views onto `matrix` (where
+    supported by the type of `matrix`), and the index of `pandas.DataFrame`
+    blocks is the position of each row in its input dataset.
+
+    Args:
+        matrix: The matrix to split.
+        nrows: The number of rows contributed by each input dataset (as
+            returned by `concat_rows`).
+        drop_rows: The (sorted) indices of rows in the concatenated data that
+            are not present in `matrix` (e.g. due to null values).
+    """
+    offsets = numpy.cumsum([0, *nrows])
+    kept = numpy.delete(numpy.arange(offsets[-1]), drop_rows)
+    bounds = numpy.searchsorted(kept, offsets).tolist()
+    blocks = _split_rows(matrix, bounds)
+    if isinstance(matrix, pandas.DataFrame):
+        for block, offset, start, stop in zip(blocks, offsets, bounds[:-1], bounds[1:]):
+            block.index = kept[start:stop] - offset
+    return blocks
+
+
+@singledispatch
+def _split_rows(matrix: Any, bounds: Sequence[int]) -> List[Any]:
+    if spsparse.issparse(matrix):
+        # Row slicing of compressed sparse row matrices is cheap, and so we
+        # convert once rather than slicing (say) column-major matrices for
+        # each block.
+        csr = spsparse.csr_matrix(matrix)
+        return [
+            csr[start:stop].asformat(matrix.format)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+    raise TypeError(
+        f"Formulaic does not know how to split the rows of objects of type `{type(matrix).__name__}`."
+    )
+
+
+@_split_rows.register
+def _(matrix: numpy.ndarray, bounds: Sequence[int]) -> List[numpy.ndarray]:
+    return [matrix[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+@_split_rows.register
+def _(matrix: pandas.DataFrame, bounds: Sequence[int]) -> List[pandas.DataFrame]:
+    return [matrix.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
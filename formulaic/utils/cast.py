@@ -5,6 +5,7 @@ import numpy
 import pandas
 import scipy.sparse
 
+from formulaic.materializers.types.column_block import ColumnBlock
 from formulaic.materializers.types.factor_values import FactorValues
 
 
@@ -28,6 +29,9 @@ def as_columns(data: Any) -> Any:
     """
     Get the columns for `data`. If `data` represents a single column, or is a
     dictionary (the format used to store columns), it is returned as is.
+    Two-dimensional arrays and sparse matrices (and `pandas.DataFrame`s whose
+    columns all share the same numerical dtype) are returned as `ColumnBlock`
+    instances, which map column names to columns without splitting the data.
     """
     return data
 
@@ -35,6 +39,11 @@ def as_columns(data: Any) -> Any:
 @as_columns.register
 @propagate_metadata
 def _(data: pandas.DataFrame):
+    dtypes = set(data.dtypes)
+    if len(dtypes) == 1:
+        dtype = dtypes.pop()
+        if isinstance(dtype, numpy.dtype) and dtype.kind in "biufc":
+            return ColumnBlock(data.to_numpy(), names=data.columns)
     return dict(data.items())
 
 
@@ -55,7 +64,9 @@ def _(data: numpy.ndarray):
         column_names = data.__formulaic_metadata__.column_names
     else:
         column_names = list(range(data.shape[1]))
-    return {column_names[i]: data[:, i] for i in range(data.shape[1])}
+    return ColumnBlock(
+        getattr(data, "__wrapped__", data), names=column_names[: data.shape[1]]
+    )
 
 
 @as_columns.register
@@ -68,4 +79,6 @@ def _(data: scipy.sparse.csc_matrix):
         column_names = data.__formulaic_metadata__.column_names
     else:
         column_names = list(range(data.shape[1]))
-    return {column_names[i]: data[:, i] for i in range(data.shape[1])}
+    return ColumnBlock(
+        getattr(data, "__wrapped__", data), names=column_names[: data.shape[1]]
+    )
@@ -1,4 +1,6 @@
-from typing import Iterable, Optional, Tuple, List
+import copy
+import functools
+from typing import Any, Iterable, Optional, Tuple, List
 
 import numpy
 import pandas
@@ -43,3 +45,210 @@ def categorical_encode_series_to_sparse_csc_matrix(
         shape=(series.shape[0], len(levels)),
     )
     return levels, sparse_matrix
+
+
+def sparse_rowwise_kronecker(
+    left: spsparse.spmatrix, right: spsparse.spmatrix
+) -> spsparse.csc_matrix:
+    """
+    Compute the row-wise Kronecker (or "face-splitting") product of two sparse
+    matrices in a single pass over their non-zero entries.
+
+    The columns of the output are ordered such that the columns of `left` vary
+    fastest; that is, column `i + left.shape[1] * j` of the output is the
+    element-wise product of column `i` of `left` and column `j` of `right`.
+    This ordering is consistent with the way formulaic names interaction
+    columns, and so the product of many matrices can be computed using
+    `functools.reduce(sparse_rowwise_kronecker, matrices)`.
+
+    For indicator (dummy-encoded) matrices this is equivalent to combining the
+    integer codes of each row, and for products with a numerical column this
+    amounts to scaling the non-zero values of the other matrix.
+
+    Args:
+        left: The matrix whose columns should vary fastest in the output.
+        right: The matrix whose columns should vary slowest in the output.
+
+    Returns:
+        The sparse (column-major) matrix of shape
+        `(nrows, left.shape[1] * right.shape[1])`.
+    """
+    if left.shape[0] != right.shape[0]:
+        raise ValueError(
+            f"Row-wise Kronecker products require matrices with the same number of rows; got {left.shape[0]} and {right.shape[0]}."
+        )
+    left = spsparse.csr_matrix(left)
+    right = spsparse.csr_matrix(right)
+    nrows, ncols = left.shape[0], left.shape[1] * right.shape[1]
+
+    # Determine how many non-zero entries each row will have in the output
+    left_counts = numpy.diff(left.indptr)
+    right_counts = numpy.diff(right.indptr)
+    counts = left_counts * right_counts
+    nnz = int(counts.sum())
+
+    # For each output entry, find the offsets of the contributing entries of
+    # `left` and `right` (with the entries of `right` varying fastest within
+    # each row).
+    rows = numpy.repeat(numpy.arange(nrows), counts)
+    offsets = numpy.arange(nnz) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    right_row_counts = right_counts[rows]
+    left_entries = left.indptr[rows] + offsets // numpy.maximum(right_row_counts, 1)
+    right_entries = right.indptr[rows] + offsets % numpy.maximum(right_row_counts, 1)
+
+    return spsparse.csc_matrix(
+        (
+            left.data[left_entries] * right.data[right_entries],
+            (
+                rows,
+                left.indices[left_entries]
+                + left.shape[1] * right.indices[right_entries],
+            ),
+        ),
+        shape=(nrows, ncols),
+    )
+
+
+def split_csc_columns(
+    matrix: spsparse.spmatrix, columns: Optional[Iterable[int]] = None
+) -> List[spsparse.csc_matrix]:
+    """
+    Split a sparse matrix into a list of single-column sparse (column-major)
+    matrices. The data and indices of each column are views onto those of the
+    original matrix (after conversion to CSC format), and the columns are
+    constructed by copying a template column rather than via the `csc_matrix`
+    constructor, avoiding the overhead of both generic sparse column slicing
+    and format validation (which would otherwise dominate when splitting
+    matrices with many columns).
+
+    Args:
+        matrix: The matrix to split.
+        columns: The indices of the columns to extract (if not specified, all
+            columns are extracted).
+
+    Returns:
+        A list of single-column `csc_matrix` instances.
+    """
+    if matrix.format != "csc":
+        matrix = spsparse.csc_matrix(matrix)
+    indptr = matrix.indptr
+    if columns is not None:
+        columns = numpy.asarray(columns, dtype=int)
+        starts, ends = indptr[columns], indptr[columns + 1]
+    else:
+        starts, ends = indptr[:-1], indptr[1:]
+
+    # The `indptr` of each column is a row of this array
+    indptrs = numpy.zeros((len(starts), 2), dtype=indptr.dtype)
+    indptrs[:, 1] = ends - starts
+
+    template = _get_csc_column_template(matrix.shape[0], matrix.dtype, indptr.dtype)
+    split = []
+    for start, end, column_indptr in zip(starts.tolist(), ends.tolist(), indptrs):
+        column = copy.copy(template)
+        column.data = matrix.data[start:end]
+        column.indices = matrix.indices[start:end]
+        column.indptr = column_indptr
+        split.append(column)
+    return split
+
+
+@functools.lru_cache(maxsize=128)
+def _get_csc_column_template(
+    nrows: int, dtype: numpy.dtype, index_dtype: numpy.dtype
+) -> spsparse.csc_matrix:
+    """
+    Return an empty single-column `csc_matrix` instance which can be copied
+    (and never mutated) to cheaply construct columns with `nrows` rows.
+    """
+    return spsparse.csc_matrix(
+        (
+            numpy.array([], dtype=dtype),
+            numpy.array([], dtype=index_dtype),
+            numpy.array([0, 0], dtype=index_dtype),
+        ),
+        shape=(nrows, 1),
+    )
+
+
+def hstack_csc_columns(
+    columns: Iterable[Any], nrows: Optional[int] = None, format: str = "csc"
+) -> spsparse.spmatrix:
+    """
+    Horizontally stack sparse columns (or blocks of columns) into a single
+    sparse matrix in one pass. The total number of non-zero entries is known
+    up front, and so the `data`, `indices` and `indptr` buffers of the output
+    are each allocated once and filled by copying the buffers of each block
+    into place, without any intermediate format conversions or re-sorting.
+
+    Row-major (CSR) and coordinate (COO) outputs are assembled directly from
+    the same buffers: the column index of each entry is known from the block
+    it came from, and since entries are visited in column order, bucketing
+    them by row leaves the column indices of each row already sorted.
+
+    Args:
+        columns: The sparse matrices to stack (typically in CSC format; other
+            formats are converted, and dense one-dimensional arrays are
+            treated as single columns).
+        nrows: The number of rows of the output. This is only required if
+            `columns` is empty.
+        format: The format of the output matrix; one of "csc" (the default),
+            "csr" or "coo".
+
+    Returns:
+        The stacked sparse matrix (a `csc_matrix`, `csr_matrix` or
+        `coo_matrix` instance, depending on `format`).
+    """
+    if format not in ("csc", "csr", "coo"):
+        raise ValueError(
+            f"Sparse columns can only be stacked into 'csc', 'csr' or 'coo' matrices, not {repr(format)}."
+        )
+
+    blocks = []
+    for column in columns:
+        if not spsparse.issparse(column):
+            column = spsparse.csc_matrix(numpy.asarray(column).reshape((-1, 1)))
+        elif column.format != "csc":
+            column = spsparse.csc_matrix(column)
+        blocks.append(column)
+
+    if not blocks:
+        return spsparse.csc_matrix((nrows or 0, 0)).asformat(format)
+    nrows = blocks[0].shape[0]
+    if any(block.shape[0] != nrows for block in blocks):
+        raise ValueError("All columns must have the same number of rows.")
+
+    nnz = sum(block.nnz for block in blocks)
+    ncols = sum(block.shape[1] for block in blocks)
+    index_dtype = numpy.int32 if max(nnz, nrows, ncols) < 2**31 else numpy.int64
+    buffers = [
+        (
+            block.data[block.indptr[0] : block.indptr[-1]],
+            block.indices[block.indptr[0] : block.indptr[-1]],
+            numpy.diff(block.indptr),
+        )
+        for block in blocks
+    ]
+    data, indices, counts = (numpy.concatenate(buffer) for buffer in zip(*buffers))
+    indices = indices.astype(index_dtype, copy=False)
+
+    if format != "csc":
+        coo = spsparse.coo_matrix(
+            (
+                data,
+                (
+                    indices,
+                    numpy.repeat(numpy.arange(ncols, dtype=index_dtype), counts),
+                ),
+            ),
+            shape=(nrows, ncols),
+        )
+        # Conversion from COO to CSR is a linear-time bucketing of entries by
+        # row (with no sorting required, as noted above).
+        return coo if format == "coo" else coo.tocsr()
+
+    indptr = numpy.empty(ncols + 1, dtype=index_dtype)
+    indptr[0] = 0
+    numpy.cumsum(counts, out=indptr[1:])
+
+    return spsparse.csc_matrix((data, indices, indptr), shape=(nrows, ncols))
@@ -10,17 +10,28 @@ from formulaic.materializers.types import (
 )
 from formulaic.materializers.base import FormulaMaterializer
 from formulaic.materializers.pandas import PandasMaterializer
+from formulaic.materializers.sparse import SparseMaterializer
 from formulaic.model_spec import ModelSpec
 from formulaic.parser.types import Factor
 
 
 class TestFormulaMaterializer:
     def test_registrations(self):
-        assert sorted(FormulaMaterializer.REGISTERED_NAMES) == ["arrow", "pandas"]
-        assert sorted(FormulaMaterializer.REGISTERED_INPUTS) == [
-            "pandas.core.frame.DataFrame",
-            "pyarrow.lib.Table",
+        assert sorted(FormulaMaterializer.REGISTERED_NAMES) == [
+            "arrow",
+            "numpy",
+            "pandas",
+            "sparse",
         ]
+        assert sorted(FormulaMaterializer.REGISTERED_INPUTS) == sorted(
+            [
+                "builtins.dict",
+                "numpy.ndarray",
+                "pandas.core.frame.DataFrame",
+                "pyarrow.lib.Table",
+                *SparseMaterializer.REGISTER_INPUTS,
+            ]
+        )
 
     def test_retrieval(self):
         assert FormulaMaterializer.for_materializer("pandas") is PandasMaterializer
@@ -103,6 +114,27 @@ class TestFormulaMaterializer:
             )
         ) == [ScopedTerm((A, B, C_))]
 
+        # Factor order and scale are retained through simplification
+        (scoped_term,) = FormulaMaterializer._simplify_scoped_terms(
+            [ScopedTerm((B_,), scale=2), ScopedTerm((C_, B_), scale=3)]
+        )
+        assert scoped_term.factors == (C, B_)
+        assert scoped_term.scale == 6
+
+    def test__simplify_scoped_term_masks(self):
+        # Scoped terms spanned by a:b:c with all factors spanning the intercept
+        # (bits 1, 2 and 4 respectively).
+        span = [(mask, mask, 1, None) for mask in range(8)]
+        assert FormulaMaterializer._simplify_scoped_term_masks(span) == [
+            (7, 0, 1, None)
+        ]
+
+        # Terms are combined with the first (earliest added) candidate, and
+        # only along reduced factors.
+        assert FormulaMaterializer._simplify_scoped_term_masks(
+            [(1, 0, 1, None), (2, 2, 1, None), (3, 2, 1, None), (3, 3, 2, None)]
+        ) == [(3, 0, 1, None), (3, 2, 2, None)]
+
     def test__flatten_encoded_evaled_factor(self):
 
         flattened = PandasMaterializer(data=None)._flatten_encoded_evaled_factor(
@@ -197,3 +229,9 @@ class TestFormulaMaterializer:
         assert FormulaMaterializer._get_columns_for_term(
             None, [{"a": 1}, {"b": 2}], ModelSpec(formula=[]), scale=3
         ) == {"a:b": 6}
+        assert FormulaMaterializer._get_columns_for_term(
+            None,
+            [{"a": 1, "b": 2}, {"c": 3}],
+            ModelSpec(formula=[]),
+            columns={"b:c"},
+        ) == {"b:c": 6}
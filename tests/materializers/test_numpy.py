@@ -0,0 +1,103 @@
+import numpy
+import pandas
+import pytest
+import scipy.sparse as spsparse
+
+from formulaic import model_matrix
+from formulaic.errors import DataMismatchWarning
+from formulaic.materializers import FormulaMaterializer, NumpyMaterializer
+
+
+NUMPY_TESTS = [
+    "a",
+    "A",
+    "a + b + A + A:B + a:B",
+    "0 + A:B",
+    "C(A, contr.sum) + poly(b, degree=2)",
+    "a + {b ** 2}",
+]
+
+
+class TestNumpyMaterializer:
+    @pytest.fixture
+    def data(self):
+        return {
+            "a": numpy.array([1.0, 2, numpy.nan, 4, 5, 6]),
+            "b": numpy.arange(6),
+            "A": numpy.array(["a", "b", "c", "a", None, "b"], dtype=object),
+            "B": numpy.array(list("xyzzyx")),
+        }
+
+    @pytest.fixture
+    def materializer(self, data):
+        return NumpyMaterializer(data)
+
+    def test_registration(self, data):
+        assert FormulaMaterializer.for_data(data) is NumpyMaterializer
+        assert FormulaMaterializer.for_data(numpy.array([])) is NumpyMaterializer
+
+    @pytest.mark.parametrize("formula", NUMPY_TESTS)
+    @pytest.mark.parametrize(
+        "output", ["numpy", "pandas", "sparse", "sparse_csr", "sparse_coo"]
+    )
+    def test_get_model_matrix(self, materializer, data, formula, output):
+        mm = materializer.get_model_matrix(formula, output=output)
+        reference = model_matrix(formula, pandas.DataFrame(data), output=output)
+
+        assert mm.model_spec.column_names == reference.model_spec.column_names
+        if output == "numpy":
+            assert isinstance(mm, numpy.ndarray)
+            assert mm.flags.f_contiguous and reference.flags.f_contiguous
+            assert numpy.allclose(mm, reference)
+        elif output == "pandas":
+            assert isinstance(mm, pandas.DataFrame)
+            assert list(mm.index) == list(reference.index)
+            assert numpy.allclose(mm, reference)
+        else:
+            assert isinstance(mm, spsparse.spmatrix)
+            assert mm.format == reference.format
+            assert numpy.allclose(mm.toarray(), reference.toarray())
+
+    def test_default_output(self, materializer):
+        assert isinstance(materializer.get_model_matrix("a + A"), numpy.ndarray)
+
+    def test_state(self, data):
+        mm = model_matrix("a + A:B", pandas.DataFrame(data))
+        subset = {key: values[:2] for key, values in data.items()}
+        mm2 = mm.model_spec.get_model_matrix(subset, materializer="numpy")
+        assert mm2.model_spec.column_names == mm.model_spec.column_names
+        assert numpy.allclose(mm2, mm.iloc[:2])
+
+        subset["A"] = numpy.array(["a", "d"], dtype=object)
+        with pytest.warns(DataMismatchWarning, match="'d'"):
+            mm3 = mm.model_spec.get_model_matrix(subset, materializer="numpy")
+        assert numpy.allclose(mm3.iloc[1, 4:], 0)
+
+        # Fitted levels are not truncated to the width of narrower new data
+        mm = model_matrix("A", {"A": numpy.array(["bx", "c", "c"])})
+        with pytest.warns(DataMismatchWarning, match="'b'"):
+            mm2 = mm.model_spec.get_model_matrix({"A": numpy.array(["b", "c"])})
+        assert numpy.allclose(mm2, [[1, 0], [1, 1]])
+
+    def test_na_handling(self, data):
+        assert model_matrix("a + A", data).shape == (4, 3)
+        assert model_matrix("a + A", data, na_action="ignore").shape == (6, 4)
+        with pytest.raises(ValueError, match="contains null values"):
+            model_matrix("A", data, na_action="raise")
+
+    def test_structured_arrays(self):
+        data = numpy.zeros(3, dtype=[("x", float), ("G", "U1")])
+        data["x"] = [1, 2, 3]
+        data["G"] = ["p", "q", "p"]
+        mm = model_matrix("x + G", data)
+        assert mm.model_spec.column_names == ("Intercept", "x", "G[T.q]")
+        assert numpy.allclose(mm, [[1, 1, 0], [1, 2, 1], [1, 3, 0]])
+
+        with pytest.raises(ValueError, match="Only structured numpy arrays"):
+            NumpyMaterializer(numpy.ones((3, 2)))
+
+    def test_invalid_columns(self):
+        with pytest.raises(ValueError, match="same number of rows"):
+            NumpyMaterializer({"a": [1, 2], "b": [1, 2, 3]})
+        with pytest.raises(ValueError, match="one-dimensional"):
+            NumpyMaterializer({"a": numpy.ones((2, 2))})
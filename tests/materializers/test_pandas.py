@@ -14,7 +14,13 @@ from formulaic.errors import (
     FormulaMaterializationError,
 )
 from formulaic.materializers import PandasMaterializer
-from formulaic.materializers.types import EvaluatedFactor, FactorValues, NAAction
+from formulaic.materializers.types import (
+    ColumnBlock,
+    ConstantColumn,
+    EvaluatedFactor,
+    FactorValues,
+    NAAction,
+)
 from formulaic.model_spec import ModelSpec
 from formulaic.parser.types import Factor, Structured
 
@@ -143,6 +149,27 @@ class TestPandasMaterializer:
         assert mm.shape == (3, len(tests[1]))
         assert list(mm.model_spec.column_names) == tests[1]
 
+    @pytest.mark.parametrize("formula,tests", PANDAS_TESTS.items())
+    @pytest.mark.parametrize(
+        "output,matrix_type",
+        [("sparse_csr", spsparse.csr_matrix), ("sparse_coo", spsparse.coo_matrix)],
+    )
+    def test_get_model_matrix_sparse_formats(
+        self, data, formula, tests, output, matrix_type
+    ):
+        reference = PandasMaterializer(data).get_model_matrix(formula, output="sparse")
+        mm = PandasMaterializer(data).get_model_matrix(formula, output=output)
+        assert isinstance(mm, matrix_type)
+        assert list(mm.model_spec.column_names) == tests[0]
+        assert numpy.all(mm.toarray() == reference.toarray())
+        if output == "sparse_csr":
+            assert mm.has_canonical_format
+
+        # The output format is retained when the model spec is reused
+        mm = mm.model_spec.get_model_matrix(data)
+        assert isinstance(mm, matrix_type)
+        assert numpy.all(mm.toarray() == reference.toarray())
+
     def test_get_model_matrix_invalid_output(self, materializer):
         with pytest.raises(
             FormulaMaterializationError,
@@ -192,6 +219,81 @@ class TestPandasMaterializer:
         assert list(mm3.columns) == ["center(a)"]
         assert numpy.allclose(mm3["center(a)"], [2, 3, 4])
 
+    @pytest.mark.parametrize("output", ["pandas", "numpy", "sparse"])
+    def test_structure_reuse(self, data, output):
+        formula = "a + A + A:B + C(B, contr.sum) + a:A:B"
+        mm = PandasMaterializer(data).get_model_matrix(formula, output=output)
+
+        # Reusing a fitted model spec should not recompute the structure
+        materializer = PandasMaterializer(data)
+        materializer._cluster_terms = None
+        materializer._get_scoped_terms = None
+        mm2 = materializer.get_model_matrix(mm.model_spec)
+
+        assert mm2.model_spec.column_names == mm.model_spec.column_names
+        if output == "sparse":
+            assert numpy.allclose(mm.toarray(), mm2.toarray())
+        else:
+            assert numpy.allclose(mm, mm2)
+
+        # But a model spec whose formula no longer matches the structure (e.g.
+        # after differentiation) should not reuse the structure.
+        assert materializer._can_reuse_structure(mm.model_spec)
+        assert not materializer._can_reuse_structure(mm.model_spec.differentiate("a"))
+
+    def test_structure_reuse_inconsistent_columns(self, data):
+        mm = PandasMaterializer(
+            data, context={"f": lambda x: {"u": x}}
+        ).get_model_matrix("f(a)")
+        assert list(mm.columns) == ["Intercept", "f(a)[u]"]
+
+        # Columns that differ from those in the structure should be reported,
+        # rather than being skipped (and the structure imputed with zeros).
+        with pytest.raises(
+            FactorEncodingError,
+            match=r"Term `f\(a\)` has generated columns that are inconsistent with specification",
+        ):
+            PandasMaterializer(
+                data, context={"f": lambda x: {"v": x}}
+            ).get_model_matrix(mm.model_spec)
+
+        # Unless only a subset of the columns was requested
+        mm = PandasMaterializer(
+            data, context={"f": lambda x: {"u": x, "v": x}}
+        ).get_model_matrix("f(a)")
+        subset = mm.model_spec.subset(columns="f(a)[v]")
+        assert subset.structure_subset
+        mm2 = PandasMaterializer(
+            data, context={"f": lambda x: {"u": x, "v": 2 * x}}
+        ).get_model_matrix(subset)
+        assert list(mm2.columns) == ["f(a)[v]"]
+        assert numpy.allclose(mm2["f(a)[v]"], 2 * data["a"])
+
+    @pytest.mark.parametrize("output", ["pandas", "numpy"])
+    def test_indicator_interactions(self, data_with_nulls, output):
+        data = pandas.concat([data_with_nulls] * 3, ignore_index=True)
+        formula = "A:B + C(A, contr.sum):B + A:B:C(B)"
+
+        materializer = PandasMaterializer(data)
+        mm = materializer.get_model_matrix(formula, output=output, na_action="ignore")
+        reference = PandasMaterializer(data).get_model_matrix(
+            formula, output="sparse", na_action="ignore"
+        )
+        assert mm.model_spec.column_names == reference.model_spec.column_names
+        numpy.testing.assert_array_equal(numpy.asarray(mm), reference.toarray())
+
+        # Only dummy encoded factors are treated as indicators
+        assert materializer._get_indicator_codes(
+            {"x": numpy.array([1, 0, 0]), "y": numpy.array([0, 0, 1])}
+        )[0].tolist() == [0, -1, 1]
+        assert (
+            materializer._get_indicator_codes(
+                {"u": numpy.array([1, 0]), "v": numpy.array([1, 0])}
+            )
+            is None
+        )
+        assert materializer._get_indicator_codes({"z": numpy.array([2, 0])}) is None
+
     def test_factor_evaluation_edge_cases(self, materializer):
         # Test that categorical kinds are set if type would otherwise be numerical
         ev_factor = materializer._evaluate_factor(
@@ -236,18 +338,62 @@ class TestPandasMaterializer:
         assert materializer._is_categorical(pandas.Categorical(["a", "b", "c"])) is True
         assert materializer._is_categorical(FactorValues({}, kind="categorical"))
 
+    @pytest.mark.parametrize("output", ["pandas", "numpy", "sparse"])
+    def test_column_blocks(self, data, output):
+        materializer = PandasMaterializer(data)
+
+        # Two-dimensional factors are encoded (and reduced) as blocks
+        encoded = materializer._encode_evaled_factor(
+            factor=EvaluatedFactor(
+                factor=Factor("X", eval_method="lookup"),
+                values=FactorValues(
+                    numpy.arange(9.0).reshape((3, 3)),
+                    kind="numerical",
+                    column_names=("x", "y", "z"),
+                    spans_intercept=True,
+                    drop_field="y",
+                ),
+            ),
+            spec=ModelSpec(formula=[], output=output),
+            drop_rows=[1],
+            reduced_rank=True,
+        )
+        assert isinstance(encoded, ColumnBlock)
+        assert list(encoded) == ["X[x]", "X[z]"]
+        assert encoded.is_sparse is (output == "sparse")
+        matrix = encoded.matrix.toarray() if output == "sparse" else encoded.matrix
+        assert numpy.all(matrix == [[0, 2], [6, 8]])
+
+        # ... and interactions between them are generated as blocks
+        mm = materializer.get_model_matrix("0 + poly(a, degree=2):A", output=output)
+        poly = numpy.asarray(
+            PandasMaterializer(data).get_model_matrix("0 + poly(a, degree=2)")
+        )
+        reference = pandas.DataFrame(
+            {
+                f"poly(a, degree=2)[{i + 1}]:A[T.{level}]": poly[:, i]
+                * (data["A"] == level)
+                for level in "abc"
+                for i in range(2)
+            }
+        )
+        assert mm.model_spec.column_names == tuple(reference.columns)
+        if output == "sparse":
+            mm = mm.toarray()
+        assert numpy.allclose(mm, reference)
+
     def test_encoding_edge_cases(self, materializer):
         # Verify that constant encoding works well
-        assert list(
-            materializer._encode_evaled_factor(
-                factor=EvaluatedFactor(
-                    factor=Factor("10", eval_method="literal", kind="constant"),
-                    values=FactorValues(10, kind="constant"),
-                ),
-                spec=ModelSpec(formula=[]),
-                drop_rows=[],
-            )["10"]
-        ) == [10, 10, 10]
+        encoded = materializer._encode_evaled_factor(
+            factor=EvaluatedFactor(
+                factor=Factor("10", eval_method="literal", kind="constant"),
+                values=FactorValues(10, kind="constant"),
+            ),
+            spec=ModelSpec(formula=[]),
+            drop_rows=[],
+        )["10"]
+        assert isinstance(encoded, ConstantColumn)
+        assert list(encoded) == [10, 10, 10]
 
         # Verify that unencoded dictionaries with drop-fields work
         assert materializer._encode_evaled_factor(
@@ -310,6 +456,43 @@ class TestPandasMaterializer:
             )
         ) == ["B[a][T.a]", "B[a][T.b]", "B[a][T.c]"]
 
+    @pytest.mark.parametrize("output", ["pandas", "numpy", "sparse"])
+    def test_constant_columns(self, data, output):
+        mm = PandasMaterializer(data).get_model_matrix("1 + a", output=output)
+        values = mm.toarray() if output == "sparse" else numpy.asarray(mm)
+        assert values.dtype == numpy.float64
+        assert numpy.all(values[:, 0] == 1)
+
+        # Zero-valued constants are not stored in sparse matrices
+        assert (
+            PandasMaterializer(data)
+            ._combine_columns(
+                [("zero", ConstantColumn(0, 3))], ModelSpec([], output="sparse"), []
+            )
+            .nnz
+            == 0
+        )
+
+    @pytest.mark.parametrize("output", ["pandas", "numpy", "sparse"])
+    def test_boolean_columns(self, output):
+        data = pandas.DataFrame(
+            {"i": [1, 2, 3], "bo": [True, False, True], "bo2": [True, True, False]}
+        )
+        materializer = PandasMaterializer(data)
+
+        # Boolean columns are promoted to integers (as are their interactions)
+        mm = materializer.get_model_matrix("0 + bo + bo:bo2", output=output)
+        values = mm.toarray() if output == "sparse" else numpy.asarray(mm)
+        assert values.dtype == numpy.int64
+        assert numpy.array_equal(values, [[1, 1], [0, 0], [1, 0]])
+
+        mm = materializer.get_model_matrix("i + bo", output=output)
+        if output == "pandas":
+            assert mm.dtypes["bo"] == numpy.int64
+        values = mm.toarray() if output == "sparse" else numpy.asarray(mm)
+        assert values.dtype == numpy.float64
+        assert numpy.array_equal(values, [[1, 1, 1], [1, 2, 0], [1, 3, 1]])
+
     def test_empty(self, materializer):
         mm = materializer.get_model_matrix("0", ensure_full_rank=True)
         assert mm.shape[1] == 0
@@ -322,6 +505,10 @@ class TestPandasMaterializer:
         mm = materializer.get_model_matrix("0", output="sparse")
         assert mm.shape[1] == 0
 
+        mm = materializer.get_model_matrix("0", output="sparse_csr")
+        assert isinstance(mm, spsparse.csr_matrix)
+        assert mm.shape == (3, 0)
+
     def test_index_maintained(self):
         data = pandas.DataFrame(
             {"a": [1, 2, 3], "A": ["a", "b", "c"]}, index=["a", "b", "c"]
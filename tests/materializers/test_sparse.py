@@ -0,0 +1,127 @@
+import numpy
+import pandas
+import pytest
+import scipy.sparse as spsparse
+
+from formulaic import model_matrix
+from formulaic.materializers import FormulaMaterializer, SparseMaterializer
+
+
+SPARSE_TESTS = {
+    # '<formula>': (<names>, <null_rows>)
+    "a": (["Intercept", "a"], 1),
+    "a + b + a:b": (["Intercept", "a", "b", "a:b"], 1),
+    "0 + b:c": (["b:c"], 0),
+    "C(c > 0)": (["Intercept", "C(c > 0)[T.True]"], 0),
+    "c:C(b > 0)": (["Intercept", "c:C(b > 0)[T.False]", "c:C(b > 0)[T.True]"], 0),
+    # Stateful transforms are passed dense values
+    "center(b) + poly(c, 2)": (
+        ["Intercept", "center(b)", "poly(c, 2)[1]", "poly(c, 2)[2]"],
+        0,
+    ),
+    "bs(b, df=3)": (
+        ["Intercept", "bs(b, df=3)[1]", "bs(b, df=3)[2]", "bs(b, df=3)[3]"],
+        0,
+    ),
+    "0 + hashed(c, n_features=2)": (
+        ["hashed(c, n_features=2)[0]", "hashed(c, n_features=2)[1]"],
+        0,
+    ),
+}
+
+
+class TestSparseMaterializer:
+    @pytest.fixture
+    def data(self):
+        return spsparse.csc_matrix(
+            [
+                [1.0, 0, 2],
+                [0, 0, 1],
+                [numpy.nan, 3, 0],
+                [0, 4, 0],
+            ]
+        )
+
+    @pytest.fixture
+    def data_dense(self, data):
+        return pandas.DataFrame(data.toarray(), columns=["a", "b", "c"])
+
+    @pytest.fixture
+    def materializer(self, data):
+        return SparseMaterializer(data, column_names=["a", "b", "c"])
+
+    def test_registration(self, data):
+        assert FormulaMaterializer.for_data(data) is SparseMaterializer
+        assert FormulaMaterializer.for_data(data.tocsr()) is SparseMaterializer
+        assert FormulaMaterializer.for_materializer("sparse") is SparseMaterializer
+
+    @pytest.mark.parametrize("formula,tests", SPARSE_TESTS.items())
+    @pytest.mark.parametrize("output", ["pandas", "numpy", "sparse"])
+    def test_get_model_matrix(self, materializer, data_dense, formula, tests, output):
+        mm = materializer.get_model_matrix(formula, output=output)
+        reference = model_matrix(formula, data_dense, output="numpy")
+
+        assert list(mm.model_spec.column_names) == tests[0]
+        assert mm.shape == (4 - tests[1], len(tests[0]))
+        if output == "sparse":
+            assert isinstance(mm, spsparse.csc_matrix)
+            mm = mm.toarray()
+        elif output == "pandas":
+            assert isinstance(mm, pandas.DataFrame)
+            assert list(mm.index) == [i for i in range(4) if i != 2 or not tests[1]]
+        assert numpy.allclose(mm, reference)
+
+    def test_sparse_interactions(self):
+        data = spsparse.random(1000, 50, density=0.01, format="csc", random_state=0)
+        mm = model_matrix("x0:x1 + x2:x3:x4", data, output="sparse")
+        reference = model_matrix(
+            "x0:x1 + x2:x3:x4",
+            pandas.DataFrame(data.toarray()).rename(columns="x{}".format),
+            output="numpy",
+        )
+        assert numpy.allclose(mm.toarray(), reference)
+        assert mm.nnz <= data.nnz + 1000
+
+    def test_dict_of_columns(self, data):
+        columns = {
+            "a": data[:, 0],
+            "b": data[:, [1]].T,
+            "A": ["x", "y", "x", "y"],
+        }
+        mm = model_matrix("a + b:A", columns, materializer="sparse", output="sparse")
+        assert mm.model_spec.column_names == (
+            "Intercept",
+            "a",
+            "b:A[T.x]",
+            "b:A[T.y]",
+        )
+        assert numpy.allclose(mm.toarray(), [[1, 1, 0, 0], [1, 0, 0, 0], [1, 0, 0, 4]])
+
+        with pytest.raises(ValueError, match="same number of rows"):
+            SparseMaterializer({"a": data[:, 0], "b": [1, 2]})
+        with pytest.raises(ValueError, match="must be a column"):
+            SparseMaterializer({"a": data})
+
+    def test_column_names(self, data):
+        assert model_matrix("x0 + x2", data).model_spec.column_names == (
+            "Intercept",
+            "x0",
+            "x2",
+        )
+        with pytest.raises(ValueError, match="number of column names"):
+            SparseMaterializer(data, column_names=["a"])
+
+    def test_na_handling(self, materializer):
+        with pytest.raises(ValueError, match="contains null values"):
+            materializer.get_model_matrix("a", na_action="raise")
+        mm = materializer.get_model_matrix("a", na_action="ignore", output="sparse")
+        assert mm.shape == (4, 2)
+        assert numpy.isnan(mm[2, 1])
+
+    def test_state(self, materializer, data):
+        mm = materializer.get_model_matrix("a + C(b > 0)", output="sparse")
+        mm2 = mm.model_spec.get_model_matrix(
+            data[:2], materializer_params={"column_names": ["a", "b", "c"]}
+        )
+        assert mm2.model_spec.column_names == mm.model_spec.column_names
+        assert numpy.allclose(mm2.toarray(), mm.toarray()[:2])
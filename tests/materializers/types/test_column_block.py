@@ -0,0 +1,69 @@
+import numpy
+import pytest
+import scipy.sparse as spsparse
+
+from formulaic.materializers.types import ColumnBlock
+
+
+class TestColumnBlock:
+    @pytest.fixture
+    def block(self):
+        return ColumnBlock(numpy.arange(6).reshape((2, 3)), names=["a", "b", "c"])
+
+    @pytest.fixture
+    def sparse_block(self):
+        return ColumnBlock(
+            spsparse.csr_matrix(numpy.arange(6).reshape((2, 3))), names=["a", "b", "c"]
+        )
+
+    def test_mapping(self, block):
+        assert list(block) == ["a", "b", "c"]
+        assert len(block) == 3
+        assert "b" in block and "d" not in block
+        assert block.shape == (2, 3)
+        assert numpy.all(block["b"] == [1, 4])
+        assert numpy.shares_memory(block["b"], block.block)
+        assert (
+            repr(block) == "<ColumnBlock of shape (2, 3) with columns ['a', 'b', 'c']>"
+        )
+        with pytest.raises(KeyError):
+            block["d"]
+
+    def test_sparse(self, sparse_block):
+        assert sparse_block.is_sparse
+        assert sparse_block.block.format == "csc"
+        assert isinstance(sparse_block["c"], spsparse.csc_matrix)
+        assert numpy.all(sparse_block["c"].toarray().ravel() == [2, 5])
+
+        columns = sparse_block.drop("b").values()
+        assert len(columns) == 2
+        assert all(
+            numpy.shares_memory(c.data, sparse_block.block.data) for c in columns
+        )
+        assert [name for name, _ in sparse_block.items()] == ["a", "b", "c"]
+        assert numpy.all(columns[1].toarray().ravel() == [2, 5])
+
+    def test_select_drop_rename(self, block, sparse_block):
+        assert block.select(["a", "b", "c"]) is block
+
+        subset = block.select(["c", "a"])
+        assert list(subset) == ["c", "a"]
+        assert subset.block is block.block
+        assert numpy.all(subset.matrix == [[2, 0], [5, 3]])
+        assert numpy.all(subset["a"] == [0, 3])
+
+        dropped = sparse_block.drop("a")
+        assert list(dropped) == ["b", "c"]
+        assert numpy.all(dropped.matrix.toarray() == [[1, 2], [4, 5]])
+        with pytest.raises(KeyError):
+            block.drop("d")
+
+        renamed = subset.rename(["x", "y"])
+        assert list(renamed) == ["x", "y"]
+        assert numpy.all(renamed["y"] == [0, 3])
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="two-dimensional"):
+            ColumnBlock(numpy.ones(3), names=["a"])
+        with pytest.raises(ValueError, match="number of column names"):
+            ColumnBlock(numpy.ones((3, 2)), names=["a"])
@@ -0,0 +1,47 @@
+import numpy
+import pytest
+import scipy.sparse as spsparse
+
+from formulaic.materializers.types import ConstantColumn, FactorValues
+
+
+class TestConstantColumn:
+    def test_attributes(self):
+        column = ConstantColumn(2, 3)
+        assert column.value == 2.0
+        assert column.dtype == numpy.float64
+        assert column.shape == (3,)
+        assert column.ndim == 1
+        assert len(column) == 3
+        assert list(column) == [2.0, 2.0, 2.0]
+        assert repr(column) == "<ConstantColumn of 3 rows with value 2.0>"
+
+        assert ConstantColumn(1j, 2).dtype == numpy.complex128
+        assert ConstantColumn(FactorValues(3, kind="constant"), 2).value == 3.0
+
+    def test_expansion(self):
+        column = ConstantColumn(2, 3)
+        numpy.testing.assert_array_equal(numpy.asarray(column), [2.0, 2.0, 2.0])
+        assert numpy.asarray(column, dtype=int).dtype == int
+        numpy.testing.assert_array_equal(column.__array__(copy=True), [2.0] * 3)
+        with pytest.raises(ValueError, match="without copying"):
+            column.__array__(copy=False)
+        numpy.testing.assert_array_equal(column * numpy.arange(3), [0.0, 2.0, 4.0])
+
+    def test_scaling(self):
+        column = 3 * ConstantColumn(2, 3)
+        assert isinstance(column, ConstantColumn)
+        assert column.value == 6.0
+        column = ConstantColumn(2, 3) * FactorValues(0.5, kind="constant")
+        assert isinstance(column, ConstantColumn)
+        assert column.value == 1.0
+
+    def test_tocsc(self):
+        csc = ConstantColumn(2, 3).tocsc()
+        assert isinstance(csc, spsparse.csc_matrix)
+        numpy.testing.assert_array_equal(csc.toarray(), [[2.0], [2.0], [2.0]])
+
+        # Nothing is stored for zeros
+        csc = ConstantColumn(0, 3).tocsc()
+        assert csc.shape == (3, 1)
+        assert csc.nnz == 0
@@ -0,0 +1,110 @@
+import numpy
+import pandas
+import pytest
+
+from formulaic import model_matrix
+from formulaic.errors import FormulaMaterializationError
+from formulaic.materializers.types import LazyModelMatrix
+
+
+FORMULA = "a + A + A:B + C(B, contr.sum)"
+
+
+class TestLazyModelMatrix:
+    @pytest.fixture
+    def data(self):
+        return pandas.DataFrame(
+            {
+                "a": [1.0, 2, 3, 4, None],
+                "A": list("abcab"),
+                "B": list("xyxyy"),
+            }
+        )
+
+    @pytest.fixture
+    def dense(self, data):
+        return model_matrix(FORMULA, data, output="numpy")
+
+    @pytest.fixture
+    def lazy(self, data):
+        return model_matrix(FORMULA, data, output="lazy")
+
+    def test_structure(self, lazy, dense):
+        assert isinstance(lazy.__wrapped__, LazyModelMatrix)
+        assert lazy.shape == dense.shape == (4, 8)
+        assert lazy.model_spec.column_names == dense.model_spec.column_names
+        assert lazy.model_spec.structure == dense.model_spec.structure
+        assert lazy.model_spec.output == "lazy"
+
+        # No columns should have been generated yet
+        assert len(lazy._blocks) == 0
+
+    def test_array(self, lazy, dense):
+        assert numpy.allclose(numpy.asarray(lazy), dense)
+        assert numpy.asarray(lazy, dtype=numpy.float32).dtype == numpy.float32
+
+    def test_indexing(self, lazy, dense):
+        a_slice = lazy.model_spec.get_slice("A")
+        assert numpy.allclose(lazy["A"], dense[:, a_slice])
+        assert len(lazy._blocks) == 1
+
+        assert numpy.allclose(lazy[1:3, 0], dense[1:3, 0])
+        assert numpy.allclose(lazy[:, "a"], dense[:, [1]])
+        assert numpy.allclose(lazy[:, [0, 5]], dense[:, [0, 5]])
+        assert numpy.allclose(lazy[::-1, 2:6], dense[::-1, 2:6])
+
+        with pytest.raises(IndexError):
+            lazy[0, 0, 0]
+
+    def test_block_cache(self, lazy, dense):
+        lazy.max_cached_blocks = 2
+        for index in range(len(lazy.model_spec.structure)):
+            lazy.get_block(index)
+        assert list(lazy._blocks) == [3, 4]
+
+        lazy.get_block(3)
+        assert list(lazy._blocks) == [4, 3]
+        assert numpy.allclose(numpy.asarray(lazy), dense)
+
+    def test_matmul(self, lazy, dense):
+        beta = numpy.arange(8.0)
+        assert numpy.allclose(lazy @ beta, dense @ beta)
+        assert numpy.allclose(lazy.dot(numpy.ones((8, 2))), dense @ numpy.ones((8, 2)))
+
+        r = numpy.arange(4.0)
+        assert numpy.allclose(r @ lazy, r @ dense)
+        assert numpy.allclose(lazy.rdot(r), r @ dense)
+
+        with pytest.raises(ValueError, match="Shape mismatch"):
+            lazy @ numpy.ones(3)
+        with pytest.raises(ValueError, match="Shape mismatch"):
+            lazy.rdot(numpy.ones(3))
+
+    def test_rmatmul_does_not_densify(self, lazy, dense, monkeypatch):
+        def densify(*args, **kwargs):
+            raise AssertionError("`LazyModelMatrix` should not be densified.")
+
+        monkeypatch.setattr(LazyModelMatrix, "__array__", densify)
+
+        r = numpy.arange(4.0)
+        assert numpy.allclose(r @ lazy, r @ dense)
+        assert numpy.allclose(r @ lazy.__wrapped__, r @ dense)
+        assert numpy.allclose(numpy.ones((2, 4)) @ lazy, numpy.ones((2, 4)) @ dense)
+
+        # Other ufuncs are not supported (rather than silently densifying)
+        with pytest.raises(TypeError):
+            numpy.add(lazy, 1)
+
+    def test_reuse_spec(self, lazy, dense, data):
+        assert numpy.allclose(
+            numpy.asarray(lazy.model_spec.get_model_matrix(data)), dense
+        )
+        assert numpy.allclose(
+            dense.model_spec.get_model_matrix(data, output="lazy")["A:B"],
+            dense[:, dense.model_spec.get_slice("A:B")],
+        )
+
+        with pytest.raises(
+            FormulaMaterializationError, match="consistent with their formula"
+        ):
+            dense.model_spec.differentiate("a").get_model_matrix(data, output="lazy")
@@ -0,0 +1,79 @@
+import numpy
+import pandas
+import pytest
+from scipy.sparse.linalg import LinearOperator
+
+from formulaic import model_matrix
+from formulaic.errors import FormulaMaterializationError
+from formulaic.materializers.types import ModelMatrixOperator
+
+
+FORMULAS = [
+    "a + A + A:B + C(B, contr.sum) + a:A:B",
+    "A:B:D",
+    "0 + A:B",
+    "a:b + A:b:B + C(A, contr.poly):a",
+    "poly(b, degree=2):A + B",
+    "a + C(A, levels=['a', 'b'])",
+    "a + C(A, max_levels=2):B",
+]
+
+
+class TestModelMatrixOperator:
+    @pytest.fixture
+    def data(self):
+        rng = numpy.random.default_rng(0)
+        data = pandas.DataFrame(
+            {
+                "a": rng.normal(size=50),
+                "b": rng.normal(size=50),
+                "A": rng.choice(list("abc"), 50),
+                "B": rng.choice(list("xyz"), 50),
+                "D": rng.choice(list("pq"), 50),
+            }
+        )
+        data.loc[3, "a"] = None
+        return data
+
+    @pytest.mark.filterwarnings("ignore::formulaic.errors.DataMismatchWarning")
+    @pytest.mark.parametrize("formula", FORMULAS)
+    def test_products(self, data, formula):
+        dense = model_matrix(formula, data, output="numpy")
+        operator = model_matrix(formula, data, output="linear_operator")
+
+        assert isinstance(operator.__wrapped__, ModelMatrixOperator)
+        assert isinstance(operator.__wrapped__, LinearOperator)
+        assert operator.shape == dense.shape
+        assert operator.model_spec.column_names == dense.model_spec.column_names
+
+        rng = numpy.random.default_rng(1)
+        beta = rng.normal(size=dense.shape[1])
+        r = rng.normal(size=dense.shape[0])
+        assert numpy.allclose(operator @ beta, dense @ beta)
+        assert numpy.allclose(operator.matvec(beta), dense @ beta)
+        assert numpy.allclose(operator.T @ r, dense.T @ r)
+        assert numpy.allclose(operator.rmatvec(r), dense.T @ r)
+        assert numpy.allclose(operator @ numpy.eye(dense.shape[1]), dense)
+
+        # Reuse of model spec on new data (with missing levels)
+        subset = data.iloc[10:20]
+        dense = dense.model_spec.get_model_matrix(subset)
+        operator = dense.model_spec.get_model_matrix(subset, output="linear_operator")
+        assert numpy.allclose(operator @ beta, dense @ beta)
+        assert numpy.allclose(operator.T @ r[:10], dense.T @ r[:10])
+
+    def test_subset(self, data):
+        dense = model_matrix("a + A:B", data, output="numpy")
+        spec = dense.model_spec.subset(columns=["a", "B[T.z]", "A[T.c]:B[T.y]"])
+        operator = spec.get_model_matrix(data, output="linear_operator")
+        assert numpy.allclose(
+            operator @ numpy.eye(3),
+            dense[:, [dense.model_spec.column_indices[c] for c in spec.column_names]],
+        )
+
+    def test_invalid_structure(self, data):
+        spec = model_matrix("a + A", data).model_spec.differentiate("a")
+        with pytest.raises(
+            FormulaMaterializationError, match="consistent with their formula"
+        ):
+            spec.get_model_matrix(data, output="linear_operator")
@@ -1,6 +1,14 @@
+import functools
+
 import pytest
 
-from formulaic.parser.algos.tokenize import tokenize
+from formulaic.parser.algos.tokenize import (
+    NUMERIC_CHARS,
+    WHITESPACE_CHARS,
+    WORD_CHARS,
+    _tokenize_chars,
+    tokenize,
+)
 from formulaic.errors import FormulaSyntaxError
 
 
@@ -62,6 +70,15 @@ TOKEN_TESTS = {
         "operator:in",
         "operator:custom op",
     ],
+    "f(g(h(x))) + 1": ["python:f(g(h(x)))", "operator:+", "value:1"],
+    r"`a\`b` + {f(`)`) + 1}": [r"name:a\`b", "operator:+", "python:f(`)`) + 1"],
+    '"a" + "b"c + 1a': [
+        'value:"a"',
+        "operator:+",
+        'name:"b"c',
+        "operator:+",
+        "name:1a",
+    ],
 }
 
 TOKEN_ERRORS = {
@@ -73,14 +90,42 @@ TOKEN_ERRORS = {
 }
 
 
+TOKENIZERS = {
+    "regex": tokenize,
+    "chars": functools.partial(
+        _tokenize_chars,
+        word_chars=WORD_CHARS,
+        numeric_chars=NUMERIC_CHARS,
+        whitespace_chars=WHITESPACE_CHARS,
+    ),
+}
+
+
+@pytest.fixture(params=TOKENIZERS.values(), ids=TOKENIZERS.keys())
+def tokenizer(request):
+    return request.param
+
+
 @pytest.mark.parametrize("formula,tokens", TOKEN_TESTS.items())
-def test_tokenize(formula, tokens):
+def test_tokenize(tokenizer, formula, tokens):
     assert [
-        f"{token.kind.value}:{token.token}" for token in tokenize(formula)
+        f"{token.kind.value}:{token.token}" for token in tokenizer(formula)
     ] == tokens
 
 
 @pytest.mark.parametrize("formula,exception_info", TOKEN_ERRORS.items())
-def test_tokenize_exceptions(formula, exception_info):
+def test_tokenize_exceptions(tokenizer, formula, exception_info):
     with pytest.raises(exception_info[0], match=exception_info[1]):
-        list(tokenize(formula))
+        list(tokenizer(formula))
+
+
+@pytest.mark.parametrize("formula", TOKEN_TESTS)
+def test_tokenize_source_locations(formula):
+    # The regex tokenizer should output exactly the same tokens as the
+    # character-by-character tokenizer (including source locations).
+    assert [
+        (token.kind, token.token, token.source_loc) for token in tokenize(formula)
+    ] == [
+        (token.kind, token.token, token.source_loc)
+        for token in TOKENIZERS["chars"](formula)
+    ]
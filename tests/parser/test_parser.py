@@ -73,6 +73,9 @@ FORMULA_TO_TERMS = {
     "(a+b)**2": ["1", "a", "a:b", "b"],
     "(a+b)^2": ["1", "a", "a:b", "b"],
     "(a+b)**3": ["1", "a", "a:b", "b"],
+    "(a+b+c)**2": ["1", "a", "a:b", "a:c", "b", "b:c", "c"],
+    "(a+b:c+c)**2": ["1", "a", "a:b:c", "a:c", "b:c", "c"],
+    "(a:b+b:c+a)**3": ["1", "a:b", "a:b:c", "b:c", "a"],
     # Nested products
     "a/b": ["1", "a", "a:b"],
     "(b+a)/c": ["1", "b", "a", "b:a:c"],
@@ -12,3 +12,24 @@ def test_ordered_set():
     assert OrderedSet(["z", "k"]) | ["a", "b"] == OrderedSet(["z", "k", "a", "b"])
     assert OrderedSet(("z", "k")) - ("z",) == OrderedSet(("k"))
     assert ["b"] | OrderedSet("a") == OrderedSet("ba")
+
+
+def test_ordered_set_algebra():
+    s = OrderedSet("abc")
+    assert list(s | "dab" | OrderedSet("e")) == list("abcde")
+    assert list(s - "b" | "b") == list("acb")
+    assert list(s & "cax") == list("ac")
+    assert list((s - "b" - "c" | "c") - "a") == list("c")
+
+    # Chains of unions and differences are evaluated lazily (and only once),
+    # without affecting the operands
+    chained = s
+    for item in "defgh":
+        chained = chained | item
+    chained = chained - "e"
+    assert list(chained) == list("abcdfgh")
+    assert list(s) == list("abc")
+
+    assert s.__or__(1) is NotImplemented
+    assert s.__and__(1) is NotImplemented
+    assert s.__sub__(1) is NotImplemented
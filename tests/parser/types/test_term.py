@@ -1,6 +1,10 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from formulaic.parser.types import Factor, Term
+from formulaic.parser.types.term import _get_factor_id
 
 
 class TestTerm:
@@ -18,6 +22,9 @@ class TestTerm:
 
     def test_mul(self, term1, term2):
         assert str(term1 * term2) == "c:b:d"
+        assert str(term1 * Term([Factor("b")])) == "c:b"
+        assert term1 * term2 == Term([Factor("b"), Factor("c"), Factor("d")])
+        assert hash(term1 * term2) == hash("b:c:d")
 
         with pytest.raises(TypeError):
             term1 * 1
@@ -42,3 +49,24 @@ class TestTerm:
 
     def test_repr(self, term1):
         assert repr(term1) == "c:b"
+
+    def test_pickle(self, term1):
+        unpickled = pickle.loads(pickle.dumps(term1))
+        assert unpickled == term1
+        assert unpickled.factors == term1.factors
+
+    def test_concurrent_construction(self):
+        exprs = [f"__concurrent_{i}" for i in range(200)]
+
+        def build(offset):
+            return [Term([Factor(expr)]) for expr in exprs[offset:] + exprs[:offset]]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(build, range(0, 200, 10)))
+
+        ids = {expr: _get_factor_id(expr) for expr in exprs}
+        assert len(set(ids.values())) == len(exprs)
+        for terms in results:
+            for term in terms:
+                assert term._ids == {ids[term.factors[0].expr]}
+                assert term == Term([Factor(term.factors[0].expr)])
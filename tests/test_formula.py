@@ -7,7 +7,7 @@ import pytest
 
 from formulaic import Formula
 from formulaic.errors import FormulaInvalidError, FormulaMaterializerInvalidError
-from formulaic.parser.types import Structured
+from formulaic.parser.types import Factor, Structured, Term
 
 
 class TestFormula:
@@ -173,6 +173,80 @@ class TestFormula:
             # Should not be possible to reach this, but check anyway.
             Formula._Formula__validate_terms(("a",))
 
+    @pytest.mark.parametrize(
+        "formula,expected",
+        [
+            (lambda: Formula.from_terms(["a", "b"]), "a + b"),
+            (lambda: Formula.from_terms(Formula.cross("a", "b"), lhs="y"), "y ~ a*b"),
+            (lambda: Formula.from_terms(Formula.interact(["a", "b"], "c")), "(a+b):c"),
+            (lambda: Formula.from_terms(Formula.nest(["a", "b"], "c")), "(a+b)/c"),
+            (lambda: Formula.from_terms(Formula.nest("a", ["b", "c"])), "a/(b+c)"),
+            (
+                lambda: Formula.from_terms(Formula.power(["a", "b", "c"], 2)),
+                "(a+b+c)**2",
+            ),
+            (
+                lambda: Formula.from_terms(Formula.cross("a", "b") - ["a"], lhs="y"),
+                "y ~ a*b - a",
+            ),
+            (lambda: Formula.from_terms((["a"], "b"), lhs="y"), "y ~ a | b"),
+            (lambda: Formula.from_terms("a", include_intercept=False), "a - 1"),
+            (
+                lambda: Formula.from_terms([0.5, "a"], include_intercept=False),
+                "0.5 + a - 1",
+            ),
+            (
+                lambda: Formula.from_terms(
+                    [Factor("a"), Term([Factor("b"), Factor("c")])]
+                ),
+                "a + b:c",
+            ),
+        ],
+    )
+    def test_from_terms(self, formula, expected):
+        formula = formula()
+        assert formula == Formula(expected)
+        assert repr(formula) == repr(Formula(expected))
+
+    def test_from_terms_factors(self, data):
+        formula = Formula.from_terms(
+            Formula.cross(1, "a", Factor("b + c", eval_method="python"))
+        )
+        assert [
+            [(factor.expr, factor.eval_method.value) for factor in term.factors]
+            for term in formula
+        ] == [
+            [("1", "literal")],
+            [("a", "lookup")],
+            [("b + c", "python")],
+            [("1", "literal"), ("a", "lookup")],
+            [("1", "literal"), ("b + c", "python")],
+            [("a", "lookup"), ("b + c", "python")],
+            [("1", "literal"), ("a", "lookup"), ("b + c", "python")],
+        ]
+        assert list(formula.get_model_matrix(data).columns) == [
+            "Intercept",
+            "a",
+            "b + c",
+            "a:b + c",
+        ]
+
+    def test_from_terms_invalid(self):
+        with pytest.raises(
+            FormulaInvalidError, match="Unrecognized terms specification"
+        ):
+            Formula.from_terms([None])
+        with pytest.raises(
+            FormulaInvalidError, match="Unrecognized terms specification"
+        ):
+            Formula.from_terms(Formula("a"))
+        with pytest.raises(FormulaInvalidError, match="must be a positive integer"):
+            Formula.power(["a", "b"], 0)
+        for spec in (0, -1, 0.0, ["a", -1]):
+            with pytest.raises(FormulaInvalidError, match="include_intercept=False"):
+                Formula.from_terms(spec)
+        assert Formula.from_terms(["a"], include_intercept=False) == Formula("a - 1")
+
     def test_invalid_materializer(self, formula_expr, data):
         with pytest.raises(FormulaMaterializerInvalidError):
             formula_expr.get_model_matrix(data, materializer=object())
@@ -28,6 +28,14 @@ def test_model_matrix_copy():
     assert m3.model_spec is not spec
 
 
+def test_model_matrix_matmul():
+    matrix = numpy.array([[1, 2, 3], [4, 5, 6]])
+    m = ModelMatrix(matrix, spec=ModelSpec(formula="x"))
+
+    assert numpy.all(m @ numpy.ones(3) == matrix @ numpy.ones(3))
+    assert numpy.all([[1, 1]] @ m == [[1, 1]] @ matrix)
+
+
 def test_factor_values_copy():
     d = {"1": object()}
     f = FactorValues(d, drop_field="test")
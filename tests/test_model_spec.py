@@ -7,7 +7,15 @@ import pytest
 import numpy
 import pandas
 import scipy.sparse
-from formulaic import Formula, ModelSpec, ModelSpecs, ModelMatrix, ModelMatrices
+from formulaic import (
+    Formula,
+    ModelSpec,
+    ModelSpecs,
+    ModelMatrix,
+    ModelMatrices,
+    model_matrix,
+)
+from formulaic.errors import FormulaMaterializationError
 from formulaic.materializers.base import FormulaMaterializerMeta
 from formulaic.materializers.pandas import PandasMaterializer
 from formulaic.parser.types import Factor, Term
@@ -111,6 +119,156 @@ class TestModelSpec:
         m3 = model_spec.get_model_matrix(data2, output="sparse")
         assert isinstance(m3, scipy.sparse.spmatrix)
 
+    def test_subset(self, model_spec, data, data2):
+        subset = model_spec.subset(terms=["A:a", "1"], columns="A[T.c]")
+        assert subset.column_names == ("Intercept", "A[T.c]", "A[T.b]:a", "A[T.c]:a")
+        assert subset.terms == ["1", "A", "A:a"]
+
+        m = model_spec.get_model_matrix(data2, terms="A:a", columns=[1])
+        assert tuple(m.columns) == ("a", "A[T.b]:a", "A[T.c]:a")
+        assert m.model_spec.column_names == tuple(m.columns)
+        assert numpy.all(
+            m.values
+            == model_spec.get_model_matrix(data2).values[
+                :, [1] + model_spec.term_indices["A:a"]
+            ]
+        )
+
+        # Only the factors required by the subset are evaluated
+        m = model_spec.get_model_matrix(data.drop(columns="A"), columns="a")
+        assert tuple(m.columns) == ("a",)
+
+        m = model_spec.get_model_matrix(data, columns="A[T.b]", output="sparse")
+        assert isinstance(m, scipy.sparse.spmatrix)
+        assert m.shape == (3, 1)
+
+        with pytest.raises(
+            ValueError,
+            match=r"`ModelSpec` instances can only be subset once their structure is known",
+        ):
+            ModelSpec(formula="a").subset(terms="a")
+
+        with pytest.raises(
+            ValueError, match=r"do not have any columns related to: `'missing'`"
+        ):
+            model_spec.subset(columns="missing")
+
+    def test_get_model_matrix_out(self, model_spec, data, tmp_path):
+        reference = model_spec.get_model_matrix(data, output="numpy")
+
+        path = tmp_path / "model_matrix.npy"
+        m = model_spec.get_model_matrix(data, output="numpy", out=path)
+        assert isinstance(m.__wrapped__, numpy.memmap)
+        assert m.model_spec.column_names == model_spec.column_names
+        assert numpy.allclose(numpy.load(path), reference)
+
+        memmap = numpy.memmap(
+            tmp_path / "model_matrix.dat",
+            dtype="float32",
+            mode="w+",
+            shape=reference.shape,
+        )
+        m = model_spec.get_model_matrix(data, output="numpy", out=memmap)
+        assert m.__wrapped__ is memmap
+        assert numpy.allclose(memmap, reference)
+
+        # Output type defaults to numpy when `out` is specified
+        m = ModelSpec(formula="a + A").get_model_matrix(data, out=tmp_path / "x.npy")
+        assert m.shape == (3, 4)
+
+        with pytest.raises(ValueError, match=r"`out` has shape \(2, 6\)"):
+            model_spec.get_model_matrix(data, output="numpy", out=numpy.empty((2, 6)))
+        with pytest.raises(TypeError, match="`out` must be a `numpy.ndarray`"):
+            model_spec.get_model_matrix(data, output="numpy", out=[])
+        with pytest.raises(
+            FormulaMaterializationError, match="for the 'numpy' output type"
+        ):
+            model_spec.get_model_matrix(data, out=memmap)
+        with pytest.raises(FormulaMaterializationError, match="single model matrix"):
+            PandasMaterializer(data).get_model_matrix("a ~ A", out=memmap)
+
+        # `out` is also accepted by the top-level entrypoints
+        out = numpy.empty(reference.shape)
+        m = model_matrix(model_spec.formula, data, out=out)
+        assert m.__wrapped__ is out
+        assert numpy.allclose(out, reference)
+        out = numpy.empty(reference.shape)
+        assert model_spec.formula.get_model_matrix(data, out=out).__wrapped__ is out
+        with pytest.raises(FormulaMaterializationError, match="single model matrix"):
+            model_matrix("a ~ A", data, out=memmap)
+        with pytest.raises(FormulaMaterializationError, match="single model matrix"):
+            Formula("a ~ A").get_model_matrix(data, out=memmap)
+
+    def test_get_model_matrix_out_buffers(self, model_spec, data):
+        reference = model_spec.get_model_matrix(data, output="numpy")
+
+        for order in "CF":
+            out = numpy.full(reference.shape, numpy.nan, order=order)
+            for _ in range(2):
+                m = model_spec.get_model_matrix(data, output="numpy", out=out)
+                assert m.__wrapped__ is out
+                assert numpy.allclose(out, reference)
+
+        # Views of larger buffers are filled in place
+        buffer = numpy.zeros((10, reference.shape[1]))
+        m = model_spec.get_model_matrix(data, output="numpy", out=buffer[2:5])
+        assert numpy.shares_memory(m.__wrapped__, buffer)
+        assert numpy.allclose(buffer[2:5], reference)
+        assert numpy.all(buffer[:2] == 0) and numpy.all(buffer[5:] == 0)
+
+        with pytest.raises(TypeError, match="floating point"):
+            model_spec.get_model_matrix(
+                data, output="numpy", out=numpy.empty(reference.shape, dtype=int)
+            )
+        readonly = numpy.empty(reference.shape)
+        readonly.flags.writeable = False
+        with pytest.raises(ValueError, match="must be writeable"):
+            model_spec.get_model_matrix(data, output="numpy", out=readonly)
+
+    def test_get_model_matrices_batch(self, model_spec, data):
+        data = data.assign(a=[0, numpy.nan, 1]).set_index(pandas.Index(list("xyz")))
+        datas = [data.iloc[:2], data.iloc[2:], data]
+
+        for output in ("pandas", "numpy", "sparse"):
+            mms = model_spec.get_model_matrices_batch(datas, output=output)
+            assert len(mms) == 3
+            for d, mm in zip(datas, mms):
+                reference = model_spec.get_model_matrix(d, output=output)
+                assert isinstance(mm, ModelMatrix)
+                assert mm.model_spec.column_names == model_spec.column_names
+                assert type(mm.__wrapped__) is type(reference.__wrapped__)
+                if output == "sparse":
+                    assert numpy.allclose(mm.toarray(), reference.toarray())
+                else:
+                    assert numpy.allclose(mm, reference)
+                if output == "pandas":
+                    assert list(mm.index) == list(reference.index)
+
+        mms = model_spec.get_model_matrices_batch(
+            [d.to_dict(orient="list") for d in datas], materializer="numpy"
+        )
+        assert [mm.shape[0] for mm in mms] == [1, 1, 2]
+
+        with pytest.raises(ValueError, match="cannot be generated in batches"):
+            model_spec.get_model_matrices_batch(datas, output="lazy")
+
+    def test_get_model_matrices_batch_stateful(self, data):
+        model_spec = Formula("center(a) + A").get_model_matrix(data).model_spec
+        datas = [
+            pandas.DataFrame({"A": ["a", "a"], "a": [10, 20]}),
+            pandas.DataFrame({"A": ["b"], "a": [-5]}),
+            pandas.DataFrame({"A": ["c", "b", "a"], "a": [1, 2, 3]}),
+        ]
+
+        mms = model_spec.get_model_matrices_batch(datas)
+        for d, mm in zip(datas, mms):
+            reference = model_spec.get_model_matrix(d)
+            assert mm.model_spec.column_names == reference.model_spec.column_names
+            assert numpy.allclose(mm, reference)
+
+        with pytest.raises(ValueError, match="already been fitted"):
+            ModelSpec(formula="center(a) + A").get_model_matrices_batch(datas)
+
     def test_get_linear_constraints(self, model_spec):
         lc = model_spec.get_linear_constraints("`A[T.b]` - a = 3")
         assert numpy.allclose(lc.constraint_matrix, [[0.0, -1.0, 1.0, 0, 0.0, 0.0]])
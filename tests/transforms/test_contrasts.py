@@ -1,15 +1,20 @@
 import re
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy
 import pandas
 import pytest
 import scipy.sparse as spsparse
+from interface_meta import override
 
 from formulaic import model_matrix
 from formulaic.errors import DataMismatchWarning
 from formulaic.materializers import FactorValues
 from formulaic.model_spec import ModelSpec
 from formulaic.transforms.contrasts import (
+    Contrasts,
     SumContrasts,
     encode_contrasts,
     ContrastsRegistry as contr,
@@ -260,6 +265,107 @@ class TestContrastsTransform:
         with pytest.raises(ValueError, match=r"^Unknown output type"):
             encode_contrasts(data=["a", "b", "c", "a", "b", "c"], output="invalid")
 
+    def test_categorical_data(self):
+        spec = ModelSpec(formula=[], output="pandas")
+        state = {}
+        encode_contrasts(list("abca"), _state=state, _spec=spec)
+
+        data = pandas.Categorical(list("cab") + [None], categories=list("dcba"))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DataMismatchWarning)
+            encoded = encode_contrasts(data, _state=state, _spec=spec)
+        assert list(encoded.columns) == ["a", "b", "c"]
+        assert encoded.to_numpy().tolist() == [
+            [0, 0, 1],
+            [1, 0, 0],
+            [0, 1, 0],
+            [0, 0, 0],
+        ]
+
+        sparse = encode_contrasts(
+            data, _state=state, _spec=ModelSpec(formula=[], output="sparse")
+        )
+        assert numpy.array_equal(sparse.toarray(), encoded.to_numpy())
+
+        with pytest.warns(DataMismatchWarning, match="'d'"):
+            encoded = encode_contrasts(
+                pandas.Series(data).replace("c", "d"), _state=state, _spec=spec
+            )
+        assert encoded.to_numpy().tolist()[0] == [0, 0, 0]
+
+        # Categories outside of the retained levels map to the other level
+        state = {}
+        encode_contrasts(list("aabbc"), max_levels=2, _state=state, _spec=spec)
+        encoded = encode_contrasts(data, max_levels=2, _state=state, _spec=spec)
+        assert list(encoded.columns) == ["a", "b", "other"]
+        assert encoded.to_numpy().tolist() == [
+            [0, 0, 1],
+            [1, 0, 0],
+            [0, 1, 0],
+            [0, 0, 0],
+        ]
+
+    def test_level_collapsing(self):
+        data = list("aaabbbccdde") + [None]
+        spec = ModelSpec(formula=[], output="pandas")
+
+        state = {}
+        encoded = encode_contrasts(data, max_levels=2, _state=state, _spec=spec)
+        assert state["categories"] == ["a", "b", "other"]
+        assert list(encoded.columns) == ["a", "b", "other"]
+        assert encoded["other"].tolist() == [0] * 6 + [1] * 5 + [0]
+
+        state = {}
+        encoded = encode_contrasts(
+            data, min_count=2, other_level="<rare>", _state=state, _spec=spec
+        )
+        assert state["categories"] == ["a", "b", "c", "d", "<rare>"]
+
+        # No "other" level is added if no levels are pruned
+        state = {}
+        encode_contrasts(data, max_levels=5, min_count=1, _state=state, _spec=spec)
+        assert state["categories"] == ["a", "b", "c", "d", "e"]
+        assert "other_level" not in state
+
+        # Ties are broken by level order
+        state = {}
+        encode_contrasts(list("ccbbaa"), max_levels=2, _state=state, _spec=spec)
+        assert state["categories"] == ["a", "b", "other"]
+
+        # New levels map onto the "other" level
+        state = {}
+        encode_contrasts(data, max_levels=2, _state=state, _spec=spec)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DataMismatchWarning)
+            encoded = encode_contrasts(
+                ["a", "z", "c", None], max_levels=2, _state=state, _spec=spec
+            )
+        assert encoded.to_numpy().tolist() == [
+            [1, 0, 0],
+            [0, 0, 1],
+            [0, 0, 1],
+            [0, 0, 0],
+        ]
+
+        with pytest.raises(ValueError, match="is also a retained level"):
+            encode_contrasts(list("aabbc"), max_levels=2, other_level="a", _state={})
+
+    def test_level_collapsing_model_matrix(self):
+        data = pandas.DataFrame({"A": list("aaabbbccdde")})
+        mm = model_matrix("C(A, min_count=3)", data)
+        assert list(mm.columns) == [
+            "Intercept",
+            "C(A, min_count=3)[T.b]",
+            "C(A, min_count=3)[T.other]",
+        ]
+        assert mm.iloc[:, 2].tolist() == [0] * 6 + [1] * 5
+
+        mm2 = mm.model_spec.get_model_matrix(pandas.DataFrame({"A": ["b", "z"]}))
+        assert mm2.iloc[:, 1:].to_numpy().tolist() == [[1, 0], [0, 1]]
+
+        mm3 = model_matrix("C(A, min_count=3)", data, output="sparse")
+        assert numpy.allclose(mm3.toarray(), mm.to_numpy())
+
 
 # Test specific contrasts
 
@@ -872,3 +978,94 @@ def test_full_rankness_opt_out():
         "C(A, spans_intercept=False)[T.b]",
         "C(A, spans_intercept=False)[T.c]",
     )
+
+
+def test_coding_matrix_cache(category_dummies, monkeypatch):
+    monkeypatch.setattr(Contrasts, "_CODING_CACHE", OrderedDict())
+    monkeypatch.setattr(Contrasts, "CODING_CACHE_SIZE", 2)
+
+    calls = []
+    get_coding_matrix = contr.helmert._get_coding_matrix
+
+    def counting_get_coding_matrix(self, *args, **kwargs):
+        calls.append(self)
+        return get_coding_matrix(self, *args, **kwargs)
+
+    monkeypatch.setattr(contr.helmert, "_get_coding_matrix", counting_get_coding_matrix)
+
+    levels = ["a", "b", "c"]
+    reference = contr.helmert().apply(category_dummies, levels)
+    assert len(calls) == 1
+
+    # Equivalent contrasts reuse the cached coding matrix
+    encoded = contr.helmert().apply(category_dummies, levels)
+    assert len(calls) == 1
+    assert numpy.allclose(encoded, reference)
+    assert list(encoded.columns) == list(reference.columns)
+    assert not Contrasts._CODING_CACHE[next(iter(Contrasts._CODING_CACHE))][
+        0
+    ].flags.writeable
+
+    # Changes to parameters, levels, rank or sparsity invalidate the cache
+    contr.helmert(scale=True).apply(category_dummies, levels)
+    assert len(calls) == 2
+    contr.helmert().apply(category_dummies, levels, reduced_rank=False)
+    assert len(calls) == 3
+    assert len(Contrasts._CODING_CACHE) == 2
+    contr.helmert().apply(category_dummies, levels)
+    assert len(calls) == 4
+
+    # Custom contrasts are keyed by the values of their contrast matrices
+    custom = contr.custom({"x": [1, -1, 2], "y": [-1, 1, 2]})
+    assert (
+        custom._get_cache_key()
+        == contr.custom({"x": [1, -1, 2], "y": [-1, 1, 2]})._get_cache_key()
+    )
+    assert (
+        custom._get_cache_key()
+        != contr.custom({"x": [1, -1, 2], "y": [-1, 1, 3]})._get_cache_key()
+    )
+
+    # Mutating returned column names does not corrupt the cache
+    encoded = contr.helmert().apply(category_dummies, levels)
+    encoded.__formulaic_metadata__.column_names.append("corrupted")
+    assert contr.helmert().apply(
+        category_dummies, levels
+    ).__formulaic_metadata__.column_names == list(reference.columns)
+
+
+def test_coding_matrix_cache_respects_overrides(category_dummies, monkeypatch):
+    monkeypatch.setattr(Contrasts, "_CODING_CACHE", OrderedDict())
+
+    class DoubledHelmertContrasts(contr.helmert):
+        @override
+        def get_coding_matrix(self, levels, reduced_rank=True, sparse=False):
+            return 2 * super().get_coding_matrix(levels, reduced_rank, sparse)
+
+    levels = ["a", "b", "c"]
+    reference = contr.helmert().apply(category_dummies, levels)
+    encoded = DoubledHelmertContrasts().apply(category_dummies, levels)
+    assert numpy.allclose(encoded, 2 * reference)
+    assert list(encoded.columns) == list(reference.columns)
+
+
+def test_coding_matrix_cache_threaded(category_dummies, monkeypatch):
+    monkeypatch.setattr(Contrasts, "_CODING_CACHE", OrderedDict())
+    monkeypatch.setattr(Contrasts, "CODING_CACHE_SIZE", 4)
+
+    levels = ["a", "b", "c"]
+    references = {
+        scale: contr.helmert(scale=scale).apply(category_dummies, levels)
+        for scale in (False, True)
+    }
+
+    def encode(i):
+        # Interleave cache hits with misses that cause evictions
+        scale = bool(i % 2)
+        contr.helmert(scale=scale)._get_cached_coding(levels + [f"d{i % 7}"])
+        return scale, contr.helmert(scale=scale).apply(category_dummies, levels)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for scale, encoded in executor.map(encode, range(200)):
+            assert numpy.allclose(encoded, references[scale])
+    assert len(Contrasts._CODING_CACHE) <= 4
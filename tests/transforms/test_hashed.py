@@ -0,0 +1,97 @@
+import numpy
+import pandas
+import pytest
+import scipy.sparse as spsparse
+
+from formulaic import model_matrix
+from formulaic.transforms import hashed
+
+
+@pytest.fixture
+def data():
+    return pandas.DataFrame(
+        {
+            "u": ["x", "y", "z", None, "x"],
+            "v": ["p", "p", "q", "q", "p"],
+            "a": [1.0, 2, 3, 4, 5],
+        }
+    )
+
+
+def test_hashed(data):
+    values = hashed(data.u, n_features=8)
+    assert values.__formulaic_metadata__.kind.value == "categorical"
+    assert values.__formulaic_metadata__.spans_intercept is False
+
+    codes = numpy.asarray(values)
+    assert numpy.isnan(codes[3])
+    assert codes[0] == codes[4]
+    assert numpy.all((numpy.abs(codes[~numpy.isnan(codes)]) >= 1))
+    assert numpy.all((numpy.abs(codes[~numpy.isnan(codes)]) <= 8))
+
+    # Hashing is deterministic, but depends on the seed
+    numpy.testing.assert_array_equal(codes, hashed(data.u, n_features=8))
+    ids = [f"id{i}" for i in range(100)]
+    assert not numpy.array_equal(
+        numpy.asarray(hashed(ids, n_features=8)),
+        numpy.asarray(hashed(ids, n_features=8, seed=1)),
+    )
+    assert numpy.all(numpy.asarray(hashed(ids, alternate_sign=False)) > 0)
+
+    # Interactions are hashed jointly
+    assert not numpy.array_equal(
+        numpy.asarray(hashed(ids, n_features=8)),
+        numpy.asarray(hashed(ids, list(reversed(ids)), n_features=8)),
+    )
+
+    # Integral values are hashed consistently, regardless of their type
+    ints = numpy.asarray(hashed([1, 2, 3], n_features=8))
+    numpy.testing.assert_array_equal(
+        numpy.asarray(hashed([1.0, 2.0, 3.0], n_features=8)), ints
+    )
+    numpy.testing.assert_array_equal(
+        numpy.asarray(hashed(pandas.Series([1, 2, None]), n_features=8))[:2], ints[:2]
+    )
+    numpy.testing.assert_array_equal(
+        numpy.asarray(hashed(numpy.array([1, 2.0, 3], dtype=object), n_features=8)),
+        ints,
+    )
+    assert not numpy.array_equal(
+        numpy.asarray(hashed([1.5, 2.5], n_features=1024)),
+        numpy.asarray(hashed([1, 2], n_features=1024)),
+    )
+
+    with pytest.raises(ValueError, match="at least one variable"):
+        hashed()
+    with pytest.raises(ValueError, match="must be positive"):
+        hashed(data.u, n_features=0)
+
+
+def test_hashed_model_matrix(data):
+    mm = model_matrix("a + hashed(u, n_features=4)", data)
+    assert list(mm.columns) == [
+        "Intercept",
+        "a",
+        *(f"hashed(u, n_features=4)[{i}]" for i in range(4)),
+    ]
+    assert mm.shape == (4, 6)
+    hashed_columns = mm.iloc[:, 2:].to_numpy()
+    numpy.testing.assert_array_equal(numpy.abs(hashed_columns).sum(axis=1), 1)
+    numpy.testing.assert_array_equal(hashed_columns[0], hashed_columns[3])
+    assert mm.model_spec.encoder_state["hashed(u, n_features=4)"][1] == {}
+
+    sparse = model_matrix(
+        "a + hashed(u, v, n_features=4)", data, output="sparse", na_action="ignore"
+    )
+    assert isinstance(sparse, spsparse.csc_matrix)
+    assert sparse.shape == (5, 6)
+    assert sparse[3, 2:].nnz == 0
+    assert model_matrix(
+        "a + hashed(u, v, n_features=4)", data, output="sparse"
+    ).shape == (4, 6)
+
+    # New data (including unseen levels) is encoded into the same columns
+    new = mm.model_spec.get_model_matrix(pandas.DataFrame({"u": ["x", "w"], "a": 1.0}))
+    assert new.shape == (2, 6)
+    numpy.testing.assert_array_equal(new.iloc[0, 2:], hashed_columns[0])
+    assert numpy.abs(new.iloc[1, 2:]).sum() == 1
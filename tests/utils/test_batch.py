@@ -0,0 +1,62 @@
+import numpy
+import pandas
+import pytest
+import scipy.sparse
+
+from formulaic.utils.batch import concat_rows, split_rows
+
+
+def test_concat_rows():
+    data, nrows = concat_rows(
+        [pandas.DataFrame({"a": [1, 2]}, index=[5, 6]), pandas.DataFrame({"a": [3]})]
+    )
+    assert list(data.index) == [0, 1, 2]
+    assert list(data["a"]) == [1, 2, 3]
+    assert nrows == [2, 1]
+
+    data, nrows = concat_rows([{"a": [1, 2], "b": ["x", "y"]}, {"a": [3], "b": ["z"]}])
+    assert list(data["a"]) == [1, 2, 3]
+    assert list(data["b"]) == ["x", "y", "z"]
+    assert nrows == [2, 1]
+
+    structured = numpy.zeros(2, dtype=[("a", float)])
+    data, nrows = concat_rows([structured, structured[:1]])
+    assert data.shape == (3,)
+    assert nrows == [2, 1]
+
+    data, nrows = concat_rows(
+        [scipy.sparse.eye(2, format="csr"), scipy.sparse.eye(2, format="csr")]
+    )
+    assert isinstance(data, scipy.sparse.csc_matrix)
+    assert nrows == [2, 2]
+
+    with pytest.raises(ValueError, match="At least one dataset"):
+        concat_rows([])
+    with pytest.raises(TypeError, match="same type"):
+        concat_rows([{"a": [1]}, pandas.DataFrame({"a": [1]})])
+    with pytest.raises(TypeError, match="does not know how to concatenate"):
+        concat_rows([[1, 2]])
+
+
+def test_split_rows():
+    # Rows 1 and 3 of the concatenated data are not present in `matrix`
+    matrix = numpy.arange(8).reshape((4, 2))
+    blocks = split_rows(matrix, [2, 3, 1], drop_rows=[1, 3])
+    assert [block.tolist() for block in blocks] == [
+        [[0, 1]],
+        [[2, 3], [4, 5]],
+        [[6, 7]],
+    ]
+    assert all(numpy.shares_memory(block, matrix) for block in blocks)
+
+    df = pandas.DataFrame(matrix, index=[0, 2, 4, 5])
+    blocks = split_rows(df, [2, 3, 1], drop_rows=[1, 3])
+    assert [list(block.index) for block in blocks] == [[0], [0, 2], [0]]
+
+    sparse = scipy.sparse.csc_matrix(matrix)
+    blocks = split_rows(sparse, [1, 3])
+    assert all(isinstance(block, scipy.sparse.csc_matrix) for block in blocks)
+    assert numpy.all(blocks[1].toarray() == matrix[1:])
+
+    with pytest.raises(TypeError, match="does not know how to split"):
+        split_rows([1, 2], [2])
@@ -4,6 +4,7 @@ import pytest
 import scipy.sparse
 
 from formulaic import FactorValues
+from formulaic.materializers.types import ColumnBlock
 from formulaic.utils.cast import as_columns
 
 
@@ -30,6 +31,12 @@ def test_as_columns():
         == numpy.array([1, 2, 3])
     )
 
+    assert isinstance(as_columns(numpy.ones((3, 2))), ColumnBlock)
+    assert isinstance(
+        as_columns(pandas.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})), ColumnBlock
+    )
+    assert isinstance(as_columns(pandas.DataFrame({"a": [1], "b": ["x"]})), dict)
+
     with pytest.raises(
         ValueError,
         match="Formulaic does not know how to convert numpy arrays with more than two dimensions into columns.",
@@ -49,6 +56,8 @@ def test_as_columns():
         == numpy.array([1])
     )
 
+    assert isinstance(as_columns(scipy.sparse.csc_matrix([[1, 2, 3]])), ColumnBlock)
+
     # Check metadata propagation
     values = FactorValues([1, 2, 3], encoded=True, spans_intercept=False, format="foo")
     assert as_columns(values).__formulaic_metadata__.encoded is True
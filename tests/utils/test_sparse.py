@@ -1,7 +1,16 @@
+import functools
+
 import numpy
 import pandas
+import pytest
+import scipy.sparse as spsparse
 
-from formulaic.utils.sparse import categorical_encode_series_to_sparse_csc_matrix
+from formulaic.utils.sparse import (
+    categorical_encode_series_to_sparse_csc_matrix,
+    hstack_csc_columns,
+    sparse_rowwise_kronecker,
+    split_csc_columns,
+)
 
 
 def test_sparse_category_encoding():
@@ -54,3 +63,89 @@ def test_sparse_category_encoding():
     numpy.testing.assert_array_equal(
         encoded_with_provided_levels.indptr, numpy.array([0, 2, 4])
     )
+
+
+def test_sparse_rowwise_kronecker():
+    _, A = categorical_encode_series_to_sparse_csc_matrix(list("abcab"))
+    _, B = categorical_encode_series_to_sparse_csc_matrix(["x", "y", None, "y", "x"])
+    c = spsparse.csc_matrix(numpy.array([[1.0, 0.0, 2.0, 3.0, 4.0]]).T)
+
+    def dense_rowwise_kronecker(left, right):
+        return numpy.hstack(
+            [left.toarray() * right.toarray()[:, [j]] for j in range(right.shape[1])]
+        )
+
+    AB = sparse_rowwise_kronecker(A, B)
+    assert isinstance(AB, spsparse.csc_matrix)
+    assert AB.shape == (5, 6)
+    numpy.testing.assert_array_equal(AB.toarray(), dense_rowwise_kronecker(A, B))
+
+    ABc = functools.reduce(sparse_rowwise_kronecker, [A, B, c])
+    numpy.testing.assert_array_equal(
+        ABc.toarray(), AB.toarray() * c.toarray().reshape((-1, 1))
+    )
+
+    empty = sparse_rowwise_kronecker(A, spsparse.csc_matrix((5, 0)))
+    assert empty.shape == (5, 0)
+
+    with pytest.raises(ValueError, match="same number of rows"):
+        sparse_rowwise_kronecker(A, c[:3])
+
+
+def test_split_csc_columns():
+    _, A = categorical_encode_series_to_sparse_csc_matrix(list("abcab"))
+    columns = split_csc_columns(A)
+    assert len(columns) == 3
+    for i, column in enumerate(columns):
+        assert isinstance(column, spsparse.csc_matrix)
+        assert column.shape == (5, 1)
+        numpy.testing.assert_array_equal(column.toarray(), A[:, [i]].toarray())
+    assert split_csc_columns(spsparse.csc_matrix((5, 0))) == []
+
+    (column,) = split_csc_columns(A, [2])
+    numpy.testing.assert_array_equal(column.toarray(), A[:, [2]].toarray())
+
+    # Columns share the buffers of the original matrix, and are independent
+    # matrices (despite being constructed from a shared template)
+    assert numpy.shares_memory(columns[1].data, A.data)
+    assert numpy.shares_memory(columns[1].indices, A.indices)
+    columns[0].data = columns[0].data * 2
+    assert columns[1].data.max() == 1
+    numpy.testing.assert_array_equal(
+        (columns[1] + columns[2]).toarray(), (A[:, [1]] + A[:, [2]]).toarray()
+    )
+
+    # Other formats are converted
+    columns = split_csc_columns(A.tocsr(), [0, 2])
+    numpy.testing.assert_array_equal(columns[1].toarray(), A[:, [2]].toarray())
+
+
+def test_hstack_csc_columns():
+    A = spsparse.random(6, 5, density=0.5, format="csc", random_state=0)
+    columns = [*split_csc_columns(A[:, :2]), A[:, 2:4].tocsr(), A[:, 4].toarray()]
+    stacked = hstack_csc_columns(columns)
+    assert isinstance(stacked, spsparse.csc_matrix)
+    assert stacked.indices.dtype == numpy.int32
+    numpy.testing.assert_array_equal(stacked.toarray(), A.toarray())
+
+    # Columns can be repeated
+    (column,) = split_csc_columns(A, [3])
+    numpy.testing.assert_array_equal(
+        hstack_csc_columns([column, column]).toarray(), A[:, [3, 3]].toarray()
+    )
+
+    # Row-major and coordinate outputs are assembled from the same buffers
+    csr = hstack_csc_columns(columns, format="csr")
+    assert isinstance(csr, spsparse.csr_matrix)
+    assert csr.has_sorted_indices
+    numpy.testing.assert_array_equal(csr.toarray(), A.toarray())
+    coo = hstack_csc_columns(columns, format="coo")
+    assert isinstance(coo, spsparse.coo_matrix)
+    numpy.testing.assert_array_equal(coo.toarray(), A.toarray())
+
+    assert hstack_csc_columns([], nrows=3).shape == (3, 0)
+    assert hstack_csc_columns([], nrows=3, format="csr").format == "csr"
+    with pytest.raises(ValueError, match="same number of rows"):
+        hstack_csc_columns([A, A[:2]])
+    with pytest.raises(ValueError, match="can only be stacked into"):
+        hstack_csc_columns([A], format="bsr")